@@ -1,39 +1,29 @@
 import pandas as pd
-import gspread
 import argparse
-from gspread_dataframe import set_with_dataframe
-from oauth2client.service_account import ServiceAccountCredentials
-from gspread.exceptions import WorksheetNotFound
 from match_stats_scraper import extract_all_stats
-from config import CREDENTIALS_PATH, SHEETS_SCOPE
+from match_fingerprints import fingerprint_stats, game_id_from_url
+from day_sheet_writer import get_day_writer
 
-def process_match(day_number, url_playbyplay, url_statistics):
+def process_match(day_number, url_playbyplay, url_statistics, writer=None):
     """
-    Process a specific match and add its stats to the appropriate day worksheet.
+    Process a specific match and queue its stats for the appropriate day worksheet.
+
+    Rows go through the write-behind buffer in day_sheet_writer, which batches
+    them with other matches of the same run; call writer.flush() or close() to
+    force the write.
     
     Args:
         day_number: The day number of the championship (for worksheet name)
         url_playbyplay: URL for the play-by-play data
         url_statistics: URL for the statistics data
+        writer: DaySheetWriter to queue into (defaults to the process-wide one)
     
     Returns:
         True if successful, False otherwise
     """
     # Create worksheet name from day number
     worksheet_name = f"Day {day_number}"
-    
-    # Authenticate and connect to Google Sheets
-    scope = SHEETS_SCOPE
-    credentials = ServiceAccountCredentials.from_json_keyfile_name(CREDENTIALS_PATH, scope)
-    client = gspread.authorize(credentials)
-    
-    # Open the Google Spreadsheet by name or ID
-    try:
-        spreadsheet = client.open("IIHF")
-        print(f"Connected to IIHF spreadsheet")
-    except Exception as e:
-        print(f"Error opening spreadsheet: {str(e)}")
-        return False
+    writer = writer or get_day_writer()
     
     # Extract stats for this match
     try:
@@ -45,25 +35,28 @@ def process_match(day_number, url_playbyplay, url_statistics):
         print(f"Error extracting match stats: {str(e)}")
         return False
     
-    try:
-        # Attempt to open existing worksheet
-        worksheet = spreadsheet.worksheet(worksheet_name)
-        
-        # Append new data without headers
-        worksheet.append_rows(stats_df.values.tolist(), value_input_option="USER_ENTERED")
-        print(f"Appended {len(stats_df)} rows to existing worksheet: {worksheet_name}")
+    # Skip the write entirely if this match was already written with identical stats
+    game_id = game_id_from_url(url_statistics) or game_id_from_url(url_playbyplay)
+    previous = writer.previous(game_id)
+    fingerprint = fingerprint_stats(stats_df)
+    if previous and previous.get('hash') == fingerprint and previous.get('worksheet') == worksheet_name:
+        writer.record_unchanged(game_id, fingerprint)
+        print(f"Stats unchanged since last run, skipping write to {worksheet_name}")
+        return True
 
-    except WorksheetNotFound:
-        # Create new worksheet with headers
-        worksheet = spreadsheet.add_worksheet(
-            title=worksheet_name,
-            rows=stats_df.shape[0] + 1,  # Rows: data + header
-            cols=stats_df.shape[1]
-        )
-        set_with_dataframe(worksheet, stats_df)
-        print(f"Created new worksheet '{worksheet_name}' with {len(stats_df)} entries")
-    
-    print(f"DataFrame successfully added to sheet: {worksheet_name}")
+    writer.add(worksheet_name, game_id, stats_df, fingerprint, key=game_id or url_statistics)
+    print(f"Queued {len(stats_df)} rows for sheet: {worksheet_name}")
+    return True
+
+def _process_and_flush(day_number, url_playbyplay, url_statistics):
+    writer = get_day_writer()
+    if not process_match(day_number, url_playbyplay, url_statistics, writer=writer):
+        return False
+    try:
+        writer.close()
+    except Exception as e:
+        print(f"Error writing to Google Sheets: {str(e)}")
+        return False
     return True
 
 def main():
@@ -77,7 +70,7 @@ def main():
     
     # If arguments provided, use them
     if args.day and args.playbyplay and args.statistics:
-        return process_match(args.day, args.playbyplay, args.statistics)
+        return _process_and_flush(args.day, args.playbyplay, args.statistics)
     else:
         # Legacy behavior: use hardcoded test data from match_urls.csv
         print("No command-line arguments provided. Using test match data.")
@@ -91,7 +84,7 @@ def main():
         url_statistics = list(match_urls_df['url_statistics'])[test_row]
         day_number = list(match_urls_df['Day'])[test_row]
         
-        return process_match(day_number, url_playbyplay, url_statistics)
+        return _process_and_flush(day_number, url_playbyplay, url_statistics)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,125 @@
+"""
+Benchmark the Google Sheets sync paths against fake_sheets instead of Google.
+
+Runs download_sheet_data, update_sestavy_sheet (first sync and a no-op resync),
+upload_to_spreadsheets and a Day-worksheet flush on synthetic data, then prints
+wall time, API requests and 429s per step. Use it to compare request counts
+before and after a change to the sync code; --latency approximates the real
+round-trip cost and --quota enables the per-minute API limits.
+
+Usage:
+    python bench_sheets.py
+    python bench_sheets.py --owners 50 --latency 0.1 --quota 60
+"""
+import argparse
+import os
+import tempfile
+import time
+from contextlib import redirect_stdout
+import io
+import pandas as pd
+import config
+import sheets_client
+from fake_sheets import FakeSheets
+from match_fingerprints import FingerprintStore
+
+LINEUP_HEADERS = ['Sestava', 'Day', 'G', 'D1', 'D2', 'F1', 'F2', 'F3', 'Captain']
+
+
+def _owner_sheet(owner, days, lineups_per_day):
+    rows = [LINEUP_HEADERS]
+    for day in range(1, days + 1):
+        for n in range(1, lineups_per_day + 1):
+            players = [f"{owner} Player {day}-{n}-{slot}" for slot in range(6)]
+            rows.append([f"S{n}", day] + players + [players[-1]])
+    return rows
+
+
+def _roster(n_players):
+    return pd.DataFrame({
+        'name': [f"Player {i}" for i in range(n_players)],
+        'position': [['G', 'D', 'F'][i % 3] if i % 17 else None for i in range(n_players)],
+        'country': [f"C{i % 10}" for i in range(n_players)],
+        'team_abbr': [f"T{i % 10}" for i in range(n_players)],
+    })
+
+
+def _stats(n_players, seed):
+    return pd.DataFrame({
+        'Player': [f"Player {seed}-{i}" for i in range(n_players)],
+        'Team': f"T{seed % 10}",
+        'G': [i % 3 for i in range(n_players)],
+        'A': [(i + seed) % 2 for i in range(n_players)],
+        'PIM': 0,
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark sheet sync against an in-process Sheets fake.')
+    parser.add_argument('--owners', type=int, default=len(config.SPREADSHEETS), help='Owner spreadsheets to simulate')
+    parser.add_argument('--days', type=int, default=10, help='Championship days of lineups per owner')
+    parser.add_argument('--lineups', type=int, default=3, help='Lineups per owner and day')
+    parser.add_argument('--players', type=int, default=600, help='Roster size uploaded to every owner')
+    parser.add_argument('--matches', type=int, default=8, help='Matches buffered into the Day sheets')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds per simulated API request')
+    parser.add_argument('--quota', type=int, default=None, help='Read and write requests allowed per minute')
+    parser.add_argument('--verbose', action='store_true', help='Show the output of the sync code')
+    args = parser.parse_args()
+
+    fake = FakeSheets(latency=args.latency, read_quota=args.quota, write_quota=args.quota)
+    fake.create_spreadsheet(config.MAIN_SPREADSHEET)
+    owners = {
+        f"Owner {i + 1}": fake.create_spreadsheet(
+            f"Owner {i + 1}", sheets={config.TEST_SHEET: _owner_sheet(f"O{i + 1}", args.days, args.lineups)}
+        )
+        for i in range(args.owners)
+    }
+    # The sync modules imported config.SPREADSHEETS by reference; swap its contents
+    config.SPREADSHEETS.clear()
+    config.SPREADSHEETS.update(owners)
+    sheets_client.use_client(fake.client())
+
+    # Imported here so they pick up the patched config and client
+    from download_sheets_data import download_sheet_data
+    from update_sestavy_sheet import update_sestavy_sheet
+    from lineups_scraper import upload_to_spreadsheets
+    from day_sheet_writer import DaySheetWriter
+
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = DaySheetWriter(store=FingerprintStore(os.path.join(tmp, 'fingerprints.json')))
+
+        def day_flush():
+            for m in range(args.matches):
+                writer.add(f"Day {m // 4 + 1}", str(1000 + m), _stats(40, m), f"hash-{m}")
+            writer.flush()
+
+        roster = _roster(args.players)
+        steps = [
+            ('download', download_sheet_data),
+            ('sestavy (first)', update_sestavy_sheet),
+            ('sestavy (resync)', update_sestavy_sheet),
+            ('lineups upload', lambda: upload_to_spreadsheets(roster)),
+            ('day flush', day_flush),
+        ]
+
+        results = []
+        for name, step in steps:
+            fake.reset_counters()
+            started = time.perf_counter()
+            if args.verbose:
+                step()
+            else:
+                with redirect_stdout(io.StringIO()):
+                    step()
+            results.append((name, time.perf_counter() - started, dict(fake.calls), fake.throttled))
+
+    print(f"{args.owners} owners, {args.players} roster players, latency {args.latency * 1000:.0f} ms, "
+          f"quota {args.quota or 'off'}\n")
+    print(f"{'step':<18}{'seconds':>9}{'requests':>10}{'429s':>6}  calls")
+    for name, seconds, calls, throttled in results:
+        detail = ', '.join(f"{method}={n}" for method, n in sorted(calls.items()))
+        print(f"{name:<18}{seconds:>9.3f}{sum(calls.values()):>10}{throttled:>6}  {detail}")
+
+
+if __name__ == '__main__':
+    main()
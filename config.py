@@ -17,6 +17,38 @@ CREDENTIALS_PATH = "/Users/david.sladek/Documents/repos/playground/IIHF/credenti
 # Google Sheets API scope
 SHEETS_SCOPE = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
 
+# Main league spreadsheet; set its key to skip the Drive lookup by title entirely
+MAIN_SPREADSHEET = "IIHF"
+MAIN_SPREADSHEET_KEY = None
+
+# Championships pipeline.py can target with --championship. "spreadsheet" holds that
+# championship's Day sheets (must exist and be shared with the service account);
+# CHAMPIONSHIP_URL above stays the default for the standalone scripts.
+CHAMPIONSHIPS = {
+    "wm20": {"url": "https://www.iihf.com/en/events/2026/wm20", "spreadsheet": "IIHF"},
+    "wm": {"url": "https://www.iihf.com/en/events/2026/wm", "spreadsheet": "IIHF WM"},
+}
+
+# Write-behind buffer for Day worksheets (see day_sheet_writer.py): flush after this
+# many seconds or once this many stat rows are waiting
+DAY_FLUSH_INTERVAL = 10
+DAY_FLUSH_ROWS = 500
+
+# Upper bound on concurrent requests when reading or writing all owner spreadsheets
+SHEETS_MAX_WORKERS = 8
+
+# Upper bound on matches pipeline.py ingest scrapes at once, across all championships;
+# every match runs its own headless Chrome, so keep this well below SHEETS_MAX_WORKERS
+INGEST_MAX_WORKERS = 2
+
+# Upper bound on concurrent roster page fetches from iihf.com, across all championships;
+# the site is behind Cloudflare, which answers bursts with challenge pages
+ROSTER_MAX_WORKERS = 2
+# Teams answered with a challenge are retried one at a time, waiting this many
+# seconds times the attempt number before each try
+ROSTER_CHALLENGE_RETRIES = 3
+ROSTER_RETRY_DELAY = 10
+
 # Dictionary of spreadsheet sources with their IDs
 SPREADSHEETS = {
     "Ondra": "15vu_UIJfC7eCGcoBOlLttTbINIJpa1e9QrHd77p3hV4",
@@ -33,4 +65,9 @@ SESTAVY_SHEET = "Sestavy"  # Original sheet name for update_sestavy_sheet.py
 
 # Output file paths
 MATCH_URLS_CSV = "match_urls.csv"
-LINEUPS_CSV = "lineups.csv"
\ No newline at end of file
+LINEUPS_CSV = "lineups.csv"
+MATCH_FINGERPRINTS_JSON = "match_fingerprints.json"  # Last written stats hash per game
+
+# Raw page archive (see page_archive.py); lets parsers be re-run without re-scraping
+ARCHIVE_PAGES = True
+PAGE_ARCHIVE_DIR = "page_archive"
@@ -0,0 +1,230 @@
+"""
+Write-behind buffer for match stats going to the "Day N" worksheets.
+
+process_match() hands its rows to the buffer instead of writing them itself.
+Pending rows are flushed after DAY_FLUSH_INTERVAL seconds or once DAY_FLUSH_ROWS
+rows are waiting, whichever comes first. A flush costs one values_batch_update
+for everything that has a known position (rows rewritten in place, stale blocks
+cleared, worksheets created in this flush) plus one append per existing worksheet,
+however many matches were buffered.
+
+Appends start below the last row the fingerprint store knows about for the
+worksheet. The Sheets append API otherwise appends after the first "table" it
+finds from A1, and a cleared block in the middle of the sheet would end that
+table, so the appended rows would land in the gap over the matches below it.
+
+The buffer's lock only guards the pending rows and the fingerprint store, so
+process_match() never waits on the Sheets API. Flushes are serialized by a
+second lock, so each missing day sheet is created exactly once and the row
+positions recorded by one flush are seen by the next.
+"""
+import atexit
+import threading
+import gspread
+from gspread.exceptions import WorksheetNotFound
+from match_fingerprints import FingerprintStore
+from sheet_sync import a1_range
+from sheets_client import main_spreadsheet, open_by_title, get_worksheet, add_worksheet, forget_worksheet
+from config import DAY_FLUSH_INTERVAL, DAY_FLUSH_ROWS
+
+
+def _first_row_of_range(a1_range):
+    """Return the first row number of an A1 range such as "'Day 3'!A41:P80"."""
+    cell = a1_range.split('!')[-1].split(':')[0]
+    return int(''.join(ch for ch in cell if ch.isdigit()))
+
+
+class DaySheetWriter:
+    def __init__(self, flush_interval=DAY_FLUSH_INTERVAL, max_rows=DAY_FLUSH_ROWS, store=None,
+                 spreadsheet_title=None):
+        # spreadsheet_title selects another championship's spreadsheet; default is the main one
+        self.spreadsheet_title = spreadsheet_title
+        self.flush_interval = flush_interval
+        self.max_rows = max_rows
+        self.store = store or FingerprintStore()
+        self._pending = {}  # key (game id or URL) -> pending write, latest wins
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()  # one flush talks to the API at a time
+        self._unwritten = set()  # worksheets created by a flush whose batch update then failed
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._closed = False
+
+    # ── Fingerprints ──────────────────────────────────────────
+
+    def previous(self, game_id):
+        """Last written fingerprint entry for a game, or None."""
+        with self._lock:
+            return self.store.get(game_id) if game_id else None
+
+    def record_unchanged(self, game_id, fingerprint):
+        """Count another run with identical stats for a game that needs no write."""
+        with self._lock:
+            self.store.record(game_id, fingerprint)
+            self.store.save()
+
+    # ── Buffering ─────────────────────────────────────────────
+
+    def add(self, worksheet_name, game_id, stats_df, fingerprint, key=None):
+        """Queue one match's stats rows for worksheet_name."""
+        with self._lock:
+            self._pending[key or game_id] = {
+                'worksheet': worksheet_name,
+                'game_id': game_id,
+                'header': stats_df.columns.tolist(),
+                'values': stats_df.values.tolist(),
+                'fingerprint': fingerprint,
+            }
+            pending_rows = sum(len(p['values']) for p in self._pending.values())
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='day-sheet-writer', daemon=True)
+                self._thread.start()
+        if pending_rows >= self.max_rows:
+            self._wakeup.set()
+
+    def _run(self):
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Error flushing Day worksheets: {str(e)}")
+
+    # ── Flushing ──────────────────────────────────────────────
+
+    def _worksheet(self, spreadsheet, title, rows, cols):
+        """Return (worksheet handle, created) for title, creating the worksheet if missing."""
+        try:
+            # A sheet we created whose first write failed is still empty: fill it like a new one
+            return get_worksheet(spreadsheet, title), title in self._unwritten
+        except WorksheetNotFound:
+            pass
+        try:
+            worksheet = add_worksheet(spreadsheet, title, rows=rows, cols=cols)
+            self._unwritten.add(title)
+            return worksheet, True
+        except gspread.exceptions.APIError:
+            # Another process created it since our lookup; use theirs
+            forget_worksheet(spreadsheet, title)
+            return get_worksheet(spreadsheet, title), False
+
+    def flush(self):
+        """Write all pending rows; returns the number of API requests made."""
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return 0
+                pending, self._pending = self._pending, {}
+            try:
+                return self._flush(pending)
+            except Exception:
+                # Put the batch back unless newer stats for the same game arrived meanwhile
+                with self._lock:
+                    for key, item in pending.items():
+                        self._pending.setdefault(key, item)
+                raise
+
+    def _flush(self, pending):
+        spreadsheet = open_by_title(self.spreadsheet_title) if self.spreadsheet_title else main_spreadsheet()
+        by_sheet = {}
+        for item in pending.values():
+            by_sheet.setdefault(item['worksheet'], []).append(item)
+        with self._lock:
+            previous_entries = {
+                item['game_id']: self.store.get(item['game_id']) for item in pending.values() if item['game_id']
+            }
+            known_last_rows = {title: self.store.last_row(title) for title in by_sheet}
+
+        updates = []    # value ranges sent in the single values_batch_update
+        appends = {}    # worksheet title -> (handle, items) appended after the batch
+        placed = []     # (item, start_row) for the fingerprint store
+        for title, items in by_sheet.items():
+            header = items[0]['header']
+            n_cols = len(header)
+            total = sum(len(item['values']) for item in items)
+            worksheet, created = self._worksheet(spreadsheet, title, rows=total + 1, cols=n_cols)
+
+            if created:
+                # Fresh sheet: header plus every buffered match at known positions
+                rows = [header] + [row for item in items for row in item['values']]
+                updates.append({'range': a1_range(title, 1, 1, len(rows), n_cols), 'values': rows})
+                start_row = 2
+                for item in items:
+                    placed.append((item, start_row))
+                    start_row += len(item['values'])
+                print(f"Created new worksheet '{title}' with {total} entries")
+                continue
+
+            to_append = []
+            for item in items:
+                previous = previous_entries.get(item['game_id'])
+                n_rows = len(item['values'])
+                if previous and previous.get('worksheet') == title and previous.get('row_count') == n_rows:
+                    # Same match already written: overwrite its rows in place
+                    start_row = previous['start_row']
+                    updates.append({
+                        'range': a1_range(title, start_row, 1, start_row + n_rows - 1, n_cols),
+                        'values': item['values'],
+                    })
+                    placed.append((item, start_row))
+                    continue
+                if previous and previous.get('worksheet') == title:
+                    # Row count changed: blank the old block, the new one is appended
+                    old_start, old_count = previous['start_row'], previous['row_count']
+                    updates.append({
+                        'range': a1_range(title, old_start, 1, old_start + old_count - 1, n_cols),
+                        'values': [[''] * n_cols for _ in range(old_count)],
+                    })
+                to_append.append(item)
+            if to_append:
+                appends[title] = (worksheet, to_append)
+
+        requests = 0
+        if updates:
+            spreadsheet.values_batch_update({'valueInputOption': 'USER_ENTERED', 'data': updates})
+            requests += 1
+        self._unwritten.difference_update(by_sheet)
+        for title, (worksheet, items) in appends.items():
+            rows = [row for item in items for row in item['values']]
+            last_row = known_last_rows[title]
+            table_range = f"A{last_row + 1}" if last_row else None
+            response = worksheet.append_rows(rows, value_input_option="USER_ENTERED", table_range=table_range)
+            requests += 1
+            start_row = _first_row_of_range(response['updates']['updatedRange'])
+            for item in items:
+                placed.append((item, start_row))
+                start_row += len(item['values'])
+            print(f"Appended {len(rows)} rows from {len(items)} match(es) to worksheet: {title}")
+
+        with self._lock:
+            for item, start_row in placed:
+                if item['game_id']:
+                    self.store.record(item['game_id'], item['fingerprint'], worksheet=item['worksheet'],
+                                      start_row=start_row, row_count=len(item['values']))
+            self.store.save()
+        print(f"Flushed {len(pending)} match(es) to {len(by_sheet)} worksheet(s) in {requests} request(s)")
+        return requests
+
+    def close(self):
+        """Stop the background flusher and write whatever is still pending."""
+        self._closed = True
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_day_writer():
+    """Process-wide buffer; anything still pending is flushed at interpreter exit."""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = DaySheetWriter()
+            atexit.register(_writer.close)
+    return _writer
@@ -1,71 +1,95 @@
 import pandas as pd
 import gspread
-from oauth2client.service_account import ServiceAccountCredentials
-import os
-from config import CREDENTIALS_PATH, SHEETS_SCOPE, SPREADSHEETS, TEST_SHEET
+from gspread.utils import numericise_all
+from concurrent.futures import ThreadPoolExecutor
+from config import SPREADSHEETS, TEST_SHEET, SHEETS_MAX_WORKERS
+from sheets_client import open_spreadsheet
 
-def download_sheet_data():
+def _fetch_owner_values(spreadsheet_id):
+    """Read the whole TEST_SHEET of one spreadsheet with a single values request."""
+    spreadsheet = open_spreadsheet(spreadsheet_id)
+    # Formatted values numericised like get_all_records() did: dates, percentages
+    # and checkboxes keep their displayed text instead of serials, fractions and bools
+    response = spreadsheet.values_get(TEST_SHEET)
+    return [numericise_all(row) for row in response.get('values', [])]
+
+def _values_to_df(values, source_name):
+    """Header row + data rows -> DataFrame with an Owner column; short rows are padded with ''."""
+    header, rows = values[0], values[1:]
+    width = len(header)
+    rows = [row[:width] + [''] * (width - len(row)) for row in rows]
+    df = pd.DataFrame(rows, columns=header)
+    df.insert(0, 'Owner', source_name)  # Add owner as the first column
+    return df
+
+def _describe_error(source_name, error):
+    if isinstance(error, gspread.exceptions.SpreadsheetNotFound):
+        return f"Could not open spreadsheet for '{source_name}'. Check if the ID is correct and the service account has access."
+    if isinstance(error, gspread.exceptions.APIError) and 'Unable to parse range' in str(error):
+        return f"Sheet '{TEST_SHEET}' not found in '{source_name}' spreadsheet"
+    return f"Error accessing '{source_name}' spreadsheet: {str(error)}"
+
+def download_sheet_data_with_errors(max_workers=SHEETS_MAX_WORKERS):
     """
-    Download data from sheets named 'test' from multiple Google Spreadsheets.
-    Uses the same service account credentials as in app.py.
-    Returns a single DataFrame with all data and owner information.
+    Download the 'test' sheet of every owner spreadsheet concurrently.
+
+    All owners share the process-wide client from sheets_client; each owner costs
+    a single values_get call, run on a bounded thread pool. Returns (combined DataFrame, errors) where
+    errors maps owner name -> message for every spreadsheet that could not be read.
     """
-    # Authenticate and connect to Google Sheets
-    credentials = ServiceAccountCredentials.from_json_keyfile_name(CREDENTIALS_PATH, SHEETS_SCOPE)
-    client = gspread.authorize(credentials)
-    
-    # Create a list to store DataFrames from each source
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(SPREADSHEETS)))) as pool:
+        futures = {
+            source_name: pool.submit(_fetch_owner_values, spreadsheet_id)
+            for source_name, spreadsheet_id in SPREADSHEETS.items()
+        }
+
+    # Collect in SPREADSHEETS order so the combined rows are deterministic
     all_dfs = []
-    
-    # Process each spreadsheet
-    for source_name, spreadsheet_id in SPREADSHEETS.items():
+    errors = {}
+    for source_name, future in futures.items():
         try:
-            # Open the spreadsheet by ID
-            spreadsheet = client.open_by_key(spreadsheet_id)
-            
-            # Try to open the "test" sheet
-            try:
-                worksheet = spreadsheet.worksheet(TEST_SHEET)
-                
-                # Get all values from the worksheet
-                data = worksheet.get_all_records()
-                
-                # Convert to DataFrame and add owner column
-                if data:
-                    df = pd.DataFrame(data)
-                    df.insert(0, 'Owner', source_name)  # Add owner as the first column
-                    all_dfs.append(df)
-                    print(f"Successfully downloaded data from '{source_name}' spreadsheet")
-                else:
-                    print(f"Sheet '{TEST_SHEET}' in '{source_name}' spreadsheet is empty")
-                
-            except gspread.exceptions.WorksheetNotFound:
-                print(f"Sheet '{TEST_SHEET}' not found in '{source_name}' spreadsheet")
-                
-        except gspread.exceptions.SpreadsheetNotFound:
-            print(f"Could not open spreadsheet for '{source_name}'. Check if the ID is correct and the service account has access.")
+            values = future.result()
         except Exception as e:
-            print(f"Error accessing '{source_name}' spreadsheet: {str(e)}")
-    
+            errors[source_name] = _describe_error(source_name, e)
+            print(errors[source_name])
+            continue
+        if len(values) > 1:
+            all_dfs.append(_values_to_df(values, source_name))
+            print(f"Successfully downloaded data from '{source_name}' spreadsheet")
+        else:
+            print(f"Sheet '{TEST_SHEET}' in '{source_name}' spreadsheet is empty")
+
+    if errors:
+        print(f"\nFailed to download {len(errors)}/{len(SPREADSHEETS)} spreadsheets: {', '.join(errors)}")
+
     # Combine all DataFrames into a single DataFrame
     if all_dfs:
         combined_df = pd.concat(all_dfs, ignore_index=True)
         print(f"\nCombined data into a single DataFrame with {combined_df.shape[0]} rows and {combined_df.shape[1]} columns")
-        return combined_df
+        return combined_df, errors
     else:
         print("No data was downloaded from any spreadsheet")
-        return pd.DataFrame()
+        return pd.DataFrame(), errors
+
+def download_sheet_data(max_workers=SHEETS_MAX_WORKERS):
+    """
+    Download data from sheets named 'test' from multiple Google Spreadsheets.
+    Uses the shared service-account client from sheets_client.
+    Returns a single DataFrame with all data and owner information.
+    """
+    combined_df, _ = download_sheet_data_with_errors(max_workers)
+    return combined_df
 
 if __name__ == "__main__":
     # Download and combine all sheet data
     combined_data = download_sheet_data()
-    
+
     # Print the combined dataframe
     if not combined_data.empty:
         print("\nPreview of combined data:")
         print(combined_data.head())
-        
+
         # Print a summary by owner
         print("\nData summary by owner:")
         for owner, group in combined_data.groupby('Owner'):
-            print(f"{owner}: {group.shape[0]} rows")
\ No newline at end of file
+            print(f"{owner}: {group.shape[0]} rows")
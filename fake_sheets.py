@@ -0,0 +1,457 @@
+"""
+In-process stand-in for the part of gspread this project uses.
+
+FakeSheets keeps spreadsheets in memory and hands out a client whose
+Spreadsheet/Worksheet objects behave like gspread's for the calls made by
+download_sheets_data, update_sestavy_sheet, lineups_scraper, app/day_sheet_writer
+and sheet_sync. Every call that would be an HTTP request is counted, can be
+delayed by a fixed latency, and is charged against per-minute read/write quotas
+like the real API (HTTP 429 when exceeded), so sheet-sync changes can be
+measured and checked offline.
+
+    fake = FakeSheets(latency=0.05)
+    fake.create_spreadsheet("IIHF")
+    sheets_client.use_client(fake.client())
+    ...                      # run any sync code
+    print(fake.calls)        # Counter of API calls by method
+
+Errors are raised as the real gspread exception types.
+"""
+import re
+import threading
+import time
+from collections import Counter, deque
+from gspread.exceptions import APIError, SpreadsheetNotFound, WorksheetNotFound
+
+_CELL_RE = re.compile(r'^([A-Z]*)(\d*)$')
+
+
+class _Response:
+    """Just enough of requests.Response for gspread.exceptions.APIError."""
+
+    def __init__(self, code, status, message):
+        self.status_code = code
+        self._payload = {'error': {'code': code, 'message': message, 'status': status}}
+        self.text = message
+
+    def json(self):
+        return self._payload
+
+
+def _api_error(code, status, message):
+    return APIError(_Response(code, status, message))
+
+
+def _col_number(letters):
+    number = 0
+    for ch in letters:
+        number = number * 26 + ord(ch) - 64
+    return number
+
+
+def _col_letters(col):
+    letters = ''
+    while col > 0:
+        col, rem = divmod(col - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def _split_range(a1, default_title=None):
+    """'Title'!A1:C5 -> (title, 'A1:C5'); a bare cell range uses default_title."""
+    if '!' in a1:
+        title, cells = a1.rsplit('!', 1)
+    elif default_title is not None and _CELL_RE.match(a1.split(':')[0]):
+        title, cells = default_title, a1
+    else:
+        title, cells = a1, ''
+    if title.startswith("'") and title.endswith("'"):
+        title = title[1:-1].replace("''", "'")
+    return title, cells
+
+
+def _parse_cells(cells):
+    """'B2:D5' -> (row0, col0, row1, col1), 1-indexed, None for open ends."""
+    if not cells:
+        return 1, 1, None, None
+    start, _, end = cells.partition(':')
+    end = end or start
+    c0, r0 = _CELL_RE.match(start).groups()
+    c1, r1 = _CELL_RE.match(end).groups()
+    return (int(r0) if r0 else 1, _col_number(c0) if c0 else 1,
+            int(r1) if r1 else None, _col_number(c1) if c1 else None)
+
+
+def _user_entered(value):
+    """Mimic USER_ENTERED parsing of plain numbers."""
+    if isinstance(value, str):
+        text = value.strip()
+        if re.fullmatch(r'-?\d+', text):
+            return int(text)
+        if re.fullmatch(r'-?\d*\.\d+', text):
+            return float(text)
+    return value
+
+
+def _formatted(value):
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'TRUE' if value else 'FALSE'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+class _SheetData:
+    def __init__(self, sheet_id, title, rows, cols):
+        self.id = sheet_id
+        self.title = title
+        self.cells = [[''] * cols for _ in range(rows)]
+
+    @property
+    def row_count(self):
+        return len(self.cells)
+
+    @property
+    def col_count(self):
+        return len(self.cells[0]) if self.cells else 0
+
+    def resize(self, rows=None, cols=None):
+        cols = self.col_count if cols is None else cols
+        rows = self.row_count if rows is None else rows
+        self.cells = [(row + [''] * cols)[:cols] for row in self.cells[:rows]]
+        self.cells += [[''] * cols for _ in range(rows - len(self.cells))]
+
+    def used_extent(self):
+        """(rows, cols) of the smallest block from A1 holding every non-empty cell."""
+        n_rows = n_cols = 0
+        for r, row in enumerate(self.cells):
+            filled = [c for c, value in enumerate(row) if value != '']
+            if filled:
+                n_rows = r + 1
+                n_cols = max(n_cols, filled[-1] + 1)
+        return n_rows, n_cols
+
+    def check_bounds(self, row0, col0, values):
+        row1 = row0 + len(values) - 1
+        col1 = col0 + max((len(row) for row in values), default=1) - 1
+        if row1 > self.row_count or col1 > self.col_count:
+            raise _api_error(400, 'INVALID_ARGUMENT',
+                             f"Range ('{self.title}'!{_col_letters(col0)}{row0}:{_col_letters(col1)}{row1}) "
+                             f"exceeds grid limits. Max rows: {self.row_count}, max columns: {self.col_count}")
+
+    def write(self, row0, col0, values, value_input_option):
+        if not values:
+            return
+        self.check_bounds(row0, col0, values)
+        for r, row in enumerate(values):
+            for c, value in enumerate(row):
+                if value_input_option == 'USER_ENTERED':
+                    value = _user_entered(value)
+                self.cells[row0 - 1 + r][col0 - 1 + c] = '' if value is None else value
+
+    def read(self, cells, formatted=True):
+        row0, col0, row1, col1 = _parse_cells(cells)
+        used_rows, used_cols = self.used_extent()
+        row1 = min(row1 or used_rows, used_rows)
+        col1 = min(col1 or used_cols, used_cols)
+        block = []
+        for row in self.cells[row0 - 1:row1]:
+            values = row[col0 - 1:col1]
+            while values and values[-1] == '':
+                values = values[:-1]
+            block.append([_formatted(v) for v in values] if formatted else list(values))
+        while block and not block[-1]:
+            block.pop()
+        return block
+
+
+class _SpreadsheetData:
+    def __init__(self, key, title):
+        self.key = key
+        self.title = title
+        self.sheets = {}
+        self.next_sheet_id = 0
+
+    def add(self, title, rows, cols):
+        if title in self.sheets:
+            raise _api_error(400, 'INVALID_ARGUMENT',
+                             f'A sheet with the name "{title}" already exists. Please enter another name.')
+        sheet = _SheetData(self.next_sheet_id, title, rows, cols)
+        self.next_sheet_id += 1
+        self.sheets[title] = sheet
+        return sheet
+
+
+class FakeSheets:
+    """
+    In-memory Sheets backend.
+
+    latency: seconds slept per API request.
+    read_quota / write_quota: requests allowed per `quota_window` seconds (None = unlimited).
+    """
+
+    def __init__(self, latency=0.0, read_quota=None, write_quota=None, quota_window=60.0):
+        self.latency = latency
+        self.quota = {'read': read_quota, 'write': write_quota}
+        self.quota_window = quota_window
+        self.calls = Counter()
+        self.throttled = 0
+        self._recent = {'read': deque(), 'write': deque()}
+        self._spreadsheets = {}
+        self._lock = threading.Lock()
+
+    # ── Setup ─────────────────────────────────────────────────
+
+    def create_spreadsheet(self, title, key=None, sheets=None):
+        """
+        Add a spreadsheet; sheets maps worksheet title -> list of rows.
+        Not counted as API traffic.
+        """
+        key = key or f"fake-{len(self._spreadsheets) + 1}"
+        data = _SpreadsheetData(key, title)
+        for sheet_title, rows in (sheets or {}).items():
+            width = max((len(row) for row in rows), default=1)
+            sheet = data.add(sheet_title, max(len(rows), 1000), max(width, 26))
+            sheet.write(1, 1, rows, 'RAW')
+        self._spreadsheets[key] = data
+        return key
+
+    def client(self):
+        return FakeClient(self)
+
+    def sheet_values(self, key, title):
+        """Current values of a worksheet as get_all_values() would return them."""
+        return self._spreadsheets[key].sheets[title].read('')
+
+    def reset_counters(self):
+        self.calls.clear()
+        self.throttled = 0
+
+    @property
+    def total_requests(self):
+        return sum(self.calls.values())
+
+    # ── Request accounting ────────────────────────────────────
+
+    def request(self, method, kind):
+        """Charge one API request; raises the API's 429 when the quota is exhausted."""
+        with self._lock:
+            limit = self.quota[kind]
+            if limit is not None:
+                now = time.monotonic()
+                recent = self._recent[kind]
+                while recent and now - recent[0] >= self.quota_window:
+                    recent.popleft()
+                if len(recent) >= limit:
+                    self.throttled += 1
+                    raise _api_error(429, 'RESOURCE_EXHAUSTED',
+                                     f"Quota exceeded for quota metric '{kind.title()} requests' "
+                                     f"and limit '{kind.title()} requests per minute per user'")
+                recent.append(now)
+            self.calls[method] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _get(self, key):
+        data = self._spreadsheets.get(key)
+        if data is None:
+            raise SpreadsheetNotFound(key)
+        return data
+
+
+class FakeClient:
+    def __init__(self, backend):
+        self.backend = backend
+
+    def open(self, title):
+        self.backend.request('open', 'read')
+        for data in self.backend._spreadsheets.values():
+            if data.title == title:
+                return FakeSpreadsheet(self.backend, data)
+        raise SpreadsheetNotFound(title)
+
+    def open_by_key(self, key):
+        self.backend.request('open_by_key', 'read')
+        return FakeSpreadsheet(self.backend, self.backend._get(key))
+
+
+class FakeSpreadsheet:
+    def __init__(self, backend, data):
+        self.backend = backend
+        self._data = data
+
+    @property
+    def id(self):
+        return self._data.key
+
+    @property
+    def title(self):
+        return self._data.title
+
+    def worksheet(self, title):
+        self.backend.request('worksheet', 'read')
+        sheet = self._data.sheets.get(title)
+        if sheet is None:
+            raise WorksheetNotFound(title)
+        return FakeWorksheet(self, sheet)
+
+    def worksheets(self):
+        self.backend.request('worksheets', 'read')
+        return [FakeWorksheet(self, sheet) for sheet in self._data.sheets.values()]
+
+    def add_worksheet(self, title, rows, cols, index=None):
+        self.backend.request('add_worksheet', 'write')
+        return FakeWorksheet(self, self._data.add(title, rows, cols))
+
+    def del_worksheet(self, worksheet):
+        self.backend.request('del_worksheet', 'write')
+        self._data.sheets.pop(worksheet.title, None)
+
+    def _sheet(self, title):
+        sheet = self._data.sheets.get(title)
+        if sheet is None:
+            raise _api_error(400, 'INVALID_ARGUMENT', f"Unable to parse range: {title}")
+        return sheet
+
+    def values_get(self, range, params=None):
+        self.backend.request('values_get', 'read')
+        title, cells = _split_range(range)
+        unformatted = (params or {}).get('valueRenderOption') == 'UNFORMATTED_VALUE'
+        return {'range': range, 'majorDimension': 'ROWS',
+                'values': self._sheet(title).read(cells, formatted=not unformatted)}
+
+    def values_batch_get(self, ranges, params=None):
+        self.backend.request('values_batch_get', 'read')
+        unformatted = (params or {}).get('valueRenderOption') == 'UNFORMATTED_VALUE'
+        value_ranges = []
+        for a1 in ranges:
+            title, cells = _split_range(a1)
+            value_ranges.append({'range': a1, 'majorDimension': 'ROWS',
+                                 'values': self._sheet(title).read(cells, formatted=not unformatted)})
+        return {'spreadsheetId': self.id, 'valueRanges': value_ranges}
+
+    def values_batch_update(self, body):
+        self.backend.request('values_batch_update', 'write')
+        option = body.get('valueInputOption', 'RAW')
+        # Validate every range first: the real API applies all or nothing
+        targets = []
+        for item in body.get('data', []):
+            title, cells = _split_range(item['range'])
+            row0, col0, _, _ = _parse_cells(cells)
+            targets.append((self._sheet(title), row0, col0, item['values']))
+        for sheet, row0, col0, values in targets:
+            sheet.check_bounds(row0, col0, values)
+        for sheet, row0, col0, values in targets:
+            sheet.write(row0, col0, values, option)
+        return {'totalUpdatedCells': sum(len(row) for *_, values in targets for row in values)}
+
+
+class FakeWorksheet:
+    def __init__(self, spreadsheet, sheet):
+        self.spreadsheet = spreadsheet
+        self._sheet = sheet
+
+    @property
+    def backend(self):
+        return self.spreadsheet.backend
+
+    @property
+    def id(self):
+        return self._sheet.id
+
+    @property
+    def title(self):
+        return self._sheet.title
+
+    @property
+    def row_count(self):
+        return self._sheet.row_count
+
+    @property
+    def col_count(self):
+        return self._sheet.col_count
+
+    # ── Reads ─────────────────────────────────────────────────
+
+    def get_all_values(self):
+        self.backend.request('get_all_values', 'read')
+        return self._sheet.read('')
+
+    def get_all_records(self):
+        self.backend.request('get_all_records', 'read')
+        rows = self._sheet.read('', formatted=False)
+        if not rows:
+            return []
+        header = rows[0]
+        return [dict(zip(header, row + [''] * (len(header) - len(row)))) for row in rows[1:]]
+
+    # ── Writes ────────────────────────────────────────────────
+
+    def update(self, values=None, range_name=None, value_input_option='RAW', **kwargs):
+        # Accept both update(values, range) and the older update(range, values) order
+        if isinstance(values, str):
+            values, range_name = range_name, values
+        self.backend.request('update', 'write')
+        _, cells = _split_range(range_name or 'A1', self.title)
+        row0, col0, _, _ = _parse_cells(cells)
+        self._sheet.write(row0, col0, values, value_input_option)
+        return {'updatedRange': f"'{self.title}'!{cells}"}
+
+    def batch_update(self, data, value_input_option='RAW', **kwargs):
+        self.backend.request('batch_update', 'write')
+        for item in data:
+            _, cells = _split_range(item['range'], self.title)
+            row0, col0, _, _ = _parse_cells(cells)
+            self._sheet.write(row0, col0, item['values'], value_input_option)
+
+    def batch_clear(self, ranges):
+        self.backend.request('batch_clear', 'write')
+        for a1 in ranges:
+            _, cells = _split_range(a1, self.title)
+            row0, col0, row1, col1 = _parse_cells(cells)
+            for r in range(row0 - 1, min(row1 or self.row_count, self.row_count)):
+                for c in range(col0 - 1, min(col1 or self.col_count, self.col_count)):
+                    self._sheet.cells[r][c] = ''
+
+    def append_row(self, values, value_input_option='RAW', table_range=None, **kwargs):
+        return self._append('append_row', [values], value_input_option, table_range)
+
+    def append_rows(self, values, value_input_option='RAW', table_range=None, **kwargs):
+        return self._append('append_rows', values, value_input_option, table_range)
+
+    def _append(self, method, values, value_input_option, table_range):
+        self.backend.request(method, 'write')
+        # Like the API: find the first table at or below the range start and append
+        # after its last row; a blank row ends the table
+        row0 = _parse_cells(table_range)[0] if table_range else 1
+        filled = [any(value != '' for value in row) for row in self._sheet.cells]
+        start = row0
+        while start <= len(filled) and not filled[start - 1]:
+            start += 1
+        if start > len(filled):
+            start = row0
+        else:
+            while start <= len(filled) and filled[start - 1]:
+                start += 1
+        end = start + len(values) - 1
+        width = max(len(row) for row in values)
+        # Appending past the grid adds rows (and columns), like the API does
+        if end > self.row_count or width > self.col_count:
+            self._sheet.resize(rows=max(end, self.row_count), cols=max(width, self.col_count))
+        self._sheet.write(start, 1, values, value_input_option)
+        updated = f"'{self.title}'!A{start}:{_col_letters(width)}{end}"
+        return {'updates': {'updatedRange': updated, 'updatedRows': len(values)}}
+
+    def resize(self, rows=None, cols=None):
+        self.backend.request('resize', 'write')
+        self._sheet.resize(rows, cols)
+
+    def add_rows(self, rows):
+        self.backend.request('add_rows', 'write')
+        self._sheet.resize(rows=self.row_count + rows)
+
+    def add_cols(self, cols):
+        self.backend.request('add_cols', 'write')
+        self._sheet.resize(cols=self.col_count + cols)
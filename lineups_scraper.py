@@ -1,24 +1,70 @@
 import pandas as pd
 import requests
 import re
+import threading
+import time
 from bs4 import BeautifulSoup
 import gspread
-from oauth2client.service_account import ServiceAccountCredentials
-from config import CREDENTIALS_PATH, SHEETS_SCOPE, SPREADSHEETS, LINEUPS_SHEET, LINEUPS_CSV, CHAMPIONSHIP_URL
+from concurrent.futures import ThreadPoolExecutor
+from config import (
+    SPREADSHEETS, LINEUPS_SHEET, LINEUPS_CSV, CHAMPIONSHIP_URL, SHEETS_MAX_WORKERS,
+    ROSTER_MAX_WORKERS, ROSTER_CHALLENGE_RETRIES, ROSTER_RETRY_DELAY,
+)
+from page_archive import archive_page, event_key, TEAMS, ROSTER
+from sheet_sync import a1_range, with_quota, read_quota, write_quota
+from sheets_client import open_spreadsheet, get_worksheet, add_worksheet
 
-def make_session():
+def make_session(championship_url=CHAMPIONSHIP_URL):
     """Create a requests session with browser-like headers to avoid Cloudflare 403."""
     s = requests.Session()
     s.headers.update({
         'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
     })
-    s.get(CHAMPIONSHIP_URL)  # prime session cookies
+    s.get(championship_url)  # prime session cookies
     return s
 
-def extract_players_from_team_page(team_url, country_code, team_abbr):
-    session = make_session()
-    response = session.get(team_url)
-    soup = BeautifulSoup(response.content, 'html.parser')
+class ChallengePage(RuntimeError):
+    """iihf.com answered with a Cloudflare challenge (or rate limit) instead of the page."""
+
+_CHALLENGE_MARKERS = ('Just a moment...', '/cdn-cgi/challenge-platform', 'cf-chl-')
+
+# Bounds concurrent iihf.com fetches in this process, whichever championship they are for
+_iihf_slots = threading.BoundedSemaphore(ROSTER_MAX_WORKERS)
+
+def is_challenge(response):
+    """True for Cloudflare challenge pages and rate-limit responses."""
+    if response.headers.get('cf-mitigated') == 'challenge' or response.status_code == 429:
+        return True
+    if response.status_code in (403, 503):
+        return any(marker in response.text for marker in _CHALLENGE_MARKERS)
+    return False
+
+def fetch_iihf_page(url, championship_url=CHAMPIONSHIP_URL):
+    """GET a championship page with a primed session; raises ChallengePage instead of returning one."""
+    with _iihf_slots:
+        response = make_session(championship_url).get(url)
+    if is_challenge(response):
+        raise ChallengePage(f"{url}: Cloudflare challenge (HTTP {response.status_code})")
+    return response
+
+def with_challenge_retries(fetch, label):
+    """Retry fetch() one at a time, backing off, while it keeps hitting challenge pages."""
+    for attempt in range(1, ROSTER_CHALLENGE_RETRIES + 1):
+        time.sleep(ROSTER_RETRY_DELAY * attempt)
+        try:
+            return fetch()
+        except ChallengePage as e:
+            print(f"{label}: challenge page again (retry {attempt}/{ROSTER_CHALLENGE_RETRIES}): {e}")
+    raise ChallengePage(f"{label}: still challenged after {ROSTER_CHALLENGE_RETRIES} retries")
+
+def extract_players_from_team_page(team_url, country_code, team_abbr, championship_url=CHAMPIONSHIP_URL):
+    response = fetch_iihf_page(team_url, championship_url)
+    archive_page(f"{event_key(championship_url)}:{team_abbr}", ROSTER, response.content, url=team_url)
+    return parse_team_page(response.content, country_code, team_abbr)
+
+def parse_team_page(html, country_code, team_abbr):
+    """Parse the player list out of a team roster page."""
+    soup = BeautifulSoup(html, 'html.parser')
     table = soup.find('table', class_='s-table')
     players = []
     if table:
@@ -90,11 +136,19 @@ def extract_players_from_team_page(team_url, country_code, team_abbr):
     
     return filtered_players
 
-def get_teams_df():
-    url = f'{CHAMPIONSHIP_URL}/teams'
-    session = make_session()
-    response = session.get(url)
-    soup = BeautifulSoup(response.content, 'html.parser')
+def get_teams_df(championship_url=CHAMPIONSHIP_URL):
+    url = f'{championship_url}/teams'
+    try:
+        response = fetch_iihf_page(url, championship_url)
+    except ChallengePage as e:
+        print(e)
+        response = with_challenge_retries(lambda: fetch_iihf_page(url, championship_url), "Teams page")
+    archive_page(event_key(championship_url), TEAMS, response.content, url=url)
+    return parse_teams_page(response.content)
+
+def parse_teams_page(html):
+    """Parse the championship teams page into one row per team."""
+    soup = BeautifulSoup(html, 'html.parser')
     team_links = soup.find_all('a', class_='s-country-title')
     team_data = []
     
@@ -185,65 +239,109 @@ def get_teams_df():
             
     return pd.DataFrame(team_data)
 
-def upload_to_spreadsheets(df):
+def _upload_lineups(spreadsheet_id, values):
+    """
+    Replace the contents of one spreadsheet's Lineups sheet with `values` in place.
+
+    The sheet is created only if missing and grown only if too small. The payload is
+    padded to the sheet's full grid, so clearing leftovers of a longer roster and
+    writing the new one happen in the same values_batch_update.
+    """
+    n_rows, n_cols = len(values), len(values[0])
+    spreadsheet = with_quota(read_quota, open_spreadsheet, spreadsheet_id)
+    try:
+        worksheet = with_quota(read_quota, get_worksheet, spreadsheet, LINEUPS_SHEET)
+        rows, cols = max(worksheet.row_count, n_rows), max(worksheet.col_count, n_cols)
+        if (rows, cols) != (worksheet.row_count, worksheet.col_count):
+            with_quota(write_quota, worksheet.resize, rows=rows, cols=cols)
+    except gspread.exceptions.WorksheetNotFound:
+        with_quota(write_quota, add_worksheet, spreadsheet, LINEUPS_SHEET, n_rows, n_cols)
+        rows, cols = n_rows, n_cols
+
+    if (rows, cols) != (n_rows, n_cols):
+        values = [row + [''] * (cols - n_cols) for row in values] + [[''] * cols for _ in range(rows - n_rows)]
+    with_quota(write_quota, spreadsheet.values_batch_update, {
+        'valueInputOption': 'USER_ENTERED',
+        'data': [{'range': a1_range(LINEUPS_SHEET, 1, 1, rows, cols), 'values': values}],
+    })
+
+def upload_to_spreadsheets(df, max_workers=SHEETS_MAX_WORKERS):
     """
     Upload the player data to all configured spreadsheets.
-    Creates or replaces the "Lineups" sheet in each spreadsheet.
-    
+    Updates the "Lineups" sheet of every spreadsheet in place (creating it if
+    missing), so sheet IDs and formulas pointing at it stay valid.
+
+    The payload is serialized once and pushed to all spreadsheets concurrently;
+    requests are throttled to the Sheets API quotas by sheet_sync.with_quota.
+
     Args:
         df: DataFrame containing the player data
+
+    Returns:
+        dict mapping owner name -> error message for every failed upload
     """
     print(f"\nUploading data to {len(SPREADSHEETS)} spreadsheets...")
-    
-    # Connect to Google Sheets
-    credentials = ServiceAccountCredentials.from_json_keyfile_name(CREDENTIALS_PATH, SHEETS_SCOPE)
-    client = gspread.authorize(credentials)
-    
-    for owner_name, spreadsheet_id in SPREADSHEETS.items():
+
+    # Convert DataFrame to list of lists once; missing values become empty cells
+    values = [df.columns.tolist()] + df.astype(object).where(df.notna(), '').values.tolist()
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(SPREADSHEETS)))) as pool:
+        futures = {
+            owner_name: pool.submit(_upload_lineups, spreadsheet_id, values)
+            for owner_name, spreadsheet_id in SPREADSHEETS.items()
+        }
+
+    errors = {}
+    for owner_name, future in futures.items():
         try:
-            print(f"\nProcessing {owner_name}'s spreadsheet...")
-            
-            # Open spreadsheet
-            spreadsheet = client.open_by_key(spreadsheet_id)
-            
-            # Check if the Lineups sheet already exists and delete it
-            try:
-                existing_worksheet = spreadsheet.worksheet(LINEUPS_SHEET)
-                spreadsheet.del_worksheet(existing_worksheet)
-                print(f"  Removed existing '{LINEUPS_SHEET}' sheet")
-            except gspread.exceptions.WorksheetNotFound:
-                pass  # No existing sheet to delete
-            
-            # Create new worksheet and add data
-            rows = df.shape[0] + 1  # +1 for header
-            cols = df.shape[1]
-            
-            # Create new worksheet with appropriate dimensions
-            worksheet = spreadsheet.add_worksheet(title=LINEUPS_SHEET, rows=rows, cols=cols)
-            
-            # Convert DataFrame to list of lists for upload
-            values = [df.columns.tolist()] + df.values.tolist()
-            
-            # Update cells
-            worksheet.update(values, value_input_option='USER_ENTERED')
-            
+            future.result()
             print(f"  Successfully uploaded {df.shape[0]} rows to '{LINEUPS_SHEET}' in {owner_name}'s spreadsheet")
-            
         except Exception as e:
+            errors[owner_name] = str(e)
             print(f"  Error uploading to {owner_name}'s spreadsheet: {str(e)}")
 
-def scrape_and_process():
-    """Main function to scrape team data and process players"""
+    if errors:
+        print(f"\nFailed to upload to {len(errors)}/{len(SPREADSHEETS)} spreadsheets: {', '.join(errors)}")
+    return errors
+
+def scrape_rosters(championship_url=CHAMPIONSHIP_URL, max_workers=ROSTER_MAX_WORKERS):
+    """
+    Scrape every team roster of a championship.
+
+    Teams are fetched concurrently, at most ROSTER_MAX_WORKERS iihf.com requests at a
+    time in the whole process. Teams answered with a Cloudflare challenge are then
+    retried one at a time with backoff; if one still fails, ChallengePage is raised
+    rather than returning (and uploading) an incomplete roster.
+    """
     print("Fetching team data from IIHF website...")
-    df_teams = get_teams_df()
+    df_teams = get_teams_df(championship_url)
     print(f"Found {len(df_teams)} teams")
-    
+
+    teams = df_teams.to_dict('records')
+
+    def fetch(team):
+        return extract_players_from_team_page(team['team_url'], team['country'], team['team_abbr'], championship_url)
+
+    def fetch_first_try(team):
+        try:
+            return fetch(team)
+        except ChallengePage as e:
+            print(e)
+            return None
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, ROSTER_MAX_WORKERS))) as pool:
+        rosters = list(pool.map(fetch_first_try, teams))
+
+    challenged = [i for i, players in enumerate(rosters) if players is None]
+    if challenged:
+        print(f"Retrying {len(challenged)} challenged team page(s) one at a time")
+    for i in challenged:
+        rosters[i] = with_challenge_retries(lambda: fetch(teams[i]), teams[i]['team_abbr'])
+
     all_players = []
-    for _, row in df_teams.iterrows():
-        print(f"Scraping players from {row['country_name']} ({row['team_abbr']})...")
-        players = extract_players_from_team_page(row['team_url'], row['country'], row['team_abbr'])
+    for team, players in zip(teams, rosters):
+        print(f"Scraped {len(players)} players from {team['country_name']} ({team['team_abbr']})")
         all_players.extend(players)
-        print(f"  Added {len(players)} players")
 
     # Create and filter players DataFrame
     print("\nCreating final player dataset...")
@@ -252,13 +350,19 @@ def scrape_and_process():
     df_players = df_players[~(((df_players['name'].str.replace('#', '').str.isdigit()) | 
                             (df_players['name'].str.lower() == "name")) & 
                             df_players['position'].isna())]
+    return df_players
+
+def scrape_and_process(championship_url=CHAMPIONSHIP_URL, csv_path=LINEUPS_CSV, upload=True):
+    """Main function to scrape team data and process players"""
+    df_players = scrape_rosters(championship_url)
     
     # Save to CSV
-    df_players.to_csv(LINEUPS_CSV, index=False)
-    print(f"Lineups saved to {LINEUPS_CSV} with {len(df_players)} total players")
+    df_players.to_csv(csv_path, index=False)
+    print(f"Lineups saved to {csv_path} with {len(df_players)} total players")
     
     # Upload to all spreadsheets
-    upload_to_spreadsheets(df_players)
+    if upload:
+        upload_to_spreadsheets(df_players)
     
     return df_players
 
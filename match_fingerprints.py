@@ -0,0 +1,127 @@
+"""
+Fingerprints of parsed match statistics, used to skip re-ingesting unchanged games.
+
+A fingerprint is a hash over the normalized stat rows of one match: the Event column
+is dropped, values are rendered as canonical strings and rows are sorted, so the same
+box score always hashes the same regardless of scrape order or int/float dtype.
+"""
+import hashlib
+import json
+import os
+import re
+from contextlib import contextmanager
+from datetime import datetime
+from config import MATCH_FINGERPRINTS_JSON
+
+try:
+    import fcntl
+except ImportError:  # Windows: saves are not coordinated across processes
+    fcntl = None
+
+# After this many consecutive runs with an identical fingerprint the game is
+# treated as final and is no longer scraped.
+FINAL_AFTER_UNCHANGED = 2
+
+_GAME_ID_RE = re.compile(r'/gamecenter/(?:playbyplay|statistics)/(\d+)')
+
+
+def game_id_from_url(url):
+    """Return the stable IIHF game id from a gamecenter URL, or None."""
+    match = _GAME_ID_RE.search(str(url))
+    return match.group(1) if match else None
+
+
+def _normalize_value(value):
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    text = str(value).strip()
+    if re.fullmatch(r'-?\d+\.0+', text):
+        text = text.split('.')[0]
+    return text
+
+
+def fingerprint_stats(stats_df):
+    """Hash a stats DataFrame (as returned by extract_all_stats) into a hex digest."""
+    df = stats_df.drop(columns=['Event'], errors='ignore')
+    columns = sorted(df.columns)
+    rows = sorted(
+        [_normalize_value(v) for v in row]
+        for row in df[columns].itertuples(index=False, name=None)
+    )
+    payload = json.dumps([columns, rows], ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class FingerprintStore:
+    """
+    Small JSON-backed map of game id -> last written fingerprint.
+
+    Each entry also remembers where the rows were written in the Day worksheet
+    (start_row, row_count) so a changed game can be updated in place.
+
+    Several processes may share one file (a cron run and a manual pipeline run):
+    save() takes an exclusive lock on "<path>.lock", merges the games this store
+    recorded into the file's current contents and writes the result back.
+    """
+
+    def __init__(self, path=MATCH_FINGERPRINTS_JSON):
+        self.path = path
+        self.entries = self._read()
+        self._recorded = set()  # game ids recorded since the last save
+
+    def _read(self):
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path, encoding='utf-8') as f:
+            return json.load(f)
+
+    @contextmanager
+    def _file_lock(self):
+        if fcntl is None:
+            yield
+            return
+        with open(f"{self.path}.lock", 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def get(self, game_id):
+        return self.entries.get(str(game_id))
+
+    def is_final(self, game_id):
+        entry = self.get(game_id)
+        return bool(entry) and entry.get('unchanged_runs', 0) >= FINAL_AFTER_UNCHANGED
+
+    def last_row(self, worksheet):
+        """Last sheet row holding a game recorded for worksheet, or None if it has none."""
+        ends = [
+            entry['start_row'] + entry['row_count'] - 1
+            for entry in self.entries.values()
+            if entry.get('worksheet') == worksheet and entry.get('start_row')
+        ]
+        return max(ends, default=None)
+
+    def record(self, game_id, fingerprint, **fields):
+        """Store a fingerprint; returns True if it differs from the stored one."""
+        entry = self.entries.setdefault(str(game_id), {})
+        changed = entry.get('hash') != fingerprint
+        entry['unchanged_runs'] = 0 if changed else entry.get('unchanged_runs', 0) + 1
+        entry['hash'] = fingerprint
+        entry['updated_at'] = datetime.now().isoformat(timespec='seconds')
+        entry.update(fields)
+        self._recorded.add(str(game_id))
+        return changed
+
+    def save(self):
+        """Write our recorded games over the file's current entries; other games are kept."""
+        with self._file_lock():
+            merged = self._read()
+            merged.update({game_id: self.entries[game_id] for game_id in self._recorded})
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(merged, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        self.entries = merged
+        self._recorded.clear()
@@ -1,19 +1,43 @@
 import requests
 from bs4 import BeautifulSoup
 import pandas as pd
-from other_stats_scraper_selenium import extract_other_stats
+from other_stats_scraper_selenium import fetch_playbyplay_html, parse_playbyplay_html
+from match_fingerprints import game_id_from_url
+from page_archive import archive_page, STATISTICS, PLAYBYPLAY
 
 # URL of the IIHF website page you want to scrape
 #url = 'https://www.iihf.com/en/events/2024/wm20/gamecenter/statistics/42153/1-svk-vs-cze'
 
 def extract_all_stats(url_playbyplay, url_statistics):
+    """Fetch both gamecenter pages, archive them and return the combined stats DataFrame."""
     # Send a GET request to the URL
     response = requests.get(url_statistics)
-
-    # Check if the request was successful
+    statistics_html = None
     if response.status_code == 200:
+        statistics_html = response.content
+        archive_page(game_id_from_url(url_statistics), STATISTICS, statistics_html, url=url_statistics)
+    else:
+        print(f"Failed to retrieve the webpage. Status code: {response.status_code}")
+
+    playbyplay_html = fetch_playbyplay_html(url_playbyplay)
+    archive_page(game_id_from_url(url_playbyplay), PLAYBYPLAY, playbyplay_html, url=url_playbyplay)
+
+    return build_match_stats(statistics_html, playbyplay_html)
+
+
+def build_match_stats(statistics_html, playbyplay_html):
+    """
+    Parse the statistics and play-by-play pages of one game into per-player stats.
+    Works on live or archived HTML; statistics_html may be None if the page was unavailable.
+    """
+    players_df = pd.DataFrame()
+    players_away_df = pd.DataFrame()
+    goalies_df = pd.DataFrame()
+    goalies_away_df = pd.DataFrame()
+
+    if statistics_html is not None:
         # Parse the HTML content of the page
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = BeautifulSoup(statistics_html, 'html.parser')
 
         teams = ['s-team--home', 's-team--away']
         player_stats_names = {
@@ -30,10 +54,6 @@ def extract_all_stats(url_playbyplay, url_statistics):
         player_list = []
         goalies_list = []
         stats_list = []
-        players_df = pd.DataFrame()
-        players_away_df = pd.DataFrame()
-        goalies_df = pd.DataFrame()
-        goalies_away_df = pd.DataFrame()
 
         for team in teams:
             team_name_soup = soup.find('div', class_=team)
@@ -84,13 +104,11 @@ def extract_all_stats(url_playbyplay, url_statistics):
                 else:
                     goalies_away_df[stat_name] = stats_list
                 stats_list = []
-    else:
-        print(f"Failed to retrieve the webpage. Status code: {response.status_code}")
 
     players_df = pd.concat([players_df, players_away_df], ignore_index=True)
     goalies_df = pd.concat([goalies_df, goalies_away_df], ignore_index=True)
     players_df = players_df.merge(goalies_df, on='Player', how='left').replace("", 0).fillna(0)
-    others_df, match_score_home, match_score_away = extract_other_stats(url_playbyplay)
+    others_df, match_score_home, match_score_away = parse_playbyplay_html(playbyplay_html)
     if not others_df.empty:
         fin_df = players_df.merge(others_df, on='Player', how='left').replace("", 0).fillna(0)
         winners = fin_df[fin_df['Game Winning Goal'] > 0]['Team'].values # Get the team that scored the game-winning goal
@@ -116,4 +134,5 @@ def extract_all_stats(url_playbyplay, url_statistics):
     print(fin_df)
     return fin_df
 
-extract_all_stats('https://www.iihf.com/en/events/2025/wm/gamecenter/playbyplay/62022/','https://www.iihf.com/en/events/2025/wm/gamecenter/statistics/62022/')
\ No newline at end of file
+if __name__ == "__main__":
+    extract_all_stats('https://www.iihf.com/en/events/2025/wm/gamecenter/playbyplay/62022/','https://www.iihf.com/en/events/2025/wm/gamecenter/statistics/62022/')
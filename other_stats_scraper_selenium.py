@@ -4,12 +4,42 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
+import re
 import pandas as pd
+from bs4 import BeautifulSoup
 from game_winning_goals import extract_gwg
 import tempfile
 from selenium.webdriver.chrome.options import Options
 
-def extract_other_stats(url_name):
+# Classes that hide an element in a desktop-sized browser window (Bootstrap utilities)
+_HIDDEN_CLASSES = {'d-sm-none', 'd-md-none', 'd-lg-none', 'hidden', 'invisible'}
+# "d-none d-md-inline": hidden on phones only, shown again from this breakpoint up
+_SHOWN_FROM_RE = re.compile(r'^d-(sm|md|lg)-(?!none$)[a-z-]+$')
+_HIDDEN_STYLE_RE = re.compile(r'display\s*:\s*none|visibility\s*:\s*hidden', re.I)
+
+def _is_hidden(tag):
+    if tag.has_attr('hidden') or _HIDDEN_STYLE_RE.search(tag.get('style', '')):
+        return True
+    classes = tag.get('class') or ()
+    if any(c in _HIDDEN_CLASSES for c in classes):
+        return True
+    return 'd-none' in classes and not any(_SHOWN_FROM_RE.match(c) for c in classes)
+
+def _strip_hidden(soup):
+    """Remove nodes a browser does not render, so get_text() matches Selenium's .text."""
+    for tag in soup(['script', 'style', 'template', 'noscript']):
+        tag.decompose()
+    for tag in soup.find_all(_is_hidden):
+        if not tag.decomposed:
+            tag.decompose()
+    return soup
+
+def _text(element):
+    """Visible-text approximation of a tag: whitespace-collapsed, like Selenium's .text."""
+    return ' '.join(element.get_text(' ').split())
+
+def fetch_playbyplay_html(url_name):
+    """Render the play-by-play page in Chrome and return its HTML once the timeline has loaded."""
     options = Options()
     options.add_argument(f"--user-data-dir={tempfile.mkdtemp()}")
 
@@ -25,51 +55,62 @@ def extract_other_stats(url_name):
         
         # Wait for timeline events to load
         wait.until(EC.presence_of_element_located((By.CLASS_NAME, 's-timeline-event.js-timeline-event')))
-        
-        # Get all timeline events
-        events = driver.find_elements(By.CLASS_NAME, 's-timeline-event.js-timeline-event')
+        return driver.page_source
 
-        # Parse game result
-        match_score_home = driver.find_elements(By.CLASS_NAME, 's-team-score')[0].text
-        match_score_away = driver.find_elements(By.CLASS_NAME, 's-team-score')[1].text
+    finally:
+        # Clean up browser instance
+        driver.quit()
+
+def parse_playbyplay_html(html):
+    """Parse goal events and the final score from a rendered play-by-play page."""
+    soup = _strip_hidden(BeautifulSoup(html, 'html.parser'))
+
+    # Get all timeline events
+    events = soup.select('.s-timeline-event.js-timeline-event')
+
+    # Parse game result
+    scores = soup.find_all(class_='s-team-score')
+    match_score_home = _text(scores[0])
+    match_score_away = _text(scores[1])
+    
+    # Parse goal events
+    goal_data = []
+    for event in events:
+        # Extract description cell
+        description = event.find(class_='s-cell--description')
+        if description is None:
+            continue
+        
+        # Get event title
+        title = _text(description.find(class_='s-title'))
         
-        # Parse goal events
-        goal_data = []
-        for event in events:
-            # Extract description cell
-            description = event.find_element(By.CLASS_NAME, 's-cell--description')
-            
-            # Get event title
-            title = description.find_element(By.CLASS_NAME, 's-title').text
-            
-            # Check if it's a goal event (has player info)
-            player_elements = description.find_elements(By.CLASS_NAME, 's-player')
-            if player_elements:
-                # Extract scorer name
-                scorer = player_elements[0].find_element(By.CLASS_NAME, 's-name').text
-                goal_data.append({
-                    'Event': title.strip(),
-                    'Player': scorer.strip()
-                })
+        # Check if it's a goal event (has player info)
+        player_elements = description.find_all(class_='s-player')
+        if player_elements:
+            # Extract scorer name
+            scorer = _text(player_elements[0].find(class_='s-name'))
+            goal_data.append({
+                'Event': title.strip(),
+                'Player': scorer.strip()
+            })
 
-        # Create and display DataFrame
-        df = pd.DataFrame(goal_data)
-        # Create Shorthanded and Power Play columns
-        if not df.empty:
-            df = df[df.Event.str.contains('Goal!')]
-            df['Shorthanded Goal'] = df['Event'].str.contains('\(SH').astype(int)
-            df['Power Play Goal'] = df['Event'].str.contains('\(PP').astype(int)
+    # Create and display DataFrame
+    df = pd.DataFrame(goal_data)
+    # Create Shorthanded and Power Play columns
+    if not df.empty:
+        df = df[df.Event.str.contains('Goal!')]
+        df['Shorthanded Goal'] = df['Event'].str.contains(r'\(SH').astype(int)
+        df['Power Play Goal'] = df['Event'].str.contains(r'\(PP').astype(int)
 
-            df = extract_gwg(df) # Extract GWG
-            df['Event'] = df.pop('Event') # Move Event column to the end
-            df = df.groupby('Player').agg({
-                                    'Shorthanded Goal': 'sum',
-                                    'Power Play Goal': 'sum',
-                                    'Game Winning Goal': 'sum',
-                                    'Event': list
-                                    }).reset_index()
-        return df, match_score_home, match_score_away
+        df = extract_gwg(df) # Extract GWG
+        df['Event'] = df.pop('Event') # Move Event column to the end
+        df = df.groupby('Player').agg({
+                                'Shorthanded Goal': 'sum',
+                                'Power Play Goal': 'sum',
+                                'Game Winning Goal': 'sum',
+                                'Event': list
+                                }).reset_index()
+    return df, match_score_home, match_score_away
 
-    finally:
-        # Clean up browser instance
-        driver.quit()
\ No newline at end of file
+def extract_other_stats(url_name):
+    return parse_playbyplay_html(fetch_playbyplay_html(url_name))
@@ -0,0 +1,246 @@
+"""
+Append-only archive of every page fetched from iihf.com.
+
+Pages are compressed (zstd with a dictionary trained on IIHF pages; zlib, with a
+warning, if the `zstandard` package from requirements.txt is missing) and appended to a single data
+file. A SQLite index maps (game id, page type, fetched_at) to the record's offset,
+and reads go through a memory map of the data file, so re-parsing a whole
+tournament needs neither the network nor a browser.
+
+Usage (CLI):
+    python page_archive.py stats            # pages per type and on-disk size
+    python page_archive.py train            # train the zstd dictionary on archived pages
+"""
+import mmap
+import os
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from config import PAGE_ARCHIVE_DIR, ARCHIVE_PAGES
+
+try:
+    import zstandard
+except ImportError:  # zlib fallback keeps the archive usable without the extra dependency
+    zstandard = None
+
+DATA_FILE = "pages.arc"
+INDEX_FILE = "index.sqlite"
+DICT_SIZE = 112 * 1024
+ZSTD_LEVEL = 10
+
+# Page types stored in the archive
+SCHEDULE = "schedule"
+TEAMS = "teams"
+ROSTER = "roster"
+STATISTICS = "statistics"
+PLAYBYPLAY = "playbyplay"
+
+
+def event_key(championship_url):
+    """Archive key for championship-wide pages, e.g. "2026/wm20"."""
+    return championship_url.rstrip("/").split("/events/")[-1]
+
+
+class PageArchive:
+    def __init__(self, directory=None):
+        # Relative paths are resolved against the repo root so every script shares one archive
+        directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), directory or PAGE_ARCHIVE_DIR)
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.data_path = os.path.join(directory, DATA_FILE)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            os.path.join(directory, INDEX_FILE), check_same_thread=False, isolation_level=None
+        )
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS pages (
+                id INTEGER PRIMARY KEY,
+                game_id TEXT NOT NULL,
+                page_type TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                url TEXT,
+                codec TEXT NOT NULL,
+                dict_id INTEGER NOT NULL DEFAULT 0,
+                offset INTEGER NOT NULL,
+                length INTEGER NOT NULL,
+                raw_length INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS ix_pages_key ON pages (game_id, page_type, fetched_at);
+            CREATE TABLE IF NOT EXISTS dictionaries (
+                id INTEGER PRIMARY KEY,
+                data BLOB NOT NULL,
+                created_at REAL NOT NULL
+            );
+        """)
+        open(self.data_path, "ab").close()
+        if zstandard is None:
+            print("Warning: zstandard is not installed; archiving pages with zlib, "
+                  "and zstd records already in the archive can't be read")
+        self._mmap = None
+        self._mapped_size = 0
+        self._dicts = {}
+
+    # ── Compression ───────────────────────────────────────────
+
+    def _dictionary(self, dict_id):
+        if dict_id not in self._dicts:
+            (data,) = self._db.execute("SELECT data FROM dictionaries WHERE id = ?", (dict_id,)).fetchone()
+            self._dicts[dict_id] = zstandard.ZstdCompressionDict(data)
+        return self._dicts[dict_id]
+
+    def _latest_dict_id(self):
+        row = self._db.execute("SELECT MAX(id) FROM dictionaries").fetchone()
+        return row[0] or 0
+
+    def _compress(self, content):
+        if zstandard is None:
+            return "zlib", 0, zlib.compress(content, 9)
+        dict_id = self._latest_dict_id()
+        if dict_id:
+            compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL, dict_data=self._dictionary(dict_id))
+        else:
+            compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+        return "zstd", dict_id, compressor.compress(content)
+
+    def _decompress(self, codec, dict_id, blob):
+        if codec == "zlib":
+            return zlib.decompress(blob)
+        if zstandard is None:
+            raise RuntimeError("Archive record is zstd-compressed; install the 'zstandard' package")
+        if dict_id:
+            return zstandard.ZstdDecompressor(dict_data=self._dictionary(dict_id)).decompress(blob)
+        return zstandard.ZstdDecompressor().decompress(blob)
+
+    def train_dictionary(self, sample_limit=2000):
+        """Train a zstd dictionary on archived pages; new records are compressed with it."""
+        if zstandard is None:
+            print("zstandard is not installed; archive uses zlib without a dictionary")
+            return None
+        rows = self._db.execute(
+            "SELECT id FROM pages ORDER BY fetched_at DESC LIMIT ?", (sample_limit,)
+        ).fetchall()
+        samples = [self.read_record(record_id) for (record_id,) in rows]
+        if len(samples) < 10:
+            print(f"Only {len(samples)} pages archived; need at least 10 to train a dictionary")
+            return None
+        trained = zstandard.train_dictionary(DICT_SIZE, samples)
+        with self._lock, self._db:
+            cursor = self._db.execute(
+                "INSERT INTO dictionaries (data, created_at) VALUES (?, ?)",
+                (trained.as_bytes(), time.time()),
+            )
+        print(f"Trained {len(trained.as_bytes()) // 1024} KiB dictionary on {len(samples)} pages")
+        return cursor.lastrowid
+
+    # ── Writing ───────────────────────────────────────────────
+
+    def put(self, game_id, page_type, content, url=None, fetched_at=None):
+        """Append one fetched page. `content` may be bytes or str."""
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        codec, dict_id, blob = self._compress(content)
+        with self._lock:
+            # BEGIN IMMEDIATE serializes writers across processes, so the offset we
+            # read from the end of the data file is the one our record lands at.
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                with open(self.data_path, "ab") as f:
+                    offset = f.seek(0, os.SEEK_END)
+                    f.write(blob)
+                self._db.execute(
+                    "INSERT INTO pages (game_id, page_type, fetched_at, url, codec, dict_id, offset, length, raw_length)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (str(game_id), page_type, fetched_at or time.time(), url,
+                     codec, dict_id, offset, len(blob), len(content)),
+                )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+
+    # ── Reading ───────────────────────────────────────────────
+
+    def _view(self, end):
+        """Return a memory map covering at least `end` bytes of the data file."""
+        if self._mmap is None or end > self._mapped_size:
+            if self._mmap is not None:
+                self._mmap.close()
+            with open(self.data_path, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._mapped_size = len(self._mmap)
+        return self._mmap
+
+    def read_record(self, record_id):
+        codec, dict_id, offset, length = self._db.execute(
+            "SELECT codec, dict_id, offset, length FROM pages WHERE id = ?", (record_id,)
+        ).fetchone()
+        with self._lock:
+            blob = self._view(offset + length)[offset:offset + length]
+        return self._decompress(codec, dict_id, blob)
+
+    def latest(self, game_id, page_type):
+        """Most recently fetched content of a page, or None if never archived."""
+        row = self._db.execute(
+            "SELECT id FROM pages WHERE game_id = ? AND page_type = ? ORDER BY fetched_at DESC LIMIT 1",
+            (str(game_id), page_type),
+        ).fetchone()
+        return self.read_record(row[0]) if row else None
+
+    def game_ids(self, page_type):
+        return [gid for (gid,) in self._db.execute(
+            "SELECT DISTINCT game_id FROM pages WHERE page_type = ?", (page_type,)
+        )]
+
+    def stats(self):
+        rows = self._db.execute(
+            "SELECT page_type, COUNT(*), SUM(length), SUM(raw_length) FROM pages GROUP BY page_type"
+        ).fetchall()
+        return {page_type: {"pages": n, "bytes": stored, "raw_bytes": raw} for page_type, n, stored, raw in rows}
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._db.close()
+
+
+_archive = None
+_archive_lock = threading.Lock()
+
+
+def get_archive():
+    """Process-wide archive, or None when ARCHIVE_PAGES is disabled in config."""
+    global _archive
+    if not ARCHIVE_PAGES:
+        return None
+    with _archive_lock:
+        if _archive is None:
+            _archive = PageArchive()
+    return _archive
+
+
+def archive_page(game_id, page_type, content, url=None):
+    """Store a fetched page if archiving is enabled; never lets an archive error break a scrape."""
+    archive = get_archive()
+    if archive is None or not content:
+        return
+    try:
+        archive.put(game_id, page_type, content, url=url)
+    except Exception as e:
+        print(f"Warning: could not archive {page_type} page for {game_id}: {e}")
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "stats"
+    archive = PageArchive()
+    if command == "train":
+        archive.train_dictionary()
+    elif command == "stats":
+        for page_type, s in sorted(archive.stats().items()):
+            ratio = s["raw_bytes"] / s["bytes"] if s["bytes"] else 0
+            print(f"{page_type:>11}: {s['pages']:>5} pages, {s['bytes'] / 1e6:.1f} MB ({ratio:.1f}x)")
+    else:
+        print("Usage: python page_archive.py [stats|train]")
+        sys.exit(1)
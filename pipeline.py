@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Single entry point for the scrape -> sheets -> score pipeline.
+
+Subcommands:
+    schedule      sync the match schedule CSV (url_scraper.sync_schedule)
+    rosters       scrape team rosters to the lineups CSV; --upload pushes them to the owner sheets
+    ingest        scrape matches that started recently into the Day sheets (app.process_match)
+    sync-sheets   copy the owners' lineups into the Sestavy sheet (update_sestavy_sheet)
+    score         recalculate fantasy scores in the web app database (scraper_bridge.py score)
+
+--championship takes a key from config.CHAMPIONSHIPS or an event URL and may be given
+several times; schedule, rosters and ingest then run for every championship at once,
+each with its own CSVs, fingerprint file and Day spreadsheet. --jobs bounds the work
+done in parallel (championships, owner spreadsheets); --ingest-jobs separately
+bounds the matches ingest scrapes at once, since each one runs a Chrome, and roster
+pages are fetched at most config.ROSTER_MAX_WORKERS at a time. Every run ends
+with a timing summary per step and championship; --json also writes it to a file.
+
+Usage:
+    python pipeline.py schedule --championship wm --championship wm20
+    python pipeline.py ingest --championship wm,wm20 --ingest-jobs 3
+    python pipeline.py rosters --upload
+    python pipeline.py sync-sheets --jobs 16 --json timings.json
+    python pipeline.py score --day 3
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from config import (
+    CHAMPIONSHIPS, CHAMPIONSHIP_URL, MATCH_URLS_CSV, LINEUPS_CSV, MATCH_FINGERPRINTS_JSON,
+    MAIN_SPREADSHEET, SHEETS_MAX_WORKERS, INGEST_MAX_WORKERS,
+)
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'web', 'backend')
+
+
+class Championship:
+    """One championship the pipeline runs for, with the files and spreadsheet it uses."""
+
+    def __init__(self, key, url, spreadsheet=MAIN_SPREADSHEET):
+        self.key = key
+        self.url = url.rstrip('/')
+        self.spreadsheet = spreadsheet
+        if self.url == CHAMPIONSHIP_URL:
+            # The default championship keeps the files the standalone scripts use
+            self.match_urls_csv = MATCH_URLS_CSV
+            self.lineups_csv = LINEUPS_CSV
+            self.fingerprints_json = MATCH_FINGERPRINTS_JSON
+        else:
+            self.match_urls_csv = f"match_urls_{key}.csv"
+            self.lineups_csv = f"lineups_{key}.csv"
+            self.fingerprints_json = f"match_fingerprints_{key}.json"
+
+
+def resolve_championship(name):
+    """Championship for a config.CHAMPIONSHIPS key or an event URL."""
+    if name in CHAMPIONSHIPS:
+        return Championship(name, **CHAMPIONSHIPS[name])
+    if name.startswith('http'):
+        url = name.rstrip('/')
+        for key, entry in CHAMPIONSHIPS.items():
+            if entry['url'].rstrip('/') == url:
+                return Championship(key, **entry)
+        # Unknown event: its Day sheets go to the main spreadsheet
+        return Championship(url.split('/events/')[-1].replace('/', '-'), url)
+    raise ValueError(f"Unknown championship {name!r}; use one of {', '.join(CHAMPIONSHIPS)} or an event URL")
+
+
+def default_championship():
+    return resolve_championship(CHAMPIONSHIP_URL)
+
+
+def run_schedule(championship, args):
+    from url_scraper import sync_schedule
+
+    result = sync_schedule(championship.match_urls_csv, championship.url)
+    if result is None:
+        raise RuntimeError("schedule page could not be fetched")
+    added, changed, removed = result
+    return f"{len(added)} added, {len(changed)} changed, {len(removed)} removed"
+
+
+def run_rosters(championship, args):
+    from lineups_scraper import scrape_rosters, upload_to_spreadsheets
+
+    df_players = scrape_rosters(championship.url)  # iihf.com fetches have their own cap
+    df_players.to_csv(championship.lineups_csv, index=False)
+    print(f"Lineups saved to {championship.lineups_csv} with {len(df_players)} total players")
+    detail = f"{len(df_players)} players"
+    if args.upload:
+        errors = upload_to_spreadsheets(df_players, max_workers=args.jobs)
+        if errors:
+            raise RuntimeError(f"{detail}, upload failed for {', '.join(errors)}")
+        detail += ", uploaded"
+    return detail
+
+
+def run_ingest(championship, args):
+    from url_scraper import select_recent_matches
+    from match_fingerprints import FingerprintStore, game_id_from_url
+    from day_sheet_writer import DaySheetWriter
+    from app import process_match
+
+    recent = select_recent_matches(pd.read_csv(championship.match_urls_csv), args.hours, args.date)
+    recent = recent[recent['url_playbyplay'].str.startswith('http') & recent['url_statistics'].str.startswith('http')]
+
+    writer = DaySheetWriter(
+        store=FingerprintStore(championship.fingerprints_json),
+        spreadsheet_title=None if championship.spreadsheet == MAIN_SPREADSHEET else championship.spreadsheet,
+    )
+    matches = recent.to_dict('records')
+    if not args.force:
+        # Games whose stats stopped changing are final; don't launch a browser for them again
+        matches = [m for m in matches if not writer.store.is_final(game_id_from_url(m['url_statistics']))]
+    skipped = len(recent) - len(matches)
+
+    def ingest_match(m):
+        # The slots are shared by every championship in this run
+        with args.browser_slots:
+            return process_match(m['Day'], m['url_playbyplay'], m['url_statistics'], writer=writer)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(args.ingest_jobs, len(matches) or 1))) as pool:
+        results = list(pool.map(ingest_match, matches))
+    # Write everything still buffered; a failure here fails the step
+    writer.close()
+
+    failed = results.count(False)
+    detail = f"{len(matches) - failed} processed, {failed} failed, {skipped} final"
+    if failed:
+        raise RuntimeError(detail)
+    return detail
+
+
+def run_sync_sheets(championship, args):
+    from update_sestavy_sheet import update_sestavy_sheet
+
+    update_sestavy_sheet(max_workers=args.jobs)
+    return "Sestavy updated"
+
+
+def run_score(championship, args):
+    # The backend's app package clashes with the root app.py, so score in its own process
+    command = [sys.executable, 'scraper_bridge.py', 'score']
+    if args.day is not None:
+        command.append(str(args.day))
+    completed = subprocess.run(command, cwd=BACKEND_DIR, capture_output=True, text=True)
+    print(completed.stdout, end='')
+    if completed.returncode != 0:
+        errors = [line for line in completed.stderr.splitlines() if 'Error' in line]
+        raise RuntimeError(errors[-1].strip() if errors else "scoring failed")
+    return f"{completed.stdout.count('Scores calculated')} days scored"
+
+
+# command -> (runner, runs once per championship)
+COMMANDS = {
+    'schedule': (run_schedule, True),
+    'rosters': (run_rosters, True),
+    'ingest': (run_ingest, True),
+    'sync-sheets': (run_sync_sheets, False),
+    'score': (run_score, False),
+}
+
+
+def run_step(command, championship, args):
+    """Run one step and return its timing record; errors are recorded, not raised."""
+    runner, _ = COMMANDS[command]
+    label = championship.key if championship else '-'
+    started = time.perf_counter()
+    try:
+        detail, status = runner(championship, args), 'ok'
+    except Exception as e:
+        detail, status = str(e), 'failed'
+        print(f"{command} [{label}] failed: {e}")
+    return {
+        'step': command,
+        'championship': label,
+        'status': status,
+        'seconds': round(time.perf_counter() - started, 3),
+        'detail': detail,
+    }
+
+
+def print_summary(records, total_seconds):
+    print(f"\n{'step':<12}{'championship':<14}{'status':<8}{'seconds':>9}  detail")
+    for r in records:
+        print(f"{r['step']:<12}{r['championship']:<14}{r['status']:<8}{r['seconds']:>9.3f}  {r['detail']}")
+    print(f"{'total':<34}{total_seconds:>9.3f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run IIHF pipeline steps for one or more championships.')
+    parser.add_argument('command', choices=list(COMMANDS), help='Pipeline step to run')
+    parser.add_argument('--championship', action='append', default=[],
+                        help='CHAMPIONSHIPS key or event URL; repeat or comma-separate for several '
+                             f"(default: {CHAMPIONSHIP_URL})")
+    parser.add_argument('--jobs', type=int, default=SHEETS_MAX_WORKERS,
+                        help=f'Work run in parallel (default: {SHEETS_MAX_WORKERS})')
+    parser.add_argument('--ingest-jobs', type=int, default=INGEST_MAX_WORKERS,
+                        help=f'ingest: matches scraped at once, each in its own Chrome (default: {INGEST_MAX_WORKERS})')
+    parser.add_argument('--hours', type=float, default=5.0,
+                        help='ingest: matches that started within this many hours (default: 5.0)')
+    parser.add_argument('--date', type=str, help='ingest: override date (format: DD MMM, e.g., "10 May")')
+    parser.add_argument('--force', action='store_true', help='ingest: re-scrape matches already final')
+    parser.add_argument('--upload', action='store_true', help='rosters: upload them to the owner spreadsheets')
+    parser.add_argument('--day', type=int, help='score: day to recalculate (default: every completed day)')
+    parser.add_argument('--json', dest='json_path', help='Also write the timing summary to this file')
+    args = parser.parse_args(argv)
+
+    try:
+        names = [name for value in args.championship for name in value.split(',') if name]
+        championships = [resolve_championship(name) for name in names] or [default_championship()]
+    except ValueError as e:
+        parser.error(str(e))
+    if args.jobs < 1 or args.ingest_jobs < 1:
+        parser.error("--jobs and --ingest-jobs must be at least 1")
+    args.browser_slots = threading.BoundedSemaphore(args.ingest_jobs)
+
+    _, per_championship = COMMANDS[args.command]
+    targets = championships if per_championship else [None]
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, min(args.jobs, len(targets)))) as pool:
+        records = list(pool.map(lambda c: run_step(args.command, c, args), targets))
+    total_seconds = time.perf_counter() - started
+
+    print_summary(records, total_seconds)
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump({'command': args.command, 'jobs': args.jobs, 'ingest_jobs': args.ingest_jobs, 'seconds': round(total_seconds, 3),
+                       'steps': records}, f, indent=2)
+
+    return 1 if any(r['status'] != 'ok' for r in records) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
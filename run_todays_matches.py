@@ -5,20 +5,22 @@ The script will:
 1. Check today's date
 2. Find matches scheduled for today in match_urls.csv
 3. Filter for matches that started less than an hour ago
-4. Run app.py for each relevant match, adding data to the correct "Day X" sheet
+4. Process each relevant match in-process (see app.process_match), adding data to
+   the correct "Day X" sheet; rows of all matches are written in one batched flush
 
 This script can be scheduled to run every hour (e.g., via cron job) to automatically
 process new matches as they start.
 """
 
 import pandas as pd
-import subprocess
-from datetime import datetime, timedelta
-import os
-import sys
+from datetime import datetime
 import argparse
 import logging
 from config import MATCH_URLS_CSV
+from url_scraper import select_recent_matches
+from match_fingerprints import game_id_from_url
+from app import process_match
+from day_sheet_writer import get_day_writer
 
 # Set up logging
 logging.basicConfig(
@@ -40,6 +42,8 @@ def main():
                         help='Run in test mode (print actions without executing app.py)')
     parser.add_argument('--date', type=str, 
                         help='Override date (format: DD MMM, e.g., "10 May")')
+    parser.add_argument('--force', action='store_true',
+                        help='Re-scrape matches even if their stats are already final')
     args = parser.parse_args()
 
     logger.info(f"Running automatic match data processing at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
@@ -52,48 +56,38 @@ def main():
         logger.error(f"Error loading match data: {str(e)}")
         return
     
-    # Get current date and time
-    now = datetime.now()
-    current_year = now.year
-    
     # Extract today's matches (or override date if provided)
     if args.date:
         today_str = args.date
         logger.info(f"Using override date: {today_str}")
     else:
-        today_str = now.strftime("%d %b").lstrip("0")  # Format like "10 May" (without leading 0)
+        today_str = datetime.now().strftime("%d %b").lstrip("0")  # Format like "10 May" (without leading 0)
         logger.info(f"Using today's date: {today_str}")
     
-    todays_matches = match_urls_df[match_urls_df['date'] == today_str].copy()
-    
-    if todays_matches.empty:
+    if not (match_urls_df['date'] == today_str).any():
         logger.info(f"No matches scheduled for {today_str}")
         return
     
-    logger.info(f"Found {len(todays_matches)} matches scheduled for {today_str}")
+    logger.info(f"Found {int((match_urls_df['date'] == today_str).sum())} matches scheduled for {today_str}")
     
-    # Convert match times to datetime objects for comparison
+    # Filter for matches that started less than X hours ago
     try:
-        todays_matches['datetime'] = todays_matches.apply(
-            lambda row: datetime.strptime(f"{row['date']} {current_year} {row['time']}", "%d %b %Y %H:%M"),
-            axis=1
-        )
+        recent_matches = select_recent_matches(match_urls_df, args.hours, today_str)
     except ValueError as e:
         logger.error(f"Error parsing date/time: {e}")
         logger.error("Ensure date format in CSV is 'DD MMM' (e.g., '10 May') and time format is 'HH:MM'")
         return
     
-    # Filter for matches that started less than X hours ago
-    hours_ago = now - timedelta(hours=args.hours)
-    recent_matches = todays_matches[todays_matches['datetime'] > hours_ago]
-    recent_matches = recent_matches[recent_matches['datetime'] <= now]
-    
     if recent_matches.empty:
         logger.info(f"No matches started within the last {args.hours} hour(s)")
         return
     
     logger.info(f"Found {len(recent_matches)} matches that started within the last {args.hours} hour(s):")
     
+    # One write-behind buffer for the whole run: rows of every match on the same
+    # day go out together, and missing Day sheets are created once
+    writer = get_day_writer()
+
     # Process each recent match
     for _, match in recent_matches.iterrows():
         day_number = match['Day']
@@ -107,28 +101,26 @@ def main():
         
         # Skip invalid URLs
         if not url_playbyplay.startswith('http') or not url_statistics.startswith('http'):
-            logger.warning(f"  Skipping match with invalid URLs")
+            logger.warning("  Skipping match with invalid URLs")
+            continue
+
+        # Games whose stats stopped changing are final; don't launch a browser for them again
+        if not args.force and writer.store.is_final(game_id_from_url(url_statistics)):
+            logger.info("  Skipping match: stats unchanged over the last runs (final)")
             continue
-        
-        # Run app.py with parameters for this match
-        cmd = [
-            sys.executable, 
-            "app.py",
-            "--day", str(day_number),
-            "--playbyplay", url_playbyplay,
-            "--statistics", url_statistics
-        ]
         
         if args.test:
-            logger.info(f"  TEST MODE: Would execute: {' '.join(cmd)}")
+            logger.info(f"  TEST MODE: Would process Day {day_number} match {url_statistics}")
+        elif process_match(day_number, url_playbyplay, url_statistics, writer=writer):
+            logger.info(f"  Success: stats queued for Day {day_number}")
         else:
-            try:
-                logger.info(f"  Executing app.py...")
-                result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-                logger.info(f"  Success: {result.stdout.strip()}")
-            except subprocess.CalledProcessError as e:
-                logger.error(f"  Error processing match: {e}")
-                logger.error(f"  Error details: {e.stderr}")
+            logger.error(f"  Error processing match: {url_statistics}")
+
+    # Write everything still buffered before exiting
+    try:
+        writer.close()
+    except Exception as e:
+        logger.error(f"Error writing to Google Sheets: {str(e)}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,235 @@
+"""
+Helpers for writing to Google Sheets with as few API calls as possible.
+
+A write set is described by a boolean mask over a grid of values. Adjacent True
+cells are merged into rectangles, and all rectangles are sent through
+Spreadsheet.values_batch_update, which counts as one request per call no matter
+how many ranges it carries.
+
+Calls fanned out over many spreadsheets go through with_quota(), which spaces
+them to stay within the per-user read/write quotas and retries on HTTP 429.
+"""
+import random
+import threading
+import time
+import numpy as np
+import pandas as pd
+
+# Keep each values_batch_update request well below the API payload limits
+MAX_CELLS_PER_REQUEST = 40000
+
+# Sheets API per-user quotas (requests per minute); reads and writes are counted separately
+READ_REQUESTS_PER_MINUTE = 60
+WRITE_REQUESTS_PER_MINUTE = 60
+QUOTA_RETRIES = 5
+
+
+class RateLimiter:
+    """Thread-safe token bucket allowing `rate` calls per `per` seconds."""
+
+    def __init__(self, rate, per=60.0):
+        self.capacity = rate
+        self.tokens = float(rate)
+        self.fill_rate = rate / per
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.fill_rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.fill_rate
+            time.sleep(wait)
+
+
+read_quota = RateLimiter(READ_REQUESTS_PER_MINUTE)
+write_quota = RateLimiter(WRITE_REQUESTS_PER_MINUTE)
+
+
+def _is_quota_error(error):
+    response = getattr(error, 'response', None)
+    return getattr(response, 'status_code', None) == 429
+
+
+def with_quota(limiter, fn, *args, **kwargs):
+    """Call fn once a quota token is available; back off and retry when the API answers 429."""
+    for attempt in range(QUOTA_RETRIES + 1):
+        limiter.acquire()
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            if attempt == QUOTA_RETRIES or not _is_quota_error(e):
+                raise
+            time.sleep(min(2 ** attempt, 64) + random.random())
+
+
+def col_letter(col):
+    """1-indexed column number -> A1 column letters (1 -> A, 27 -> AA)."""
+    letters = ''
+    while col > 0:
+        col, rem = divmod(col - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def a1_range(sheet_title, row0, col0, row1, col1):
+    """A1 range for a 1-indexed, inclusive rectangle, e.g. "'Sestavy'!B2:D5"."""
+    title = sheet_title.replace("'", "''")
+    return f"'{title}'!{col_letter(col0)}{row0}:{col_letter(col1)}{row1}"
+
+
+def sheet_frame(existing_rows, n_rows, n_cols):
+    """
+    Existing sheet values as an n_rows x n_cols DataFrame of strings.
+
+    existing_rows is the ragged list of lists returned by get_all_values(); cells
+    beyond its extent are ''.
+    """
+    frame = pd.DataFrame(existing_rows[:n_rows], dtype=object)
+    return frame.reindex(index=range(n_rows), columns=range(n_cols)).fillna('').astype(str)
+
+
+def align_frames(existing_rows, headers, df):
+    """
+    Align new data with the current sheet contents.
+
+    headers is the sheet's header row and existing_rows its data rows (header
+    excluded). Returns (existing, new, writable): two same-shaped frames indexed by
+    data row and 0-based sheet column, holding the current cell text and the new
+    value (native Python objects, '' where df has no column), plus a boolean
+    array marking the sheet columns df provides. df columns missing from the
+    sheet are dropped; duplicate headers map to their first occurrence.
+    """
+    header_map = {}
+    for position, header in enumerate(headers):
+        header_map.setdefault(header, position)
+    mapped = {header_map[c]: c for c in df.columns if c in header_map}
+
+    n_rows, n_cols = len(df), len(headers)
+    # rename + reindex places every mapped column at its sheet position in one step
+    new = (
+        df[list(mapped.values())]
+        .set_axis(list(mapped.keys()), axis=1)
+        .reset_index(drop=True)
+        .reindex(columns=range(n_cols))
+        .astype(object)
+        .fillna('')
+    )
+    existing = sheet_frame(existing_rows, n_rows, n_cols)
+    writable = np.zeros(n_cols, dtype=bool)
+    writable[list(mapped.keys())] = True
+    return existing, new, writable
+
+
+def blank_mask(frame):
+    """True where a cell of a string frame is empty or whitespace."""
+    return frame.apply(lambda col: col.str.strip() == '').to_numpy()
+
+
+def migrate_headers(spreadsheet, worksheet, existing_data, target_headers):
+    """
+    Re-lay a worksheet onto a new header layout in a constant number of requests.
+
+    Columns are moved with their data to the position of their header in
+    target_headers (duplicate headers keep their relative order); headers not in
+    the sheet yet become empty columns. Only the block from the first column whose
+    position changed to the right edge is rewritten, in a single
+    values_batch_update (plus one add_cols call if the sheet is too narrow).
+
+    Returns (migrated existing_data as list of lists, API requests made).
+    """
+    old_headers = existing_data[0] if existing_data else []
+    n_rows = max(len(existing_data), 1)
+    old = sheet_frame(existing_data, n_rows, len(old_headers))
+
+    # Header -> queue of its old column positions, consumed left to right
+    sources = {}
+    for position, header in enumerate(old_headers):
+        sources.setdefault(header, []).append(position)
+    source_cols = [sources[h].pop(0) if sources.get(h) else None for h in target_headers]
+
+    new = pd.DataFrame('', index=range(n_rows), columns=range(len(target_headers)), dtype=object)
+    for col, src in enumerate(source_cols):
+        if src is None:
+            new.iat[0, col] = target_headers[col]
+        else:
+            new[col] = old[src]
+
+    requests = 0
+    changed = [col for col, src in enumerate(source_cols) if src != col]
+    if changed:
+        first = changed[0]
+        if worksheet.col_count < len(target_headers):
+            worksheet.add_cols(len(target_headers) - worksheet.col_count)
+            requests += 1
+        # USER_ENTERED so moved numbers and dates are re-parsed rather than stored as text
+        spreadsheet.values_batch_update({
+            'valueInputOption': 'USER_ENTERED',
+            'data': [{
+                'range': a1_range(worksheet.title, 1, first + 1, n_rows, len(target_headers)),
+                'values': new.iloc[:, first:].to_numpy().tolist(),
+            }],
+        })
+        requests += 1
+    return new.to_numpy().tolist(), requests
+
+
+def coalesce_rectangles(mask):
+    """
+    Merge the True cells of a 2-D mask into rectangles.
+
+    Each row is split into horizontal runs; a run identical to one in the previous
+    row extends that rectangle downward. Returns 0-indexed inclusive
+    (row0, col0, row1, col1) tuples.
+    """
+    rectangles = []
+    open_runs = {}  # (col0, col1) -> row0 of a rectangle still growing downward
+    for r in range(mask.shape[0]):
+        padded = np.concatenate(([False], mask[r], [False])).astype(np.int8)
+        edges = np.flatnonzero(np.diff(padded))
+        runs = {(int(start), int(stop) - 1) for start, stop in zip(edges[::2], edges[1::2])}
+        for run, row0 in list(open_runs.items()):
+            if run not in runs:
+                rectangles.append((row0, run[0], r - 1, run[1]))
+                del open_runs[run]
+        for run in runs:
+            open_runs.setdefault(run, r)
+    last = mask.shape[0] - 1
+    rectangles.extend((row0, c0, last, c1) for (c0, c1), row0 in open_runs.items())
+    return rectangles
+
+
+def write_masked(spreadsheet, sheet_title, values, mask, origin=(1, 1), value_input_option='RAW'):
+    """
+    Write values[mask] to a worksheet in as few values_batch_update calls as possible.
+
+    values is a 2-D object array aligned with mask; origin is the 1-indexed sheet
+    (row, col) of values[0, 0]. Returns (cells written, API requests made).
+    """
+    row_off, col_off = origin
+    data = []
+    for r0, c0, r1, c1 in coalesce_rectangles(mask):
+        data.append({
+            'range': a1_range(sheet_title, r0 + row_off, c0 + col_off, r1 + row_off, c1 + col_off),
+            'values': values[r0:r1 + 1, c0:c1 + 1].tolist(),
+        })
+
+    requests = 0
+    batch, batch_cells = [], 0
+    for item in data:
+        cells = len(item['values']) * len(item['values'][0])
+        if batch and batch_cells + cells > MAX_CELLS_PER_REQUEST:
+            spreadsheet.values_batch_update({'valueInputOption': value_input_option, 'data': batch})
+            requests += 1
+            batch, batch_cells = [], 0
+        batch.append(item)
+        batch_cells += cells
+    if batch:
+        spreadsheet.values_batch_update({'valueInputOption': value_input_option, 'data': batch})
+        requests += 1
+    return int(mask.sum()), requests
@@ -0,0 +1,103 @@
+"""
+Process-wide Google Sheets client and handle registry.
+
+Every script used to load the service-account key, authorize a fresh gspread
+client and re-open its spreadsheets on each call; opening "IIHF" by title is a
+Drive search. Here the client is created once and reused (keeping its HTTP
+session and connections alive), its token is refreshed only when it is about to
+expire, and spreadsheet and worksheet handles are cached by key, so repeated
+sheet operations in one process cost only their own API calls.
+"""
+import threading
+import time
+import gspread
+from oauth2client.service_account import ServiceAccountCredentials
+from config import CREDENTIALS_PATH, SHEETS_SCOPE, MAIN_SPREADSHEET, MAIN_SPREADSHEET_KEY
+
+# Service-account access tokens live one hour; refresh a little before that
+TOKEN_REFRESH_AFTER = 55 * 60
+
+_lock = threading.Lock()
+_client = None
+_authorized_at = 0.0
+_spreadsheets = {}   # spreadsheet key -> Spreadsheet
+_worksheets = {}     # (spreadsheet key, worksheet title) -> Worksheet
+_keys_by_title = {}  # spreadsheet title -> key, so each title is searched in Drive once
+
+
+def get_client():
+    """Return the shared authorized gspread client."""
+    global _client, _authorized_at
+    with _lock:
+        now = time.monotonic()
+        if _client is None:
+            credentials = ServiceAccountCredentials.from_json_keyfile_name(CREDENTIALS_PATH, SHEETS_SCOPE)
+            _client = gspread.authorize(credentials)
+            _authorized_at = now
+        elif now - _authorized_at > TOKEN_REFRESH_AFTER:
+            # Older gspread releases send a fixed bearer header and need an explicit
+            # re-login; newer ones refresh the token inside their session themselves
+            login = getattr(_client, 'login', None)
+            if login is not None:
+                login()
+            _authorized_at = now
+        return _client
+
+
+def use_client(client):
+    """Swap in another client (e.g. fake_sheets.FakeSheets().client()) and drop every cached handle."""
+    global _client, _authorized_at
+    with _lock:
+        _client = client
+        _authorized_at = time.monotonic()
+        _spreadsheets.clear()
+        _worksheets.clear()
+        _keys_by_title.clear()
+
+
+def open_spreadsheet(key):
+    """Spreadsheet handle by key, opened once per process."""
+    spreadsheet = _spreadsheets.get(key)
+    if spreadsheet is None:
+        spreadsheet = get_client().open_by_key(key)
+        spreadsheet = _spreadsheets.setdefault(key, spreadsheet)
+    return spreadsheet
+
+
+def open_by_title(title):
+    """Spreadsheet handle by title; the Drive lookup happens only the first time."""
+    key = _keys_by_title.get(title)
+    if key is not None:
+        return open_spreadsheet(key)
+    spreadsheet = get_client().open(title)
+    _keys_by_title[title] = spreadsheet.id
+    return _spreadsheets.setdefault(spreadsheet.id, spreadsheet)
+
+
+def main_spreadsheet():
+    """The league's main spreadsheet (config.MAIN_SPREADSHEET), by key when one is configured."""
+    if MAIN_SPREADSHEET_KEY:
+        return open_spreadsheet(MAIN_SPREADSHEET_KEY)
+    return open_by_title(MAIN_SPREADSHEET)
+
+
+def get_worksheet(spreadsheet, title):
+    """Worksheet handle by title; raises gspread.exceptions.WorksheetNotFound like Spreadsheet.worksheet."""
+    cache_key = (spreadsheet.id, title)
+    worksheet = _worksheets.get(cache_key)
+    if worksheet is None:
+        worksheet = spreadsheet.worksheet(title)
+        worksheet = _worksheets.setdefault(cache_key, worksheet)
+    return worksheet
+
+
+def add_worksheet(spreadsheet, title, rows, cols):
+    """Create a worksheet and register its handle."""
+    worksheet = spreadsheet.add_worksheet(title=title, rows=rows, cols=cols)
+    _worksheets[(spreadsheet.id, title)] = worksheet
+    return worksheet
+
+
+def forget_worksheet(spreadsheet, title):
+    """Drop a cached worksheet handle, e.g. after the sheet was deleted or renamed."""
+    _worksheets.pop((spreadsheet.id, title), None)
@@ -1,18 +1,19 @@
 import pandas as pd
 import gspread
 import numpy as np
-from oauth2client.service_account import ServiceAccountCredentials
 from download_sheets_data import download_sheet_data
-from config import CREDENTIALS_PATH, SHEETS_SCOPE, SESTAVY_SHEET
+from sheet_sync import align_frames, blank_mask, migrate_headers, write_masked
+from sheets_client import main_spreadsheet, get_worksheet, add_worksheet
+from config import MAIN_SPREADSHEET, SESTAVY_SHEET, SHEETS_MAX_WORKERS
 
-def update_sestavy_sheet():
+def update_sestavy_sheet(max_workers=SHEETS_MAX_WORKERS):
     """
     Updates the "Sestavy" sheet in the Google Spreadsheet with data from download_sheet_data.py,
     but only writes to cells that are currently empty.
     """
     # Get the combined data from the download_sheets_data function
     print("Downloading data from source spreadsheets...")
-    combined_data = download_sheet_data()
+    combined_data = download_sheet_data(max_workers)
     
     if combined_data is None or combined_data.empty:
         print("No data to update. Exiting.")
@@ -43,29 +44,25 @@ def update_sestavy_sheet():
     print(f"Column names: {combined_data.columns.tolist()}")
     print(f"First few rows: \n{combined_data.head(3)}")
     
-    # Authenticate and connect to Google Sheets using the same credentials as in app.py
+    # Open the target spreadsheet through the shared client registry
     print("Connecting to Google Sheets...")
-    scope = SHEETS_SCOPE
-    credentials = ServiceAccountCredentials.from_json_keyfile_name(CREDENTIALS_PATH, scope)
-    client = gspread.authorize(credentials)
-    
-    # Open the target spreadsheet
     try:
-        spreadsheet = client.open("IIHF")
-        print(f"Successfully opened 'IIHF' spreadsheet")
+        spreadsheet = main_spreadsheet()
+        print(f"Successfully opened '{MAIN_SPREADSHEET}' spreadsheet")
     except Exception as e:
         print(f"Error opening spreadsheet: {str(e)}")
         return
     
     # Find or create the "Sestavy" worksheet
     try:
-        sestavy_worksheet = spreadsheet.worksheet(SESTAVY_SHEET)
+        sestavy_worksheet = get_worksheet(spreadsheet, SESTAVY_SHEET)
         print(f"Found existing '{SESTAVY_SHEET}' worksheet")
     except gspread.exceptions.WorksheetNotFound:
         print(f"'{SESTAVY_SHEET}' worksheet not found, creating a new one...")
         try:
-            sestavy_worksheet = spreadsheet.add_worksheet(
-                title=SESTAVY_SHEET,
+            sestavy_worksheet = add_worksheet(
+                spreadsheet,
+                SESTAVY_SHEET,
                 rows=max(1000, combined_data.shape[0] + 5),  # Create a large sheet to accommodate future updates
                 cols=combined_data.shape[1] + 5
             )
@@ -87,8 +84,8 @@ def update_sestavy_sheet():
     
     # Get worksheet dimensions through alternative method
     try:
-        # Use get_worksheet directly which returns the worksheet metadata
-        worksheet_info = spreadsheet.worksheet("Sestavy")
+        # Cached handle from the registry; its grid size is kept current by resize()
+        worksheet_info = get_worksheet(spreadsheet, SESTAVY_SHEET)
         # This will get the total row count
         worksheet_row_count = worksheet_info.row_count
         worksheet_col_count = worksheet_info.col_count
@@ -116,9 +113,9 @@ def update_sestavy_sheet():
                 sestavy_worksheet.append_row(headers)
                 print(f"Added headers: {headers}")
                 
-                # Refresh our view of the data
-                existing_data = sestavy_worksheet.get_all_values()
-                existing_rows = len(existing_data)
+                # The sheet now holds just the header row; no need to re-download it
+                existing_data = [headers]
+                existing_rows = 1
         except Exception as e:
             print(f"Error setting up sheet: {str(e)}")
             return
@@ -146,29 +143,20 @@ def update_sestavy_sheet():
                 # If neither column exists, add to the end
                 insert_col = len(existing_headers) + 1
             
-            # Insert the new header
-            cell = gspread.utils.rowcol_to_a1(1, insert_col)
-            sestavy_worksheet.update(cell, 'Owner-Sestava')
-            
-            # Shift other headers if needed
-            if insert_col <= len(existing_headers):
-                # Get values to the right
-                for col in range(len(existing_headers), insert_col - 1, -1):
-                    # Move each column one to the right
-                    from_cell = gspread.utils.rowcol_to_a1(1, col)
-                    to_cell = gspread.utils.rowcol_to_a1(1, col + 1)
-                    sestavy_worksheet.update(to_cell, existing_headers[col-1])
-            
-            # Update our local headers
-            existing_headers.insert(insert_col - 1, 'Owner-Sestava')
-            print(f"Added 'Owner-Sestava' header at column {insert_col}")
-            
-            # Refresh our data view
-            existing_data = sestavy_worksheet.get_all_values()
+            # Rewrite the header row and every shifted data column in one request;
+            # migrate_headers also returns the migrated local view, so no re-download
+            target_headers = list(existing_headers)
+            target_headers.insert(insert_col - 1, 'Owner-Sestava')
+            existing_data, requests = migrate_headers(
+                spreadsheet, sestavy_worksheet, existing_data, target_headers
+            )
+            existing_headers = existing_data[0]
+            print(f"Added 'Owner-Sestava' header at column {insert_col} ({requests} request(s))")
         
         # Verify headers match what we expect
+        missing_headers = set(combined_data.columns) - set(existing_headers)
         for header in combined_data.columns:
-            if header not in existing_headers:
+            if header in missing_headers:
                 print(f"Warning: Header '{header}' not found in the existing sheet")
     else:
         existing_headers = []
@@ -177,78 +165,31 @@ def update_sestavy_sheet():
     # Handle NaN values by converting them to empty strings
     combined_data_values = combined_data.fillna('').replace([np.nan], [''])
     
-    # Prepare for cell-by-cell updates (only updating empty cells)
-    cells_to_update = []
-    
-    # For each row in our data, we need to find or create cells in the spreadsheet
-    print("Checking for empty cells to update...")
-    update_count = 0
+    n_rows = len(combined_data_values)
     
-    # Determine the starting row for updates
-    # If header only, start at row 2 (1-indexed), otherwise use the first empty row
-    start_row = 2  # Start after header (1-indexed)
+    # Data rows start right after the header (row 2, 1-indexed); grow the sheet once if needed
+    start_row = 2
+    last_row = start_row + n_rows - 1
+    if last_row > worksheet_row_count:
+        print(f"Warning: data needs {last_row} rows, worksheet has {worksheet_row_count}. Resizing...")
+        sestavy_worksheet.resize(rows=last_row + 100)  # Add some buffer
+        worksheet_row_count = last_row + 100
+        print(f"Resized sheet to {worksheet_row_count} rows")
     
-    # Process each cell in the combined data
-    for idx, (_, row_data) in enumerate(combined_data_values.iterrows()):
-        target_row = start_row + idx
-        
-        # Check if we're trying to update beyond the worksheet's capacity
-        if target_row > worksheet_row_count:
-            print(f"Warning: Data row {idx} exceeds worksheet capacity ({worksheet_row_count} rows). Resizing...")
-            # Resize the sheet to accommodate more data
-            sestavy_worksheet.resize(rows=target_row + 100)  # Add some buffer
-            worksheet_row_count = target_row + 100
-            print(f"Resized sheet to {worksheet_row_count} rows")
-            
-        for col_name in combined_data_values.columns:
-            if col_name in existing_headers:
-                col_idx = existing_headers.index(col_name)
-                
-                # Check if cell is empty - but be careful about accessing beyond existing data
-                cell_is_empty = True
-                if idx + 1 < existing_rows:  # If we have data for this row
-                    try:
-                        existing_value = existing_data[idx + 1][col_idx]  # +1 for header row
-                        cell_is_empty = existing_value.strip() == ''
-                    except IndexError:
-                        # If this cell doesn't exist in our data view, it's empty
-                        cell_is_empty = True
-                
-                # Only update if the cell is empty
-                if cell_is_empty:
-                    value = row_data[col_name]
-                    
-                    # Convert numpy types to native Python types for JSON compatibility
-                    if isinstance(value, (np.int64, np.int32, np.float64, np.float32)):
-                        value = value.item()
-                    
-                    # Prepare cell update
-                    cell_notation = gspread.utils.rowcol_to_a1(target_row, col_idx + 1)  # +1 because columns are 1-indexed
-                    cells_to_update.append({
-                        'range': cell_notation,
-                        'values': [[value]]
-                    })
-                    update_count += 1
-        
-        # Progress reporting
-        if (idx + 1) % 10 == 0 or idx == len(combined_data_values) - 1:
-            print(f"Processed {idx + 1}/{len(combined_data_values)} rows...")
+    # Align the sheet's current values and the new data on the sheet's column layout,
+    # then derive the write set: mapped columns whose existing cell is blank
+    print("Checking for empty cells to update...")
+    existing, new, writable = align_frames(existing_data[1:], existing_headers, combined_data_values)
+    mask = blank_mask(existing) & writable
+    values = new.to_numpy()
     
-    # Execute batch updates if we have cells to update
-    if cells_to_update:
-        print(f"Updating {len(cells_to_update)} empty cells...")
+    if mask.any():
+        print(f"Updating {int(mask.sum())} empty cells...")
         try:
-            # Split updates into smaller batches to avoid API limits
-            batch_size = 10
-            for i in range(0, len(cells_to_update), batch_size):
-                current_batch = cells_to_update[i:i + batch_size]
-                sestavy_worksheet.batch_update(current_batch)
-                print(f"Batch {i // batch_size + 1}/{(len(cells_to_update) + batch_size - 1) // batch_size} completed")
-            
-            print(f"Successfully updated {len(cells_to_update)} previously empty cells")
+            cells, requests = write_masked(spreadsheet, SESTAVY_SHEET, values, mask, origin=(start_row, 1))
+            print(f"Successfully updated {cells} previously empty cells in {requests} request(s)")
         except Exception as e:
             print(f"Error during batch update: {str(e)}")
-            print(f"Error details: {str(e)}")
     else:
         print("No empty cells found that need updating")
     
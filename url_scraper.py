@@ -1,27 +1,46 @@
+import os
 import requests
 from bs4 import BeautifulSoup
 import pandas as pd
-from datetime import datetime
-from config import CHAMPIONSHIP_URL
-
-# URL of the IIHF website schedule page
-url = f'{CHAMPIONSHIP_URL}/schedule'
-
-# Use a session with browser-like headers to avoid Cloudflare 403.
-# Prime the session by hitting the main championship page first.
-session = requests.Session()
-session.headers.update({
-    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-})
-session.get(CHAMPIONSHIP_URL)
-
-# Send a GET request to the schedule URL
-response = session.get(url)
-
-# Check if the request was successful
-if response.status_code == 200:
-    # Parse the HTML content of the page
-    soup = BeautifulSoup(response.content, 'html.parser')
+from datetime import datetime, timedelta
+from config import CHAMPIONSHIP_URL, MATCH_URLS_CSV
+from match_fingerprints import game_id_from_url
+from page_archive import archive_page, event_key, SCHEDULE
+
+SCHEDULE_COLUMNS = ['Day', 'game_id', 'date', 'time', 'home_team', 'away_team', 'phase',
+                    'url_playbyplay', 'url_statistics']
+# Columns compared when deciding whether a known game changed
+DIFF_COLUMNS = [c for c in SCHEDULE_COLUMNS if c != 'game_id']
+
+
+def make_session(championship_url=CHAMPIONSHIP_URL):
+    """
+    Use a session with browser-like headers to avoid Cloudflare 403.
+    Prime the session by hitting the main championship page first.
+    """
+    session = requests.Session()
+    session.headers.update({
+        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+    })
+    session.get(championship_url)
+    return session
+
+
+def fetch_schedule_html(championship_url=CHAMPIONSHIP_URL):
+    """Download the schedule page; returns the raw HTML or None on failure."""
+    session = make_session(championship_url)
+    url = f'{championship_url}/schedule'
+    response = session.get(url)
+    if response.status_code != 200:
+        print(f"Failed to retrieve the webpage. Status code: {response.status_code}")
+        return None
+    archive_page(event_key(championship_url), SCHEDULE, response.content, url=url)
+    return response.content
+
+
+def parse_schedule(html):
+    """Parse the schedule page into one row per game (see SCHEDULE_COLUMNS)."""
+    soup = BeautifulSoup(html, 'html.parser')
     # Find all match cards
     match_cards = soup.find_all('div', class_='b-card-schedule')
 
@@ -62,10 +81,14 @@ if response.status_code == 200:
             'url_playbyplay': f"https://www.iihf.com{gamecenter_link}"
         })
 
+    if not matches:
+        return pd.DataFrame(columns=SCHEDULE_COLUMNS)
+
     # Create DataFrame
     df = pd.DataFrame(matches)
     df['url_playbyplay'] = df['url_playbyplay'].apply(lambda x: x[:x.rfind('/') + 1])
     df['url_statistics'] = df['url_playbyplay'].str.replace('gamecenter/playbyplay', 'gamecenter/statistics')
+    df['game_id'] = df['url_playbyplay'].apply(game_id_from_url)
 
     # Convert date strings to datetime objects for calculating championship days.
     # For cross-year tournaments (e.g. Dec–Jan) assign the correct year per month:
@@ -81,31 +104,106 @@ if response.status_code == 200:
     df.drop('_year', axis=1, inplace=True)
 
     # Sort by date to ensure proper day calculation
-    df = df.sort_values('datetime')
-
-    # Get the first day of the championship
-    first_day = df['datetime'].min()
+    df = df.sort_values(['datetime', 'time'], kind='stable')
 
     # Calculate the Day number (1-indexed) based on unique dates
-    # Group by date and create a mapping of date to day number
     unique_dates = df['datetime'].dt.date.unique()
     date_to_day = {date: idx + 1 for idx, date in enumerate(sorted(unique_dates))}
-
-    # Map each date to its corresponding day number
     df['Day'] = df['datetime'].dt.date.map(date_to_day)
 
     # Drop the temporary datetime column
     df.drop('datetime', axis=1, inplace=True)
 
-    # Reorder columns to make Day column the first one
-    columns = ['Day'] + [col for col in df.columns if col != 'Day']
-    df = df[columns]
+    return df[SCHEDULE_COLUMNS].reset_index(drop=True)
+
+
+def load_schedule(csv_path=MATCH_URLS_CSV):
+    """Load the stored schedule, adding game_id for CSVs written before it existed."""
+    if not os.path.exists(csv_path):
+        return pd.DataFrame(columns=SCHEDULE_COLUMNS)
+    df = pd.read_csv(csv_path, dtype={'game_id': str})
+    if 'game_id' not in df.columns:
+        df['game_id'] = df['url_playbyplay'].apply(game_id_from_url)
+    return df
+
+
+def select_recent_matches(match_urls_df, hours, date_str=None, now=None):
+    """
+    Matches of the given day (default: today, "10 May" format) that started within
+    the last `hours` hours. Raises ValueError if the CSV dates/times can't be parsed.
+    """
+    now = now or datetime.now()
+    date_str = date_str or now.strftime("%d %b").lstrip("0")  # Format like "10 May" (without leading 0)
+    todays_matches = match_urls_df[match_urls_df['date'] == date_str].copy()
+    if todays_matches.empty:
+        return todays_matches
+
+    # Convert match times to datetime objects for comparison
+    todays_matches['datetime'] = todays_matches.apply(
+        lambda row: datetime.strptime(f"{row['date']} {now.year} {row['time']}", "%d %b %Y %H:%M"),
+        axis=1
+    )
+    started_after = now - timedelta(hours=hours)
+    return todays_matches[(todays_matches['datetime'] > started_after) & (todays_matches['datetime'] <= now)]
+
+
+def _by_game_id(df, label):
+    """Rows usable as a game_id index: no missing ids, and the last row for a repeated one."""
+    usable = df[df['game_id'].notna() & (df['game_id'].astype(str).str.strip() != '')]
+    usable = usable.drop_duplicates('game_id', keep='last')
+    if len(usable) < len(df):
+        print(f"Ignoring {len(df) - len(usable)} {label} schedule rows with a missing or repeated game id")
+    return usable
+
+
+def diff_schedule(stored_df, new_df):
+    """
+    Compare two schedules by game id.
+
+    Returns (added, changed, removed) DataFrames; `changed` holds the new rows of
+    games whose Day, time, teams, phase or URLs differ from the stored ones.
+    Rows without a game id are left out of the diff, and only the last row of a
+    repeated game id is compared.
+    """
+    stored = _by_game_id(stored_df, 'stored').set_index('game_id')
+    new = _by_game_id(new_df, 'new').set_index('game_id')
+
+    added = new.loc[~new.index.isin(stored.index)]
+    removed = stored.loc[~stored.index.isin(new.index)]
+
+    common = new.index.intersection(stored.index)
+    new_common = new.loc[common, DIFF_COLUMNS].astype(str)
+    stored_common = stored.loc[common, DIFF_COLUMNS].astype(str)
+    changed_mask = (new_common != stored_common).any(axis=1)
+    changed = new.loc[common[changed_mask.to_numpy()]]
+
+    return added.reset_index(), changed.reset_index(), removed.reset_index()
+
+
+def sync_schedule(csv_path=MATCH_URLS_CSV, championship_url=CHAMPIONSHIP_URL):
+    """
+    Fetch the schedule and update csv_path only if some game was added, changed or removed.
+
+    Returns the (added, changed, removed) diff, or None if the page could not be fetched.
+    """
+    html = fetch_schedule_html(championship_url)
+    if html is None:
+        return None
+
+    new_df = parse_schedule(html)
+    added, changed, removed = diff_schedule(load_schedule(csv_path), new_df)
+
+    if added.empty and changed.empty and removed.empty:
+        print(f"Schedule unchanged ({len(new_df)} games), {csv_path} left as is")
+    else:
+        new_df.to_csv(csv_path, index=False)
+        print(f"Schedule synced to {csv_path}: {len(added)} added, {len(changed)} changed, {len(removed)} removed")
+        for label, rows in (('+', added), ('~', changed), ('-', removed)):
+            for _, row in rows.iterrows():
+                print(f"  {label} Day {row['Day']} {row['date']} {row['time']} {row['home_team']}-{row['away_team']} ({row['game_id']})")
 
-    # Save to CSV
-    df.to_csv('match_urls.csv', index = False)
+    return added, changed, removed
 
-    print(f"Added Day column to the dataset with {len(unique_dates)} total championship days")
-    print(f"Added home_team and away_team columns with 3-letter team acronyms from data attributes")
 
-else:
-    print(f"Failed to retrieve the webpage. Status code: {response.status_code}")
+if __name__ == '__main__':
+    sync_schedule()
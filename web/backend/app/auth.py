@@ -1,21 +1,83 @@
+import asyncio
+import hashlib
 import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Annotated
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import event
 from sqlalchemy.orm import Session
-from .database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from . import metrics
+from .database import get_db, get_async_db
 from .models import User
 
 SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_DAYS = 30
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Authenticated requests resolve the user from these caches instead of the DB.
+# A user record is reused for at most USER_CACHE_TTL seconds and dropped at once
+# when the User row is updated or deleted through the ORM in this process; other
+# workers see such changes within the TTL. Decoded tokens are kept until they
+# expire, so an expired token is rejected exactly as before.
+USER_CACHE_TTL = float(os.getenv("AUTH_USER_CACHE_TTL", "30"))
+TOKEN_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "10000"))
+
+# bcrypt cost; stored hashes with other rounds are re-hashed on the next login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# Hashing runs on its own small pool so a login burst uses at most HASH_WORKERS
+# cores; beyond HASH_QUEUE_LIMIT waiting requests, login/signup answer 503
+HASH_WORKERS = int(os.getenv("AUTH_HASH_WORKERS", "2"))
+HASH_QUEUE_LIMIT = int(os.getenv("AUTH_HASH_QUEUE_LIMIT", "64"))
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+HASH_QUEUE_DEPTH = metrics.Gauge("auth_hash_queue_depth", "Password hashes waiting for a hashing thread")
+HASH_IN_FLIGHT = metrics.Gauge("auth_hash_in_flight", "Password hashes being computed")
+HASH_REJECTED = metrics.Counter("auth_hash_rejected_total", "Logins/signups refused because the hash queue was full")
+HASH_SECONDS = metrics.Histogram("auth_hash_seconds", "Time from queueing a password hash to its result")
+
+_hash_executor = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="password-hash")
+_hash_lock = threading.Lock()
+_hash_pending = 0
+
+
+def _set_hash_gauges():
+    HASH_IN_FLIGHT.set(min(_hash_pending, HASH_WORKERS))
+    HASH_QUEUE_DEPTH.set(max(0, _hash_pending - HASH_WORKERS))
+
+
+async def _run_hashing(fn, *args):
+    """Run fn on the hashing pool, or raise 503 if too many hashes are already queued."""
+    global _hash_pending
+    with _hash_lock:
+        if _hash_pending >= HASH_WORKERS + HASH_QUEUE_LIMIT:
+            HASH_REJECTED.inc()
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many sign-ins at once, please retry in a moment",
+                headers={"Retry-After": "2"},
+            )
+        _hash_pending += 1
+        _set_hash_gauges()
+    started = time.perf_counter()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_hash_executor, fn, *args)
+    finally:
+        HASH_SECONDS.observe(time.perf_counter() - started)
+        with _hash_lock:
+            _hash_pending -= 1
+            _set_hash_gauges()
+
 
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
@@ -25,29 +87,130 @@ def verify_password(plain: str, hashed: str) -> bool:
     return pwd_context.verify(plain, hashed)
 
 
+async def hash_password_async(password: str) -> str:
+    return await _run_hashing(pwd_context.hash, password)
+
+
+async def verify_and_update_password(plain: str, hashed: str) -> tuple[bool, str | None]:
+    """(matches, new hash) where new hash is set when hashed uses outdated parameters."""
+    return await _run_hashing(pwd_context.verify_and_update, plain, hashed)
+
+
 def create_access_token(user_id: str) -> str:
     expire = datetime.now(timezone.utc) + timedelta(days=ACCESS_TOKEN_EXPIRE_DAYS)
     return jwt.encode({"sub": user_id, "exp": expire}, SECRET_KEY, algorithm=ALGORITHM)
 
 
-def get_current_user(
-    token: Annotated[str, Depends(oauth2_scheme)],
-    db: Annotated[Session, Depends(get_db)],
-) -> User:
-    credentials_exc = HTTPException(
+@dataclass(frozen=True)
+class AuthUser:
+    """The fields of User that authenticated endpoints read, detached from any session."""
+    id: str
+    username: str
+    email: str
+    created_at: datetime | None
+
+    @classmethod
+    def from_user(cls, user: User) -> "AuthUser":
+        return cls(id=user.id, username=user.username, email=user.email, created_at=user.created_at)
+
+
+_cache_lock = threading.Lock()
+_user_cache: dict[str, tuple[float, AuthUser]] = {}  # user id -> (cached at, record)
+_token_cache: OrderedDict[str, tuple[str, float]] = OrderedDict()  # token hash -> (user id, exp)
+
+
+def _cached_user(user_id: str) -> AuthUser | None:
+    with _cache_lock:
+        entry = _user_cache.get(user_id)
+    if entry and time.monotonic() - entry[0] < USER_CACHE_TTL:
+        return entry[1]
+    return None
+
+
+def _remember_user(user: User) -> AuthUser:
+    record = AuthUser.from_user(user)
+    with _cache_lock:
+        _user_cache[record.id] = (time.monotonic(), record)
+    return record
+
+
+def invalidate_user(user_id: str):
+    with _cache_lock:
+        _user_cache.pop(user_id, None)
+
+
+def clear_auth_caches():
+    with _cache_lock:
+        _user_cache.clear()
+        _token_cache.clear()
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _user_changed(mapper, connection, target: User):
+    invalidate_user(target.id)
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Invalid or expired credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def _user_id_from_token(token: str) -> str:
+    key = hashlib.sha256(token.encode()).hexdigest()
+    with _cache_lock:
+        entry = _token_cache.get(key)
+        if entry:
+            _token_cache.move_to_end(key)
+    if entry:
+        user_id, exp = entry
+        if exp > time.time():
+            return user_id
+        with _cache_lock:
+            _token_cache.pop(key, None)
+        raise _credentials_exception()
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise credentials_exc
     except JWTError:
-        raise credentials_exc
+        raise _credentials_exception()
+    user_id: str = payload.get("sub")
+    if user_id is None:
+        raise _credentials_exception()
+    if "exp" in payload:
+        with _cache_lock:
+            _token_cache[key] = (user_id, float(payload["exp"]))
+            if len(_token_cache) > TOKEN_CACHE_SIZE:
+                _token_cache.popitem(last=False)
+    return user_id
+
 
+def get_current_user(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    db: Annotated[Session, Depends(get_db)],
+) -> AuthUser:
+    user_id = _user_id_from_token(token)
+    cached = _cached_user(user_id)
+    if cached:
+        return cached
     user = db.query(User).filter(User.id == user_id).first()
     if user is None:
-        raise credentials_exc
-    return user
+        raise _credentials_exception()
+    return _remember_user(user)
+
+
+async def get_current_user_async(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+) -> AuthUser:
+    user_id = _user_id_from_token(token)
+    cached = _cached_user(user_id)
+    if cached:
+        return cached
+    user = await db.get(User, user_id)
+    if user is None:
+        raise _credentials_exception()
+    return _remember_user(user)
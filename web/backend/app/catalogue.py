@@ -0,0 +1,252 @@
+"""
+Pre-serialized player catalogue behind GET /players.
+
+The roster only changes when players are imported, so each catalogue version is
+built once per process: every player is encoded up front in both lock states,
+and per-team / per-position bitmasks (bit i = i-th player in team, name order) make
+filtering and the lock overlay integer operations. A rendered body is cached per
+(filter, lock mask) together with its gzip form and ETag, so a repeat request
+costs two small queries: the catalogue version and the day's started matches.
+
+The catalogue also carries the search index behind GET /players/search: every
+prefix of every accent-folded word of a player's name, team and position maps to
+a bitmask, and trigrams of the whole folded text narrow substring matches, so a
+typeahead query is a few dict lookups and ANDs.
+
+Whatever writes players must call bump_version(db) so every worker rebuilds.
+"""
+import gzip
+import hashlib
+import threading
+import unicodedata
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from sqlalchemy import update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from .models import CatalogueVersion, Match, Player
+from .responses import dumps
+
+PLAYERS = "players"
+# Dialects with INSERT ... ON CONFLICT; others fall back to UPDATE-then-INSERT
+_UPSERT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+RENDER_CACHE_SIZE = 64  # (filter, lock mask) combinations kept per process
+
+# Column order of the row tuples player_dict() turns into PlayerOut-shaped dicts
+PLAYER_COLUMNS = (Player.id, Player.name, Player.position, Player.team_abbr, Player.championship_year)
+
+
+def player_dict(row, is_locked: bool = False) -> dict:
+    return {
+        "id": row[0],
+        "name": row[1],
+        "position": row[2],
+        "team_abbr": row[3],
+        "championship_year": row[4],
+        "is_locked": is_locked,
+    }
+
+
+# Letters NFKD does not decompose into ASCII
+_FOLD_TABLE = str.maketrans({"ø": "o", "đ": "d", "ł": "l", "ß": "ss", "æ": "ae", "œ": "oe", "ı": "i", "þ": "th"})
+
+
+def fold(text: str) -> str:
+    """Lower-case ASCII form used for search: "Šťastný" and "stastny" fold alike."""
+    text = unicodedata.normalize("NFKD", str(text).casefold().translate(_FOLD_TABLE))
+    text = text.encode("ascii", "ignore").decode()
+    return " ".join("".join(c if c.isalnum() else " " for c in text).split())
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _set_bits(mask: int):
+    """Indexes of the set bits of mask, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def current_version(db: Session, name: str = PLAYERS) -> int:
+    return db.query(CatalogueVersion.version).filter(CatalogueVersion.name == name).scalar() or 0
+
+
+def bump_version(db: Session, name: str = PLAYERS):
+    """
+    Invalidate the cached catalogue in every worker; commits with the caller's transaction.
+
+    A single INSERT ... ON CONFLICT DO UPDATE, so two processes bumping a version
+    whose row doesn't exist yet can't both insert it.
+    """
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    dialect = db.get_bind().dialect.name
+    if dialect in _UPSERT_INSERTS:
+        stmt = _UPSERT_INSERTS[dialect](CatalogueVersion).values(name=name, version=1, updated_at=now)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[CatalogueVersion.name],
+            set_={"version": CatalogueVersion.version + 1, "updated_at": now},
+        ))
+        return
+    bumped = db.execute(
+        update(CatalogueVersion)
+        .where(CatalogueVersion.name == name)
+        .values(version=CatalogueVersion.version + 1, updated_at=now)
+    ).rowcount
+    if not bumped:
+        db.add(CatalogueVersion(name=name, version=1, updated_at=now))
+        db.flush()
+
+
+class RenderedBody:
+    def __init__(self, body: bytes, etag: str):
+        self.body = body
+        self.etag = etag
+        self._gzipped = None
+
+    @property
+    def gzipped(self) -> bytes:
+        if self._gzipped is None:
+            self._gzipped = gzip.compress(self.body, compresslevel=6)
+        return self._gzipped
+
+
+class PlayerCatalogue:
+    def __init__(self, version: int, rows: list[tuple]):
+        self.version = version
+        # Per player: (unlocked JSON, locked JSON)
+        self.fragments = [(dumps(player_dict(row, False)), dumps(player_dict(row, True))) for row in rows]
+        self.all_mask = (1 << len(rows)) - 1
+        self.team_masks: dict[str, int] = {}
+        self.position_masks: dict[str, int] = {}
+        # Search index: folded "name team position" per player, word prefixes and trigrams -> bitmask
+        self.search_texts: list[str] = []
+        self.prefix_masks: dict[str, int] = {}
+        self.trigram_masks: dict[str, int] = {}
+        for i, row in enumerate(rows):
+            bit = 1 << i
+            self.position_masks[row[2]] = self.position_masks.get(row[2], 0) | bit
+            self.team_masks[row[3]] = self.team_masks.get(row[3], 0) | bit
+            text = fold(f"{row[1]} {row[3]} {row[2]}")
+            self.search_texts.append(text)
+            for word in set(text.split()):
+                for end in range(1, len(word) + 1):
+                    self.prefix_masks[word[:end]] = self.prefix_masks.get(word[:end], 0) | bit
+            for gram in _trigrams(text):
+                self.trigram_masks[gram] = self.trigram_masks.get(gram, 0) | bit
+        self._rendered: OrderedDict[tuple[int, int], RenderedBody] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def select_mask(self, position: str | None, team: str | None) -> int:
+        mask = self.all_mask
+        if position:
+            mask &= self.position_masks.get(position, 0)
+        if team:
+            mask &= self.team_masks.get(team, 0)
+        return mask
+
+    def lock_mask(self, locked_teams: set[str]) -> int:
+        mask = 0
+        for team in locked_teams:
+            mask |= self.team_masks.get(team, 0)
+        return mask
+
+    def _substring_mask(self, term: str, candidates: int) -> int:
+        for gram in _trigrams(term):
+            candidates &= self.trigram_masks.get(gram, 0)
+            if not candidates:
+                return 0
+        mask = 0
+        for i in _set_bits(candidates):
+            if term in self.search_texts[i]:
+                mask |= 1 << i
+        return mask
+
+    def search(self, query: str, selected: int, limit: int) -> list[int]:
+        """
+        Indexes of up to `limit` selected players matching every word of query.
+
+        A word matches the start of a name, team or position word, or (3+ letters)
+        anywhere in the folded text. Players matched by prefixes alone come first;
+        within each group the catalogue order (team, name) is kept.
+        """
+        prefix_hits = substring_hits = selected
+        for term in fold(query).split():
+            prefix = self.prefix_masks.get(term, 0)
+            anywhere = prefix
+            if len(term) >= 3:
+                anywhere |= self._substring_mask(term, substring_hits & ~prefix)
+            prefix_hits &= prefix
+            substring_hits &= anywhere
+            if not substring_hits:
+                return []
+
+        found = []
+        for mask in (prefix_hits, substring_hits & ~prefix_hits):
+            for i in _set_bits(mask):
+                if len(found) == limit:
+                    return found
+                found.append(i)
+        return found
+
+    def render_rows(self, indexes: list[int], locked: int) -> bytes:
+        return b"[" + b",".join(self.fragments[i][(locked >> i) & 1] for i in indexes) + b"]"
+
+    def render(self, selected: int, locked: int) -> RenderedBody:
+        locked &= selected  # locks outside the selection don't change the body
+        key = (selected, locked)
+        with self._lock:
+            rendered = self._rendered.get(key)
+            if rendered:
+                self._rendered.move_to_end(key)
+                return rendered
+
+        parts = [
+            fragments[(locked >> i) & 1]
+            for i, fragments in enumerate(self.fragments)
+            if (selected >> i) & 1
+        ]
+        body = b"[" + b",".join(parts) + b"]"
+        digest = hashlib.blake2b(body, digest_size=8).hexdigest()
+        rendered = RenderedBody(body, f'"p{self.version}-{digest}"')
+        with self._lock:
+            self._rendered[key] = rendered
+            if len(self._rendered) > RENDER_CACHE_SIZE:
+                self._rendered.popitem(last=False)
+        return rendered
+
+
+_catalogue: PlayerCatalogue | None = None
+_build_lock = threading.Lock()
+
+
+def get_catalogue(db: Session) -> PlayerCatalogue:
+    global _catalogue
+    version = current_version(db)
+    catalogue = _catalogue
+    if catalogue is not None and catalogue.version == version:
+        return catalogue
+    with _build_lock:
+        if _catalogue is None or _catalogue.version != version:
+            rows = db.query(*PLAYER_COLUMNS).order_by(Player.team_abbr, Player.name).all()
+            _catalogue = PlayerCatalogue(version, rows)
+        return _catalogue
+
+
+def clear_cache():
+    global _catalogue
+    _catalogue = None
+
+
+def locked_teams_for_day(db: Session, day: int) -> set[str]:
+    """Teams whose match on `day` has already started (match_time <= now)."""
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    locked: set[str] = set()
+    for home, away in db.query(Match.home_team, Match.away_team).filter(Match.day == day, Match.match_time <= now):
+        locked.add(home)
+        locked.add(away)
+    return locked
@@ -1,6 +1,11 @@
 import os
-from sqlalchemy import create_engine
+import ssl
+import time
+from urllib.parse import parse_qsl, urlencode
+from sqlalchemy import create_engine, event, exc
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+from . import metrics
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./fantasy_hockey.db")
 # SQLAlchemy 2.0 requires explicit driver; remap legacy postgres:// URLs
@@ -10,10 +15,222 @@ if DATABASE_URL.startswith("postgres://"):
 # SQLite needs check_same_thread=False; ignored for Postgres
 connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
 
-engine = create_engine(DATABASE_URL, connect_args=connect_args)
+# Pool sizing per worker process; size it from the db_pool_* series on /metrics.
+# Connections are recycled before Postgres/Render idle timeouts close them, and
+# pre-ping replaces ones that died while idle instead of failing the request.
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+POOL_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "1") == "1"
+
+POOL_WAIT = metrics.Histogram("db_pool_wait_seconds", "Time spent waiting for a pooled connection")
+POOL_TIMEOUTS = metrics.Counter("db_pool_timeouts_total", "Checkouts that gave up after DB_POOL_TIMEOUT")
+POOL_CONNECTS = metrics.Counter("db_pool_connects_total", "Database connections opened")
+POOL_INVALIDATIONS = metrics.Counter("db_pool_invalidations_total", "Connections discarded as broken")
+POOL_CHECKED_OUT = metrics.Gauge("db_pool_checked_out", "Connections currently checked out")
+POOL_CHECKED_IN = metrics.Gauge("db_pool_checked_in", "Idle connections in the pool")
+POOL_OVERFLOW = metrics.Gauge("db_pool_overflow", "Connections open beyond the pool size")
+
+
+class _TimedPool:
+    """Pool mixin recording how long each checkout waited and whether it timed out."""
+    metrics_label = "sync"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            POOL_TIMEOUTS.inc(engine=self.metrics_label)
+            raise
+        finally:
+            POOL_WAIT.observe(time.perf_counter() - started, engine=self.metrics_label)
+
+
+class TimedQueuePool(_TimedPool, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(_TimedPool, AsyncAdaptedQueuePool):
+    metrics_label = "async"
+
+
+def _pool_kwargs(url: str, poolclass) -> dict:
+    if url.startswith("sqlite") and (":memory:" in url or url.split("://", 1)[1] in ("", "/")):
+        return {}  # in-memory SQLite keeps SQLAlchemy's single-connection pool
+    return {
+        "poolclass": poolclass,
+        "pool_size": POOL_SIZE,
+        "max_overflow": POOL_MAX_OVERFLOW,
+        "pool_timeout": POOL_TIMEOUT,
+        "pool_recycle": POOL_RECYCLE,
+        "pool_pre_ping": POOL_PRE_PING,
+    }
+
+
+# SQLite profile for file databases, applied on every new connection. WAL lets
+# readers (standings) run while a writer (score calculation, lineup save) commits,
+# and busy_timeout makes concurrent writers queue instead of failing with
+# "database is locked". SQLITE_PRAGMAS=0 keeps SQLite's defaults.
+SQLITE_PRAGMAS = os.getenv("SQLITE_PRAGMAS", "1") == "1"
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+
+
+def sqlite_pragmas() -> list[str]:
+    return [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",  # durable across app crashes; WAL fsyncs at checkpoints
+        f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}",
+        f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}",  # negative: KiB instead of pages
+        f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}",
+    ]
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for pragma in sqlite_pragmas():
+        cursor.execute(pragma)
+    cursor.close()
+
+
+def apply_sqlite_profile(sync_engine):
+    """Run the SQLite pragmas on every connection sync_engine opens from now on."""
+    event.listen(sync_engine, "connect", _set_sqlite_pragmas)
+
+
+# metrics label -> engine whose pool is reported by pool_stats()
+_instrumented = {}
+
+
+def _instrument(sync_engine, label: str):
+    event.listen(sync_engine, "connect", lambda *_: POOL_CONNECTS.inc(engine=label))
+    event.listen(sync_engine, "invalidate", lambda *_: POOL_INVALIDATIONS.inc(engine=label))
+    _instrumented[label] = sync_engine
+
+
+def pool_stats() -> dict:
+    """Snapshot of every instrumented pool: occupancy, wait time and failures."""
+    stats = {}
+    for label, eng in _instrumented.items():
+        pool = eng.pool
+        if not isinstance(pool, QueuePool):
+            continue
+        wait = POOL_WAIT.snapshot(engine=label)
+        stats[label] = {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(0, pool.overflow()),
+            "max_overflow": POOL_MAX_OVERFLOW,
+            "waits": wait["count"],
+            "wait_seconds_total": wait["sum"],
+            "timeouts": POOL_TIMEOUTS.get(engine=label),
+            "connects": POOL_CONNECTS.get(engine=label),
+            "invalidations": POOL_INVALIDATIONS.get(engine=label),
+        }
+    return stats
+
+
+def _collect_pool_gauges():
+    for label, snap in pool_stats().items():
+        POOL_CHECKED_OUT.set(snap["checked_out"], engine=label)
+        POOL_CHECKED_IN.set(snap["checked_in"], engine=label)
+        POOL_OVERFLOW.set(snap["overflow"], engine=label)
+
+
+metrics.register_collector(_collect_pool_gauges)
+
+engine = create_engine(DATABASE_URL, connect_args=connect_args, **_pool_kwargs(DATABASE_URL, TimedQueuePool))
+_instrument(engine, "sync")
+if SQLITE_PRAGMAS and DATABASE_URL.startswith("sqlite"):
+    apply_sqlite_profile(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+# DB_ASYNC=1 serves the hot endpoints (standings, players, lineup, matches) from an
+# async engine, so they wait on the database without holding a threadpool thread.
+# The async handlers call the sync ones through AsyncSession.run_sync, so both
+# modes share one implementation and the same models.
+# It is off by default: with it on, every worker keeps both pools open, so size
+# workers * 2 * (DB_POOL_SIZE + DB_MAX_OVERFLOW) below the server's max_connections.
+USE_ASYNC_DB = os.getenv("DB_ASYNC", "0") == "1"
+
+# libpq query parameters asyncpg rejects; _async_connect_args translates the ones it can
+_LIBPQ_ONLY_PARAMS = {
+    "sslmode", "sslrootcert", "sslcert", "sslkey", "sslcrl", "channel_binding",
+    "application_name", "connect_timeout",
+}
+
+
+def _async_url(url: str) -> str:
+    """Same database, async driver: aiosqlite for SQLite, asyncpg for Postgres."""
+    scheme, rest = url.split("://", 1)
+    if scheme.startswith("sqlite"):
+        return f"sqlite+aiosqlite://{rest}"
+    if scheme.startswith("postgresql"):
+        base, _, query = rest.partition("?")
+        kept = [(k, v) for k, v in parse_qsl(query, keep_blank_values=True) if k not in _LIBPQ_ONLY_PARAMS]
+        return f"postgresql+asyncpg://{base}" + (f"?{urlencode(kept)}" if kept else "")
+    return url
+
+
+def _async_connect_args(url: str) -> dict:
+    """asyncpg connect() arguments for the libpq query parameters _async_url strips."""
+    if not url.split("://", 1)[0].startswith("postgresql"):
+        return {}
+    params = dict(parse_qsl(url.partition("?")[2]))
+    args = {}
+    if "application_name" in params:
+        args["server_settings"] = {"application_name": params["application_name"]}
+    if "connect_timeout" in params:
+        args["timeout"] = float(params["connect_timeout"])
+    if "sslmode" in params:
+        args["ssl"] = _asyncpg_ssl(params)
+    return args
+
+
+def _asyncpg_ssl(params: dict):
+    mode = params["sslmode"]
+    if mode == "disable":
+        return False
+    if not {"sslrootcert", "sslcert"} & params.keys():
+        return mode  # asyncpg takes the libpq mode names as they are
+    context = ssl.create_default_context(cafile=params.get("sslrootcert"))
+    context.check_hostname = mode == "verify-full"
+    if mode not in ("verify-ca", "verify-full"):
+        context.verify_mode = ssl.CERT_NONE
+    if "sslcert" in params:
+        context.load_cert_chain(params["sslcert"], params.get("sslkey"))
+    return context
+
+
+_RAW_ASYNC_URL = os.getenv("ASYNC_DATABASE_URL") or DATABASE_URL
+ASYNC_DATABASE_URL = _async_url(_RAW_ASYNC_URL)
+ASYNC_CONNECT_ARGS = _async_connect_args(_RAW_ASYNC_URL)
+
+_async_sessionmaker = None
+
+
+def get_async_sessionmaker():
+    """Created on first use so aiosqlite/asyncpg are only needed with DB_ASYNC on."""
+    global _async_sessionmaker
+    if _async_sessionmaker is None:
+        from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+        async_engine = create_async_engine(
+            ASYNC_DATABASE_URL,
+            connect_args=ASYNC_CONNECT_ARGS,
+            **_pool_kwargs(ASYNC_DATABASE_URL, TimedAsyncQueuePool),
+        )
+        _instrument(async_engine.sync_engine, "async")
+        if SQLITE_PRAGMAS and ASYNC_DATABASE_URL.startswith("sqlite"):
+            apply_sqlite_profile(async_engine.sync_engine)
+        _async_sessionmaker = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    return _async_sessionmaker
+
+
 class Base(DeclarativeBase):
     pass
 
@@ -24,3 +241,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with get_async_sessionmaker()() as db:
+        yield db
@@ -0,0 +1,174 @@
+import socket
+import os
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import update, func, or_, and_
+from sqlalchemy.orm import Session
+from .models import IngestJob, Match
+
+MAX_ATTEMPTS = 8
+BACKOFF_BASE = timedelta(minutes=2)
+BACKOFF_CAP = timedelta(hours=6)
+# A running job older than this is assumed orphaned (worker crashed) and can be reclaimed
+LEASE_TIMEOUT = timedelta(minutes=20)
+# A started match is re-checked after this delay until its stats are final
+RECHECK_INTERVAL = timedelta(minutes=30)
+# An unchanged page only counts as final once the match must be over: before this,
+# unchanged stats are an intermission, a delay or a page that is not published yet
+MIN_GAME_LENGTH = timedelta(hours=3)
+# A match whose stats page is still empty this long after face-off is given up on
+STATS_DEADLINE = timedelta(hours=24)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def backoff_delay(attempts: int) -> timedelta:
+    """Exponential backoff: 2 min, 4 min, 8 min … capped at BACKOFF_CAP."""
+    exponent = min(max(attempts - 1, 0), 20)
+    return min(BACKOFF_CAP, BACKOFF_BASE * (2 ** exponent))
+
+
+def enqueue_started_matches(db: Session, now: datetime | None = None) -> int:
+    """Create a pending job for every match that has started and has no job yet."""
+    now = now or _utcnow()
+    match_ids = [
+        mid for (mid,) in (
+            db.query(Match.id)
+            .outerjoin(IngestJob, IngestJob.match_id == Match.id)
+            .filter(
+                IngestJob.id.is_(None),
+                Match.match_time <= now,
+                Match.url_statistics.isnot(None),
+            )
+            .all()
+        )
+    ]
+    for mid in match_ids:
+        db.add(IngestJob(match_id=mid, state="pending", attempts=0, next_run_at=now))
+    db.commit()
+    return len(match_ids)
+
+
+def claim_next_job(db: Session, worker_id: str, now: datetime | None = None) -> IngestJob | None:
+    """
+    Atomically claim the oldest due job.
+
+    A job is due when it is pending and its next_run_at has passed, or when it is
+    running but its lease has expired (the worker died). The claim is a conditional
+    UPDATE, so two workers racing for the same row cannot both win it.
+    """
+    now = now or _utcnow()
+    due = or_(
+        and_(IngestJob.state == "pending", IngestJob.next_run_at <= now),
+        and_(IngestJob.state == "running", IngestJob.locked_at <= now - LEASE_TIMEOUT),
+    )
+    candidates = [
+        jid for (jid,) in (
+            db.query(IngestJob.id).filter(due).order_by(IngestJob.next_run_at).limit(5).all()
+        )
+    ]
+    for job_id in candidates:
+        result = db.execute(
+            update(IngestJob)
+            .where(IngestJob.id == job_id, due)
+            .values(state="running", locked_by=worker_id, locked_at=now)
+        )
+        db.commit()
+        if result.rowcount == 1:
+            return db.get(IngestJob, job_id, populate_existing=True)
+    return None
+
+
+def is_final(job: IngestJob, has_stats: bool, now: datetime) -> bool:
+    """Whether an unchanged stats page can be taken as the match's final stats."""
+    started = job.match.match_time
+    if not has_stats:
+        return now >= started + STATS_DEADLINE
+    return now >= started + MIN_GAME_LENGTH
+
+
+def complete_job(
+    db: Session,
+    job: IngestJob,
+    content_hash: str,
+    now: datetime | None = None,
+    has_stats: bool = True,
+) -> bool:
+    """
+    Record a successful run.
+
+    Returns True if the content changed since the previous run (the caller wrote it).
+    The job is re-checked after RECHECK_INTERVAL until its hash is unchanged and the
+    match is over (see is_final); then it is done.
+    """
+    now = now or _utcnow()
+    changed = job.content_hash != content_hash
+    job.attempts = 0
+    job.last_error = None
+    job.locked_by = None
+    job.locked_at = None
+    job.content_hash = content_hash
+    if changed or not is_final(job, has_stats, now):
+        job.state = "pending"
+        job.next_run_at = now + RECHECK_INTERVAL
+    else:
+        job.state = "done"
+        job.finished_at = now
+    db.commit()
+    return changed
+
+
+def fail_job(db: Session, job: IngestJob, error: str, now: datetime | None = None) -> None:
+    """Record a failed run and schedule a retry with exponential backoff."""
+    now = now or _utcnow()
+    job.attempts += 1
+    job.last_error = error[:1000]
+    job.locked_by = None
+    job.locked_at = None
+    if job.attempts >= MAX_ATTEMPTS:
+        job.state = "failed"
+        job.finished_at = now
+    else:
+        job.state = "pending"
+        job.next_run_at = now + backoff_delay(job.attempts)
+    db.commit()
+
+
+def retry_failed_jobs(db: Session, now: datetime | None = None) -> int:
+    """Put every dead job back in the queue with a fresh attempt budget."""
+    now = now or _utcnow()
+    result = db.execute(
+        update(IngestJob)
+        .where(IngestJob.state == "failed")
+        .values(state="pending", attempts=0, next_run_at=now, finished_at=None)
+    )
+    db.commit()
+    return result.rowcount
+
+
+def queue_stats(db: Session, now: datetime | None = None) -> dict:
+    """Snapshot of queue health: jobs per state, backlog lag and last-hour throughput."""
+    now = now or _utcnow()
+    by_state = dict(
+        db.query(IngestJob.state, func.count(IngestJob.id)).group_by(IngestJob.state).all()
+    )
+    oldest_due = (
+        db.query(func.min(IngestJob.next_run_at))
+        .filter(IngestJob.state == "pending", IngestJob.next_run_at <= now)
+        .scalar()
+    )
+    done_last_hour = (
+        db.query(func.count(IngestJob.id))
+        .filter(IngestJob.finished_at >= now - timedelta(hours=1), IngestJob.state == "done")
+        .scalar()
+    )
+    return {
+        "by_state": {s: by_state.get(s, 0) for s in ("pending", "running", "done", "failed")},
+        "lag_seconds": (now - oldest_due).total_seconds() if oldest_due else 0.0,
+        "done_last_hour": done_last_hour,
+    }
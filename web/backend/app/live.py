@@ -0,0 +1,233 @@
+"""
+Live score push for GET /live/scores (server-sent events).
+
+One watcher task per process keeps a snapshot of the standings and of every
+player's fantasy points per match. When the "scores" version (catalogue_versions)
+moves, the watcher reloads both with three queries and diffs them against the
+snapshot. It encodes the delta once as an SSE frame and hands the same bytes to
+every subscriber queue, so an update costs one query round and one fan-out
+however many clients are watching.
+
+_calculate_day_scores and the stats writers in scraper_bridge bump the version.
+Writes in this process also call notify() to wake the watcher at once. Writes
+from the CLI or cron are picked up on the next poll (LIVE_POLL_SECONDS). Nothing
+is queried while nobody is subscribed.
+"""
+import asyncio
+import logging
+import os
+import threading
+
+from sqlalchemy.orm import Session
+
+from .catalogue import current_version
+from .database import SessionLocal
+from .models import Match, PlayerStat
+from .metrics import Counter, Gauge
+from .responses import dumps
+
+logger = logging.getLogger(__name__)
+
+SCORES = "scores"
+POLL_SECONDS = float(os.getenv("LIVE_POLL_SECONDS", "5"))
+HEARTBEAT_SECONDS = 15.0
+QUEUE_SIZE = 32  # frames buffered per client before it is dropped as too slow
+
+LIVE_SUBSCRIBERS = Gauge("live_subscribers", "Clients connected to /live/scores")
+LIVE_EVENTS = Counter("live_events_total", "Score deltas published to /live/scores")
+LIVE_REFRESH_ERRORS = Counter("live_refresh_errors_total", "Failed /live/scores snapshot reloads")
+LIVE_DROPPED = Counter("live_dropped_total", "Subscribers dropped because their queue was full")
+
+
+def sse_frame(event: str, data: dict, event_id: int | None = None) -> bytes:
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {event}\n".encode() + b"data: " + dumps(data) + b"\n\n"
+
+
+class ScoreSnapshot:
+    """Standings and per-player points as of one scores version."""
+
+    def __init__(self, standings: list[dict], player_points: dict[tuple[int, int], tuple[int, float]]):
+        self.standings = {e["user_id"]: e for e in standings}
+        # (match_id, player_id) -> (day, fantasy points)
+        self.player_points = player_points
+
+    @classmethod
+    def load(cls, db: Session) -> "ScoreSnapshot":
+        from .routers.scores import standings_rows
+
+        points = {
+            (match_id, player_id): (day, fantasy_points)
+            for match_id, player_id, day, fantasy_points in db.query(
+                PlayerStat.match_id, PlayerStat.player_id, Match.day, PlayerStat.fantasy_points
+            ).join(Match, Match.id == PlayerStat.match_id)
+        }
+        return cls(standings_rows(db), points)
+
+    def full(self) -> dict:
+        return {
+            "standings": [
+                {"user_id": e["user_id"], "username": e["username"], "rank": e["rank"], "total_points": e["total_points"]}
+                for e in sorted(self.standings.values(), key=lambda e: e["rank"])
+            ],
+        }
+
+    def delta(self, previous: "ScoreSnapshot") -> dict | None:
+        """Changed user totals and ranks, and changed player points; None when nothing moved."""
+        users = []
+        for user_id, entry in self.standings.items():
+            before = previous.standings.get(user_id)
+            if before and (before["total_points"], before["rank"]) == (entry["total_points"], entry["rank"]):
+                continue
+            users.append({
+                "user_id": user_id,
+                "username": entry["username"],
+                "total_points": entry["total_points"],
+                "rank": entry["rank"],
+                "previous_rank": before["rank"] if before else None,
+            })
+        players = [
+            {"player_id": player_id, "match_id": match_id, "day": day, "fantasy_points": points}
+            for (match_id, player_id), (day, points) in self.player_points.items()
+            if previous.player_points.get((match_id, player_id), (day, 0.0))[1] != points
+        ]
+        if not users and not players:
+            return None
+        users.sort(key=lambda u: u["rank"])
+        players.sort(key=lambda p: (p["day"], p["match_id"], p["player_id"]))
+        return {"users": users, "players": players}
+
+
+class ScoreBroker:
+    """In-process pub/sub: one queue per SSE client, fed by the watcher task."""
+
+    def __init__(self, session_factory=SessionLocal, poll_seconds: float = POLL_SECONDS):
+        self.session_factory = session_factory
+        self.poll_seconds = poll_seconds
+        self.subscribers: set[asyncio.Queue] = set()
+        self.seq = 0
+        self.version: int | None = None
+        self.snapshot: ScoreSnapshot | None = None
+        self.snapshot_frame = b""
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wake: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._refresh_lock = threading.Lock()
+
+    # ── Subscribers ──────────────────────────────────────────────────────────
+
+    async def subscribe(self) -> tuple[asyncio.Queue, bytes]:
+        """Register a client; returns its queue and the current snapshot frame to send first."""
+        if self.snapshot is None:
+            await asyncio.to_thread(self.refresh)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self.subscribers.add(queue)
+        LIVE_SUBSCRIBERS.set(len(self.subscribers))
+        return queue, self.snapshot_frame
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self.subscribers.discard(queue)
+        LIVE_SUBSCRIBERS.set(len(self.subscribers))
+
+    def publish(self, frame: bytes):
+        """Hand one encoded frame to every subscriber (event loop thread only)."""
+        for queue in list(self.subscribers):
+            try:
+                queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                # Close a client this far behind; EventSource reconnects and starts from a fresh snapshot
+                self.unsubscribe(queue)
+                queue.get_nowait()
+                queue.put_nowait(None)
+                LIVE_DROPPED.inc()
+
+    async def stream(self, queue: asyncio.Queue, first: bytes, is_disconnected):
+        """SSE body for one client: the snapshot, then deltas, with heartbeats in between."""
+        try:
+            yield b"retry: 3000\n\n" + first
+            while not await is_disconnected():
+                try:
+                    frame = await asyncio.wait_for(queue.get(), timeout=HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b": keep-alive\n\n"
+                    continue
+                if frame is None:  # dropped as too slow
+                    return
+                yield frame
+        finally:
+            self.unsubscribe(queue)
+
+    # ── Snapshot ─────────────────────────────────────────────────────────────
+
+    def refresh(self, db: Session | None = None) -> bytes | None:
+        """
+        Reload the snapshot if the scores version moved; returns the delta frame to
+        publish, if any. Runs in a worker thread.
+        """
+        own_session = db is None
+        db = db or self.session_factory()
+        try:
+            with self._refresh_lock:
+                version = current_version(db, SCORES)
+                if self.snapshot is not None and version == self.version:
+                    return None
+                snapshot = ScoreSnapshot.load(db)
+                previous, self.snapshot, self.version = self.snapshot, snapshot, version
+                self.snapshot_frame = sse_frame("snapshot", {"version": version, **snapshot.full()})
+                delta = snapshot.delta(previous) if previous is not None else None
+                if delta is None:
+                    return None
+                self.seq += 1
+                LIVE_EVENTS.inc()
+                return sse_frame("scores", {"version": version, **delta}, self.seq)
+        finally:
+            if own_session:
+                db.close()
+
+    # ── Watcher ──────────────────────────────────────────────────────────────
+
+    def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._task = self._loop.create_task(self._watch())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = self._loop = self._wake = None
+
+    def notify(self):
+        """Wake the watcher now; safe to call from any thread, a no-op when it isn't running."""
+        loop, wake = self._loop, self._wake
+        if loop is not None and wake is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(wake.set)
+
+    async def _watch(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            if not self.subscribers:
+                self.snapshot = None  # rebuilt by the next subscriber
+                continue
+            try:
+                frame = await asyncio.to_thread(self.refresh)
+            except Exception:  # keep watching through a DB hiccup
+                logger.exception("live scores: snapshot refresh failed")
+                LIVE_REFRESH_ERRORS.inc()
+                continue
+            if frame:
+                self.publish(frame)
+
+
+broker = ScoreBroker()
+
+
+def notify():
+    broker.notify()
@@ -1,7 +1,9 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .database import engine, Base
-from .routers import auth, players, matches, lineup, scores
+from .database import engine, Base, SessionLocal, USE_ASYNC_DB
+from .catalogue import get_catalogue
+from .live import broker
+from .routers import auth, players, matches, lineup, scores, dashboard, live, metrics
 
 app = FastAPI(title="IIHF Fantasy Hockey API", version="1.0.0")
 
@@ -13,16 +15,36 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if USE_ASYNC_DB:
+    # Included first, so their paths resolve to the async handlers
+    for module in (players, matches, lineup, scores, dashboard):
+        app.include_router(module.async_router)
+
 app.include_router(auth.router)
 app.include_router(players.router)
 app.include_router(matches.router)
 app.include_router(lineup.router)
 app.include_router(scores.router)
+app.include_router(dashboard.router)
+app.include_router(live.router)
+app.include_router(metrics.router)
 
 
 @app.on_event("startup")
 def startup():
     Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        get_catalogue(db)  # build the player list and search index before the first request
+
+
+@app.on_event("startup")
+async def start_live_scores():
+    broker.start()
+
+
+@app.on_event("shutdown")
+async def stop_live_scores():
+    await broker.stop()
 
 
 @app.get("/health")
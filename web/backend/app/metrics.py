@@ -0,0 +1,127 @@
+"""
+In-process metrics, rendered in the Prometheus text format by GET /metrics.
+
+Counters and histograms are updated where things happen; gauges are refreshed by
+collectors (see register_collector) right before each render, so a scrape always
+sees current values such as pool checkouts.
+"""
+import bisect
+import threading
+from typing import Callable
+
+# Seconds; wide enough for both pool waits and request-ish latencies
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_lock = threading.Lock()
+_metrics: dict[str, "_Metric"] = {}
+_collectors: list[Callable[[], None]] = []
+
+
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: tuple, extra: tuple = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self.values: dict[tuple, float] = {}
+        with _lock:
+            _metrics[name] = self
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> list[str]:
+        lines = self.header()
+        with _lock:
+            items = sorted(self.values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(key)} {value:g}")
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = _label_key(labels)
+        with _lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        with _lock:
+            return self.values.get(_label_key(labels), 0)
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        with _lock:
+            self.values[_label_key(labels)] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, buckets: tuple = DEFAULT_BUCKETS):
+        super().__init__(name, help)
+        self.buckets = tuple(sorted(buckets))
+        # label key -> [per-bucket counts (+Inf last), sum, count]
+        self.series: dict[tuple, list] = {}
+
+    def observe(self, value: float, **labels):
+        key = _label_key(labels)
+        with _lock:
+            series = self.series.setdefault(key, [[0] * (len(self.buckets) + 1), 0.0, 0])
+            series[0][bisect.bisect_left(self.buckets, value)] += 1
+            series[1] += value
+            series[2] += 1
+
+    def snapshot(self, **labels) -> dict:
+        """count, sum and cumulative bucket counts of one series."""
+        with _lock:
+            counts, total, count = self.series.get(_label_key(labels), [[0] * (len(self.buckets) + 1), 0.0, 0])
+            counts = list(counts)
+        cumulative, running = {}, 0
+        for bound, n in zip(self.buckets + (float("inf"),), counts):
+            running += n
+            cumulative[bound] = running
+        return {"count": count, "sum": total, "buckets": cumulative}
+
+    def render(self) -> list[str]:
+        lines = self.header()
+        with _lock:
+            keys = sorted(self.series)
+        for key in keys:
+            snap = self.snapshot(**dict(key))
+            for bound, n in snap["buckets"].items():
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                lines.append(f"{self.name}_bucket{_format_labels(key, (('le', le),))} {n}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {snap['sum']:g}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {snap['count']}")
+        return lines
+
+
+def register_collector(collector: Callable[[], None]):
+    """Run collector before every render; it should set() gauges."""
+    with _lock:
+        _collectors.append(collector)
+
+
+def render() -> str:
+    for collector in list(_collectors):
+        collector()
+    with _lock:
+        metrics = list(_metrics.values())
+    return "\n".join(line for metric in metrics for line in metric.render()) + "\n"
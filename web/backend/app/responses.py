@@ -0,0 +1,38 @@
+"""
+Fast JSON responses for the large list endpoints.
+
+Handlers build plain dicts straight from row tuples and return FastJSONResponse,
+which FastAPI sends as is: no response_model validation and no jsonable_encoder
+pass. orjson does the encoding when installed, the stdlib json module otherwise.
+The response_model on those routes is kept for the OpenAPI schema only.
+"""
+import json
+from datetime import date, datetime
+from typing import Any
+
+from fastapi.responses import Response
+
+try:
+    import orjson
+except ImportError:  # optional speed-up; the stdlib path produces the same JSON
+    orjson = None
+
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        # NON_STR_KEYS: scores_by_day is keyed by int day, like Pydantic renders it
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=_default, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -1,44 +1,68 @@
 from typing import Annotated
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from ..database import get_db
 from ..models import User
-from ..auth import hash_password, verify_password, create_access_token, get_current_user
+from ..auth import (
+    AuthUser, hash_password_async, verify_and_update_password, create_access_token, get_current_user,
+)
 from ..schemas import SignupRequest, TokenResponse, UserOut
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
-@router.post("/signup", response_model=TokenResponse)
-def signup(body: SignupRequest, db: Annotated[Session, Depends(get_db)]):
+def _signup_conflict(db: Session, body: SignupRequest) -> str | None:
     if db.query(User).filter(User.username == body.username).first():
-        raise HTTPException(status_code=400, detail="Username already taken")
+        return "Username already taken"
     if db.query(User).filter(User.email == body.email).first():
-        raise HTTPException(status_code=400, detail="Email already registered")
+        return "Email already registered"
+    return None
+
 
-    user = User(
-        username=body.username,
-        email=body.email,
-        password_hash=hash_password(body.password),
-    )
+def _add_user(db: Session, body: SignupRequest, password_hash: str) -> str:
+    user = User(username=body.username, email=body.email, password_hash=password_hash)
     db.add(user)
     db.commit()
     db.refresh(user)
-    return TokenResponse(access_token=create_access_token(user.id))
+    return user.id
+
+
+# signup and login are async so bcrypt runs on the hashing pool (see auth.py)
+# without also holding a request thread; their few queries go to the threadpool
+@router.post("/signup", response_model=TokenResponse)
+async def signup(body: SignupRequest, db: Annotated[Session, Depends(get_db)]):
+    conflict = await run_in_threadpool(_signup_conflict, db, body)
+    if conflict:
+        raise HTTPException(status_code=400, detail=conflict)
+
+    password_hash = await hash_password_async(body.password)
+    user_id = await run_in_threadpool(_add_user, db, body, password_hash)
+    return TokenResponse(access_token=create_access_token(user_id))
+
+
+def _rehash(db: Session, user: User, password_hash: str):
+    user.password_hash = password_hash
+    db.commit()
 
 
 @router.post("/login", response_model=TokenResponse)
-def login(
+async def login(
     form: Annotated[OAuth2PasswordRequestForm, Depends()],
     db: Annotated[Session, Depends(get_db)],
 ):
-    user = db.query(User).filter(User.username == form.username).first()
-    if not user or not verify_password(form.password, user.password_hash):
+    user = await run_in_threadpool(lambda: db.query(User).filter(User.username == form.username).first())
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid username or password")
+    valid, new_hash = await verify_and_update_password(form.password, user.password_hash)
+    if not valid:
         raise HTTPException(status_code=401, detail="Invalid username or password")
+    if new_hash:
+        await run_in_threadpool(_rehash, db, user, new_hash)
     return TokenResponse(access_token=create_access_token(user.id))
 
 
 @router.get("/me", response_model=UserOut)
-def get_me(current_user: Annotated[User, Depends(get_current_user)]):
+def get_me(current_user: Annotated[AuthUser, Depends(get_current_user)]):
     return current_user
@@ -0,0 +1,126 @@
+from datetime import datetime, timezone
+from typing import Annotated
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database import get_db, get_async_db
+from ..models import DailyLineup, Player, Match
+from ..auth import AuthUser, get_current_user, get_current_user_async
+from ..schemas import DashboardOut
+from ..responses import FastJSONResponse
+from ..catalogue import PLAYER_COLUMNS, player_dict
+from .lineup import usage_limit
+
+router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+# Async twin, mounted when DB_ASYNC is on (see main.py)
+async_router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+
+
+def _player_usages(db: Session, user_id: str, day: int, teams: dict[int, str], stages: dict[str, str]) -> list[dict]:
+    """
+    Remaining picks per player the user has ever picked, counted like save_lineup:
+    prior days (not `day`) on which the player's team played a match of this day's stage.
+    """
+    history: dict[int, list[int]] = {}
+    for player_id, team, past_day in (
+        db.query(DailyLineup.player_id, Player.team_abbr, DailyLineup.day)
+        .join(Player, Player.id == DailyLineup.player_id)
+        .filter(DailyLineup.user_id == user_id, DailyLineup.day != day)
+    ):
+        teams[player_id] = team
+        history.setdefault(player_id, []).append(past_day)
+
+    played: set[tuple[int, str, str]] = set()
+    past_days = {d for days in history.values() for d in days}
+    if past_days:
+        for match_day, stage, home, away in db.query(Match.day, Match.stage, Match.home_team, Match.away_team).filter(
+            Match.day.in_(past_days)
+        ):
+            played.add((match_day, home, stage))
+            played.add((match_day, away, stage))
+
+    usages = []
+    for player_id, team in sorted(teams.items()):
+        stage = stages.get(team, "group")
+        used = sum((d, team, stage) in played for d in history.get(player_id, ()))
+        limit = usage_limit(stage)
+        usages.append({
+            "player_id": player_id, "stage": stage, "used": used, "limit": limit, "remaining": max(limit - used, 0),
+        })
+    return usages
+
+
+@router.get("", response_model=DashboardOut)
+def get_dashboard(
+    current_user: Annotated[AuthUser, Depends(get_current_user)],
+    db: Annotated[Session, Depends(get_db)],
+    day: int | None = Query(None),
+):
+    """
+    Everything the lineup page needs on load, in one request: today's matches,
+    the user's lineup for the day with lock flags, remaining usages per player and
+    the countdown to the next lock. Without `day`, the day of today's first match
+    is used (day 1 when nothing is played today).
+    """
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    today = now.date()
+
+    # One match query serves today's list, the lock set, stages and the countdown
+    match_filter = Match.date == today if day is None else or_(Match.date == today, Match.day == day)
+    matches = db.query(Match).filter(match_filter).order_by(Match.match_time).all()
+    todays = [m for m in matches if m.date == today]
+    if day is None:
+        day = todays[0].day if todays else 1
+        if not todays:
+            matches = db.query(Match).filter(Match.day == day).order_by(Match.match_time).all()
+    day_matches = [m for m in matches if m.day == day]
+
+    locked_teams: set[str] = set()
+    stages: dict[str, str] = {}
+    for m in day_matches:
+        stages.setdefault(m.home_team, m.stage)
+        stages.setdefault(m.away_team, m.stage)
+        if m.match_time <= now:
+            locked_teams.update((m.home_team, m.away_team))
+    next_lock_at = min((m.match_time for m in day_matches if m.match_time > now), default=None)
+
+    lineup = []
+    teams: dict[int, str] = {}
+    for is_captain, *player in (
+        db.query(DailyLineup.is_captain, *PLAYER_COLUMNS)
+        .join(Player, Player.id == DailyLineup.player_id)
+        .filter(DailyLineup.user_id == current_user.id, DailyLineup.day == day)
+        .order_by(DailyLineup.id)
+    ):
+        locked = player[3] in locked_teams
+        teams[player[0]] = player[3]
+        lineup.append({
+            "player_id": player[0], "is_captain": is_captain, "locked": locked,
+            "player": player_dict(player, locked),
+        })
+
+    return FastJSONResponse({
+        "day": day,
+        "server_time": now.isoformat(),
+        "next_lock_at": next_lock_at.isoformat() if next_lock_at else None,
+        "matches": [
+            {
+                "id": m.id, "day": m.day, "date": m.date.isoformat(), "match_time": m.match_time.isoformat(),
+                "home_team": m.home_team, "away_team": m.away_team, "status": m.status,
+            }
+            for m in todays
+        ],
+        "locked_teams": sorted(locked_teams),
+        "lineup": lineup,
+        "usages": _player_usages(db, current_user.id, day, teams, stages),
+    })
+
+
+@async_router.get("", response_model=DashboardOut)
+async def get_dashboard_async(
+    current_user: Annotated[AuthUser, Depends(get_current_user_async)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+    day: int | None = Query(None),
+):
+    return await db.run_sync(lambda session: get_dashboard(current_user, session, day))
@@ -3,16 +3,26 @@ from typing import Annotated
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import and_
-from ..database import get_db
-from ..models import DailyLineup, Player, Match, User
-from ..auth import get_current_user
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database import get_db, get_async_db
+from ..models import DailyLineup, Player, Match
+from ..auth import AuthUser, get_current_user, get_current_user_async
 from ..schemas import LineupSaveRequest, LineupResponse, LineupEntryOut, PlayerOut
+from ..responses import FastJSONResponse
+from ..catalogue import PLAYER_COLUMNS, player_dict
 
 router = APIRouter(prefix="/lineup", tags=["lineup"])
+# Async twins of GET/POST /me, mounted when DB_ASYNC is on (see main.py)
+async_router = APIRouter(prefix="/lineup", tags=["lineup"])
 
 POSITION_LIMITS = {"Forward": 3, "Defender": 2, "Goalkeeper": 1}
 
 
+def usage_limit(stage: str) -> int:
+    """Days a player may be picked per stage: 3 in the group stage, 1 in the playoffs."""
+    return 3 if stage == "group" else 1
+
+
 def _get_locked_teams_for_day(day: int, db: Session) -> set[str]:
     """Return team abbrs whose match on `day` has already started (match_time <= now)."""
     now = datetime.now(timezone.utc).replace(tzinfo=None)
@@ -45,7 +55,7 @@ def _build_lineup_response(day: int, entries: list, db: Session) -> LineupRespon
 
 @router.get("/me", response_model=LineupResponse)
 def get_my_lineup(
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[AuthUser, Depends(get_current_user)],
     db: Annotated[Session, Depends(get_db)],
     day: int = Query(...),
 ):
@@ -61,7 +71,7 @@ def get_my_lineup(
 @router.post("/me", response_model=LineupResponse)
 def save_lineup(
     body: LineupSaveRequest,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[AuthUser, Depends(get_current_user)],
     db: Annotated[Session, Depends(get_db)],
 ):
     if not body.players:
@@ -105,7 +115,7 @@ def save_lineup(
             (Match.home_team == player.team_abbr) | (Match.away_team == player.team_abbr),
         ).first()
         stage = today_match.stage if today_match else "group"
-        usage_limit = 3 if stage == "group" else 1
+        max_uses = usage_limit(stage)
 
         # Count prior days this player was used in the same stage (exclude today to allow re-saves)
         prior_uses = (
@@ -125,11 +135,11 @@ def save_lineup(
             )
             .count()
         )
-        if prior_uses >= usage_limit:
+        if prior_uses >= max_uses:
             raise HTTPException(
                 status_code=422,
                 detail=f"{player.name} has already been used {prior_uses}× "
-                       f"(limit: {usage_limit} in {stage} stage)",
+                       f"(limit: {max_uses} in {stage} stage)",
             )
 
     # Remove entries no longer in the submitted lineup, but preserve locked ones
@@ -182,20 +192,44 @@ def save_lineup(
     return _build_lineup_response(body.day, entries, db)
 
 
+
+@async_router.get("/me", response_model=LineupResponse)
+async def get_my_lineup_async(
+    current_user: Annotated[AuthUser, Depends(get_current_user_async)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+    day: int = Query(...),
+):
+    return await db.run_sync(lambda session: get_my_lineup(current_user, session, day))
+
+
+@async_router.post("/me", response_model=LineupResponse)
+async def save_lineup_async(
+    body: LineupSaveRequest,
+    current_user: Annotated[AuthUser, Depends(get_current_user_async)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+):
+    return await db.run_sync(lambda session: save_lineup(body, current_user, session))
+
+
 @router.get("/all", response_model=list[LineupResponse])
 def get_all_lineups(
     db: Annotated[Session, Depends(get_db)],
     day: int = Query(...),
 ):
     from ..models import User as UserModel
-    users = db.query(UserModel).all()
-    result = []
-    for user in users:
-        entries = (
-            db.query(DailyLineup)
-            .options(joinedload(DailyLineup.player))
-            .filter(DailyLineup.user_id == user.id, DailyLineup.day == day)
-            .all()
-        )
-        result.append(LineupResponse(day=day, lineup=entries))
-    return result
+    lineups = {user_id: [] for (user_id,) in db.query(UserModel.id).order_by(UserModel.created_at, UserModel.id)}
+    rows = (
+        db.query(DailyLineup.user_id, DailyLineup.player_id, DailyLineup.is_captain, DailyLineup.locked, *PLAYER_COLUMNS)
+        .join(Player, Player.id == DailyLineup.player_id)
+        .filter(DailyLineup.day == day)
+        .order_by(DailyLineup.user_id, DailyLineup.id)
+    )
+    for user_id, player_id, is_captain, locked, *player in rows:
+        if user_id in lineups:
+            lineups[user_id].append({
+                "player_id": player_id,
+                "is_captain": is_captain,
+                "locked": locked,
+                "player": player_dict(player),
+            })
+    return FastJSONResponse([{"day": day, "lineup": entries} for entries in lineups.values()])
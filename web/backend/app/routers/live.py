@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
+from ..live import broker
+
+router = APIRouter(prefix="/live", tags=["live"])
+
+
+@router.get("/scores")
+async def live_scores(request: Request):
+    """
+    Server-sent events: a "snapshot" of the standings on connect, then a "scores"
+    event with changed user totals, rank moves and player points after every
+    recalculation.
+    """
+    queue, first = await broker.subscribe()
+    return StreamingResponse(
+        broker.stream(queue, first, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
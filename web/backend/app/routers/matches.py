@@ -2,11 +2,14 @@ from datetime import datetime, timezone, date
 from typing import Annotated
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
-from ..database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database import get_db, get_async_db
 from ..models import Match
 from ..schemas import MatchOut
 
 router = APIRouter(prefix="/matches", tags=["matches"])
+# Async twins of the hot endpoints, mounted when DB_ASYNC is on (see main.py)
+async_router = APIRouter(prefix="/matches", tags=["matches"])
 
 
 @router.get("/today", response_model=list[MatchOut])
@@ -29,3 +32,16 @@ def get_matches(
     if day is not None:
         query = query.filter(Match.day == day)
     return query.order_by(Match.day, Match.match_time).all()
+
+
+@async_router.get("/today", response_model=list[MatchOut])
+async def get_today_matches_async(db: Annotated[AsyncSession, Depends(get_async_db)]):
+    return await db.run_sync(get_today_matches)
+
+
+@async_router.get("", response_model=list[MatchOut])
+async def get_matches_async(
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+    day: int | None = Query(None),
+):
+    return await db.run_sync(get_matches, day)
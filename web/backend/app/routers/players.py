@@ -1,37 +1,115 @@
-from datetime import datetime, timezone
 from typing import Annotated
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.orm import Session
-from ..database import get_db
-from ..models import Player, Match
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database import get_db, get_async_db
 from ..schemas import PlayerOut
+from ..catalogue import get_catalogue, locked_teams_for_day
 
 router = APIRouter(prefix="/players", tags=["players"])
+# Async twins of the hot endpoints, mounted when DB_ASYNC is on (see main.py)
+async_router = APIRouter(prefix="/players", tags=["players"])
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Whether Accept-Encoding allows gzip: its own q-value, else that of "*"; q=0 refuses."""
+    qualities = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding.strip():
+            qualities[coding.strip()] = q
+    return qualities.get("gzip", qualities.get("*", 0.0)) > 0
+
+
+def players_response(
+    db: Session,
+    position: str | None = None,
+    team: str | None = None,
+    day: int | None = None,
+    if_none_match: str | None = None,
+    accept_encoding: str = "",
+) -> Response:
+    """Serve the player list from the pre-serialized catalogue, honouring ETags and gzip."""
+    catalogue = get_catalogue(db)
+    locked = catalogue.lock_mask(locked_teams_for_day(db, day)) if day is not None else 0
+    rendered = catalogue.render(catalogue.select_mask(position, team), locked)
+
+    headers = {"ETag": rendered.etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if _etag_matches(if_none_match, rendered.etag):
+        return Response(status_code=304, headers=headers)
+    if _accepts_gzip(accept_encoding):
+        headers["Content-Encoding"] = "gzip"
+        return Response(rendered.gzipped, media_type="application/json", headers=headers)
+    return Response(rendered.body, media_type="application/json", headers=headers)
 
 
 @router.get("", response_model=list[PlayerOut])
 def get_players(
+    request: Request,
+    db: Annotated[Session, Depends(get_db)],
+    position: str | None = Query(None),
+    team: str | None = Query(None),
+    day: int | None = Query(None),
+):
+    return players_response(
+        db, position, team, day,
+        request.headers.get("if-none-match"), request.headers.get("accept-encoding", ""),
+    )
+
+
+@router.get("/search", response_model=list[PlayerOut])
+def search_players(
     db: Annotated[Session, Depends(get_db)],
+    q: str = Query("", max_length=100),
+    position: str | None = Query(None),
+    team: str | None = Query(None),
+    day: int | None = Query(None),
+    limit: int = Query(12, ge=1, le=100),
+):
+    """Typeahead over accent-folded names, teams and positions, answered from the catalogue index."""
+    catalogue = get_catalogue(db)
+    found = catalogue.search(q, catalogue.select_mask(position, team), limit)
+    locked = catalogue.lock_mask(locked_teams_for_day(db, day)) if day is not None and found else 0
+    return Response(catalogue.render_rows(found, locked), media_type="application/json")
+
+
+@async_router.get("", response_model=list[PlayerOut])
+async def get_players_async(
+    request: Request,
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+    position: str | None = Query(None),
+    team: str | None = Query(None),
+    day: int | None = Query(None),
+):
+    if_none_match, accept_encoding = request.headers.get("if-none-match"), request.headers.get("accept-encoding", "")
+    return await db.run_sync(
+        lambda session: players_response(session, position, team, day, if_none_match, accept_encoding)
+    )
+
+
+@async_router.get("/search", response_model=list[PlayerOut])
+async def search_players_async(
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+    q: str = Query("", max_length=100),
     position: str | None = Query(None),
     team: str | None = Query(None),
     day: int | None = Query(None),
+    limit: int = Query(12, ge=1, le=100),
 ):
-    query = db.query(Player)
-    if position:
-        query = query.filter(Player.position == position)
-    if team:
-        query = query.filter(Player.team_abbr == team)
-
-    locked_teams: set[str] = set()
-    if day is not None:
-        now = datetime.now(timezone.utc).replace(tzinfo=None)
-        for m in db.query(Match).filter(Match.day == day, Match.match_time <= now).all():
-            locked_teams.add(m.home_team)
-            locked_teams.add(m.away_team)
-
-    result = []
-    for p in query.order_by(Player.team_abbr, Player.name).all():
-        out = PlayerOut.model_validate(p)
-        out.is_locked = p.team_abbr in locked_teams
-        result.append(out)
-    return result
+    return await db.run_sync(search_players, q, position, team, day, limit)
@@ -2,13 +2,19 @@ from datetime import datetime, timezone
 from typing import Annotated
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
-from ..database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database import get_db, get_async_db
 from ..models import DailyLineup, PlayerStat, UserDayScore, User, Match
-from ..auth import get_current_user
+from ..auth import AuthUser, get_current_user
 from ..scoring import calculate_player_points
 from ..schemas import StandingEntry, UserDayScoreOut, PlayerScoreDetail
+from ..responses import FastJSONResponse
+from ..catalogue import bump_version
+from .. import live
 
 router = APIRouter(prefix="/scores", tags=["scores"])
+# Async twin of /standings, mounted when DB_ASYNC is on (see main.py)
+async_router = APIRouter(prefix="/scores", tags=["scores"])
 
 
 def _calculate_day_scores(day: int, db: Session):
@@ -55,7 +61,9 @@ def _calculate_day_scores(day: int, db: Session):
                 total_points=total,
                 calculated_at=datetime.now(timezone.utc).replace(tzinfo=None),
             ))
+    bump_version(db, live.SCORES)
     db.commit()
+    live.notify()
 
 
 @router.post("/calculate")
@@ -64,32 +72,42 @@ def calculate_scores(day: int = Query(...), db: Session = Depends(get_db)):
     return {"status": "calculated", "day": day}
 
 
-@router.get("/standings", response_model=list[StandingEntry])
-def get_standings(db: Annotated[Session, Depends(get_db)]):
-    users = db.query(User).all()
-    entries = []
-    for user in users:
-        scores = db.query(UserDayScore).filter(UserDayScore.user_id == user.id).all()
-        total = sum(s.total_points for s in scores)
-        by_day = {s.day: s.total_points for s in scores}
-        entries.append(
-            StandingEntry(
-                rank=0,
-                username=user.username,
-                user_id=user.id,
-                total_points=total,
-                scores_by_day=by_day,
-            )
-        )
-    entries.sort(key=lambda e: e.total_points, reverse=True)
+def standings_rows(db: Session) -> list[dict]:
+    """StandingEntry-shaped dicts, best total first, from two queries."""
+    users = db.query(User.id, User.username).all()
+    by_user: dict[str, dict[int, float]] = {user_id: {} for user_id, _ in users}
+    for user_id, day, points in db.query(UserDayScore.user_id, UserDayScore.day, UserDayScore.total_points):
+        if user_id in by_user:
+            by_user[user_id][day] = points
+
+    entries = [
+        {
+            "rank": 0,
+            "username": username,
+            "user_id": user_id,
+            "total_points": sum(by_user[user_id].values()),
+            "scores_by_day": by_user[user_id],
+        }
+        for user_id, username in users
+    ]
+    entries.sort(key=lambda e: e["total_points"], reverse=True)
     for i, entry in enumerate(entries):
-        entry.rank = i + 1
+        entry["rank"] = i + 1
     return entries
 
 
+@router.get("/standings", response_model=list[StandingEntry])
+def get_standings(db: Annotated[Session, Depends(get_db)]):
+    return FastJSONResponse(standings_rows(db))
+
+
+@async_router.get("/standings", response_model=list[StandingEntry])
+async def get_standings_async(db: Annotated[AsyncSession, Depends(get_async_db)]):
+    return await db.run_sync(get_standings)
+
 @router.get("/me", response_model=list[UserDayScoreOut])
 def get_my_scores(
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[AuthUser, Depends(get_current_user)],
     db: Annotated[Session, Depends(get_db)],
 ):
     day_scores = (
@@ -89,3 +89,22 @@ class StandingEntry(BaseModel):
     user_id: str
     total_points: float
     scores_by_day: dict[int, float]
+
+
+# ── Dashboard ────────────────────────────────────────────────────────────────
+
+class PlayerUsageOut(BaseModel):
+    player_id: int
+    stage: str
+    used: int
+    limit: int
+    remaining: int
+
+class DashboardOut(BaseModel):
+    day: int
+    server_time: datetime
+    next_lock_at: datetime | None
+    matches: list[MatchOut]
+    locked_teams: list[str]
+    lineup: list[LineupEntryOut]
+    usages: list[PlayerUsageOut]
@@ -0,0 +1,137 @@
+"""
+Benchmark response building and serialization for /players, /scores/standings
+and /lineup/all.
+
+Each endpoint's current handler (row tuples -> dicts -> FastJSONResponse; for
+/players a warm pre-serialized catalogue, see app/catalogue.py) is timed against
+the previous approach, which built one Pydantic model per ORM row
+and let FastAPI validate and serialize the list through the response_model.
+Both run on the same in-memory league, their JSON is checked to be identical,
+and the table reports milliseconds per 1,000 rows.
+
+Usage (CLI):
+    python bench_json.py
+    python bench_json.py --players 5000 --users 2000 --repeat 20
+"""
+import argparse
+import json
+import time
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker, joinedload
+from sqlalchemy.pool import StaticPool
+from app.database import Base
+from app.models import User, Player, UserDayScore, DailyLineup
+from app.routers.players import players_response
+from app.routers.scores import get_standings
+from app.routers.lineup import get_all_lineups
+from app.schemas import PlayerOut, StandingEntry, LineupResponse
+
+POSITIONS = ["Forward", "Forward", "Forward", "Defender", "Defender", "Goalkeeper"]
+
+
+def seed(db, n_players: int, n_users: int, days: int):
+    db.execute(insert(Player), [
+        {"id": i + 1, "name": f"Player {i}", "position": POSITIONS[i % 6], "team_abbr": f"T{i % 16}",
+         "championship_year": 2026}
+        for i in range(n_players)
+    ])
+    db.execute(insert(User), [
+        {"id": f"u{n}", "username": f"user{n}", "email": f"user{n}@test.com", "password_hash": "x"}
+        for n in range(n_users)
+    ])
+    db.execute(insert(UserDayScore), [
+        {"user_id": f"u{n}", "day": d, "total_points": float((n * 7 + d * 3) % 40)}
+        for n in range(n_users) for d in range(1, days + 1)
+    ])
+    db.execute(insert(DailyLineup), [
+        {"user_id": f"u{n}", "day": 1, "player_id": (n * 6 + k) % n_players + 1, "is_captain": k == 0}
+        for n in range(n_users) for k in range(6)
+    ])
+    db.commit()
+
+
+# The pre-FastJSONResponse handlers; FastAPI then ran response_model validation and serialization
+
+def legacy_players(db):
+    result = []
+    for p in db.query(Player).order_by(Player.team_abbr, Player.name).all():
+        out = PlayerOut.model_validate(p)
+        out.is_locked = False
+        result.append(out)
+    return result
+
+
+def legacy_standings(db):
+    entries = []
+    for user in db.query(User).all():
+        scores = db.query(UserDayScore).filter(UserDayScore.user_id == user.id).all()
+        entries.append(StandingEntry(
+            rank=0, username=user.username, user_id=user.id,
+            total_points=sum(s.total_points for s in scores),
+            scores_by_day={s.day: s.total_points for s in scores},
+        ))
+    entries.sort(key=lambda e: e.total_points, reverse=True)
+    for i, entry in enumerate(entries):
+        entry.rank = i + 1
+    return entries
+
+
+def legacy_all_lineups(db):
+    result = []
+    for user in db.query(User).order_by(User.created_at, User.id).all():
+        entries = (
+            db.query(DailyLineup).options(joinedload(DailyLineup.player))
+            .filter(DailyLineup.user_id == user.id, DailyLineup.day == 1).order_by(DailyLineup.id).all()
+        )
+        result.append(LineupResponse(day=1, lineup=entries))
+    return result
+
+
+def _time(fn, repeat: int) -> tuple[float, bytes]:
+    best, body = float("inf"), b""
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, body
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSON building for the large list endpoints.")
+    parser.add_argument("--players", type=int, default=1000, help="Players in the catalogue")
+    parser.add_argument("--users", type=int, default=1000, help="Users in the standings and lineups")
+    parser.add_argument("--days", type=int, default=10, help="Scored days per user")
+    parser.add_argument("--repeat", type=int, default=10, help="Runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    seed(db, args.players, args.users, args.days)
+
+    cases = [
+        ("/players", args.players, list[PlayerOut],
+         lambda: legacy_players(db), lambda: players_response(db)),
+        ("/scores/standings", args.users, list[StandingEntry],
+         lambda: legacy_standings(db), lambda: get_standings(db)),
+        ("/lineup/all", args.users, list[LineupResponse],
+         lambda: legacy_all_lineups(db), lambda: get_all_lineups(db, 1)),
+    ]
+
+    print(f"{'endpoint':<20}{'rows':>7}{'before ms/1k':>14}{'after ms/1k':>13}{'speed-up':>10}")
+    for name, rows, model, legacy, current in cases:
+        adapter = TypeAdapter(model)
+        before, legacy_body = _time(lambda: adapter.dump_json(adapter.validate_python(legacy(), from_attributes=True)),
+                                    args.repeat)
+        after, body = _time(lambda: current().body, args.repeat)
+        if json.loads(legacy_body) != json.loads(body):
+            raise SystemExit(f"{name}: JSON differs from the previous implementation")
+        per_k = 1000 / rows * 1000
+        print(f"{name:<20}{rows:>7}{before * per_k:>14.2f}{after * per_k:>13.2f}{before / after:>9.1f}x")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
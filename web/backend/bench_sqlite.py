@@ -0,0 +1,183 @@
+"""
+Benchmark concurrent reads and writes on a SQLite file with and without the
+production pragma profile (database.sqlite_pragmas).
+
+Seeds a throwaway league, then for --duration seconds runs --readers threads
+loading the standings (routers/scores.get_standings) while --writers threads
+re-save lineups (one small transaction each, like POST /lineup/me) and --scorers
+threads recalculate day scores (_calculate_day_scores). It runs first with
+SQLite's defaults (rollback journal) and then with the WAL profile, and prints
+throughput, read latency and "database is locked" failures for each run.
+
+Usage (CLI):
+    python bench_sqlite.py
+    python bench_sqlite.py --users 200 --readers 16 --writers 2 --duration 10 --json sqlite.json
+"""
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import create_engine, delete, exc, insert
+from sqlalchemy.orm import sessionmaker
+from app.database import Base, apply_sqlite_profile, sqlite_pragmas
+from app.models import User, Player, Match, PlayerStat, DailyLineup
+from app.routers.scores import _calculate_day_scores, get_standings
+
+POSITIONS = ["Forward"] * 3 + ["Defender"] * 2 + ["Goalkeeper"]
+TEAMS = 16
+PLAYERS_PER_TEAM = 20
+
+
+def seed(engine, users: int, days: int, players_per_team: int = PLAYERS_PER_TEAM, teams: int = TEAMS):
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Player), [
+            {"id": t * players_per_team + i + 1, "name": f"P{t}-{i}", "position": POSITIONS[i % len(POSITIONS)],
+             "team_abbr": f"T{t}", "championship_year": 2026}
+            for t in range(teams) for i in range(players_per_team)
+        ])
+        start = datetime(2026, 5, 1, 12)
+        matches = [
+            {"id": (d - 1) * (teams // 2) + m + 1, "day": d, "date": date(2026, 5, d),
+             "match_time": start + timedelta(days=d - 1, hours=m), "home_team": f"T{2 * m}",
+             "away_team": f"T{2 * m + 1}", "status": "completed"}
+            for d in range(1, days + 1) for m in range(teams // 2)
+        ]
+        conn.execute(insert(Match), matches)
+        conn.execute(insert(PlayerStat), [
+            {"player_id": t * players_per_team + i + 1, "match_id": match["id"], "goals": i % 3, "assists": i % 2}
+            for match in matches for t in (int(match["home_team"][1:]), int(match["away_team"][1:]))
+            for i in range(players_per_team)
+        ])
+        conn.execute(insert(User), [
+            {"id": f"u{n}", "username": f"user{n}", "email": f"user{n}@test.com", "password_hash": "x"}
+            for n in range(users)
+        ])
+        conn.execute(insert(DailyLineup), [
+            {"user_id": f"u{n}", "day": d, "player_id": ((n + d) * 7 + k * 13) % (teams * players_per_team) + 1,
+             "is_captain": k == 0, "locked": True}
+            for n in range(users) for d in range(1, days + 1) for k in range(6)
+        ])
+
+
+def run(path: str, profile: bool, args) -> dict:
+    engine = create_engine(
+        f"sqlite:///{path}", connect_args={"check_same_thread": False},
+        pool_size=args.readers + args.writers + args.scorers, max_overflow=0,
+    )
+    if profile:
+        apply_sqlite_profile(engine)
+    Session = sessionmaker(autoflush=False, bind=engine)
+
+    counts = {"reads": 0, "writes": 0, "scores": 0, "read_errors": 0, "write_errors": 0}
+    read_latencies: list[float] = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + args.duration
+
+    def reader():
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            db = Session()
+            try:
+                get_standings(db)
+                ok = True
+            except exc.OperationalError:
+                ok = False
+            finally:
+                db.close()
+            with lock:
+                if ok:
+                    counts["reads"] += 1
+                    read_latencies.append(time.perf_counter() - started)
+                else:
+                    counts["read_errors"] += 1
+
+    def write_loop(write, offset: int, key: str):
+        n = offset
+        while time.perf_counter() < deadline:
+            db = Session()
+            try:
+                write(db, n)
+                ok = True
+            except exc.OperationalError:
+                db.rollback()
+                ok = False
+            finally:
+                db.close()
+            n += 1
+            with lock:
+                counts[key if ok else "write_errors"] += 1
+
+    def save_lineup(db, n: int):
+        user_id, day = f"u{n % args.users}", n % args.days + 1
+        db.execute(delete(DailyLineup).where(DailyLineup.user_id == user_id, DailyLineup.day == day))
+        db.execute(insert(DailyLineup), [
+            {"user_id": user_id, "day": day, "player_id": (n * 7 + k * 13) % (TEAMS * PLAYERS_PER_TEAM) + 1, "is_captain": k == 0}
+            for k in range(6)
+        ])
+        db.commit()
+
+    def score_day(db, n: int):
+        _calculate_day_scores(n % args.days + 1, db)
+
+    threads = [threading.Thread(target=reader) for _ in range(args.readers)]
+    threads += [threading.Thread(target=write_loop, args=(save_lineup, n, "writes")) for n in range(args.writers)]
+    threads += [threading.Thread(target=write_loop, args=(score_day, n, "scores")) for n in range(args.scorers)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+    engine.dispose()
+
+    read_latencies.sort()
+    p95 = read_latencies[int(len(read_latencies) * 0.95)] if read_latencies else 0.0
+    return {
+        "profile": "wal" if profile else "default",
+        "seconds": elapsed,
+        **counts,
+        "reads_per_s": counts["reads"] / elapsed,
+        "writes_per_s": counts["writes"] / elapsed,
+        "scores_per_s": counts["scores"] / elapsed,
+        "read_p95_ms": p95 * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare SQLite concurrency with and without the WAL profile.")
+    parser.add_argument("--users", type=int, default=100, help="League size")
+    parser.add_argument("--days", type=int, default=8, help="Championship days with stats and lineups")
+    parser.add_argument("--readers", type=int, default=8, help="Threads loading the standings")
+    parser.add_argument("--writers", type=int, default=4, help="Threads re-saving lineups")
+    parser.add_argument("--scorers", type=int, default=1, help="Threads recalculating day scores")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per run")
+    parser.add_argument("--json", help="Write both runs to this JSON file")
+    args = parser.parse_args()
+
+    print(f"Profile pragmas: {'; '.join(sqlite_pragmas())}\n")
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for profile in (False, True):
+            # Fresh copy of the league per run; journal_mode=WAL persists in the file
+            path = os.path.join(tmp, f"{'wal' if profile else 'default'}.db")
+            seed(create_engine(f"sqlite:///{path}"), args.users, args.days)
+            results.append(run(path, profile, args))
+
+    print(f"{'profile':<10}{'reads/s':>10}{'saves/s':>10}{'scores/s':>10}{'read p95 ms':>13}"
+          f"{'read errs':>11}{'write errs':>12}")
+    for r in results:
+        print(f"{r['profile']:<10}{r['reads_per_s']:>10.1f}{r['writes_per_s']:>10.1f}{r['scores_per_s']:>10.1f}"
+              f"{r['read_p95_ms']:>13.1f}{r['read_errors']:>11}{r['write_errors']:>12}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,386 @@
+"""
+Bulk import of a past season kept in Google Sheets into the fantasy database.
+
+Sources:
+  * lineups — the merged "Sestavy" sheet of the main spreadsheet (or, with
+    --owners, every owner's own "test" sheet), one row per owner and day;
+  * stats — the "Day N" worksheets written by app.py, one block of rows per match.
+
+Sheets are read with one metadata call and one values_batch_get for the main
+spreadsheet. Names are resolved through a single in-memory lookup table built
+from one players query, and every table is written with bulk INSERTs (after
+deleting the rows being replaced), so re-running the import is idempotent and no
+statement is issued per row.
+
+Day-sheet blocks are mapped to matches by the positions recorded in
+match_fingerprints.json when they are for this season's games, otherwise by
+order: within a day, app.py appended matches in kick-off order, each as home
+players followed by away players. The fingerprints file only describes the
+season it was written for, so it is read by default only when importing the
+current season; pass --fingerprints to use a saved copy for a past one.
+Matches themselves must exist; pass --schedule to sync them from a match_urls.csv
+first.
+
+Usage (CLI):
+    python legacy_import.py --year 2025 --schedule ../../match_urls_2025.csv
+    python legacy_import.py --year 2025 --owners --score
+"""
+import argparse
+import re
+import time
+import unicodedata
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+import scraper_bridge  # puts the repo root on sys.path
+from sqlalchemy import delete, insert, tuple_, update
+from app.database import SessionLocal
+from app.models import User, Player, Match, PlayerStat, DailyLineup
+from app.catalogue import bump_version
+from match_fingerprints import game_id_from_url
+
+# Sestavy columns that are not player picks
+META_COLUMNS = {"Owner", "Sestava", "Owner-Sestava", "Timestamp", "Časová značka"}
+DAY_COLUMNS = ("Day", "Den")
+CAPTAIN_COLUMNS = ("Captain", "Kapitán", "Kapitan")
+
+# Position strings found in rosters and on IIHF statistics pages
+POSITIONS = {
+    "GK": "Goalkeeper", "G": "Goalkeeper", "Goalkeeper": "Goalkeeper", "Goalie": "Goalkeeper",
+    "D": "Defender", "Defender": "Defender", "Defence": "Defender", "Defenceman": "Defender",
+    "F": "Forward", "Forward": "Forward",
+}
+
+_DAY_SHEET_RE = re.compile(r"^Day (\d+)$")
+
+
+def normalize_name(name) -> str:
+    """Case-, accent- and spacing-insensitive form of a player name; "(CAN)" suffixes are dropped."""
+    text = unicodedata.normalize("NFKD", str(name)).encode("ascii", "ignore").decode()
+    text = re.sub(r"\(.*?\)", " ", text)
+    return " ".join(text.casefold().split())
+
+
+class NameLookup:
+    """Player name -> id table; matches "Last First" and "First Last" spellings alike."""
+
+    def __init__(self, players=()):
+        self._ids = {}
+        for player_id, name in players:
+            self.add(player_id, name)
+
+    def add(self, player_id, name):
+        key = normalize_name(name)
+        self._ids.setdefault(key, player_id)
+        self._ids.setdefault(" ".join(reversed(key.split())), player_id)
+
+    def get(self, name):
+        return self._ids.get(normalize_name(name))
+
+
+def _day_number(value):
+    digits = re.search(r"\d+", str(value))
+    return int(digits.group()) if digits else None
+
+
+def _text(value) -> str:
+    return "" if value is None else str(value).strip()
+
+
+def _pad(row, width):
+    return list(row) + [""] * (width - len(row))
+
+
+# ── Parsing ───────────────────────────────────────────────────
+
+
+def parse_lineups(rows):
+    """
+    Sestavy rows (header first) -> {(owner, day): (player names, captain name)}.
+
+    The day comes from a Day/Den column, else from the digits of Sestava. When an
+    owner has several rows for one day the last one wins.
+    """
+    header = [_text(h) for h in rows[0]]
+    owner_col = header.index("Owner")
+    day_col = next((header.index(c) for c in DAY_COLUMNS if c in header), None)
+    if day_col is None:
+        day_col = header.index("Sestava")
+    captain_col = next((header.index(c) for c in CAPTAIN_COLUMNS if c in header), None)
+    skip = META_COLUMNS | set(DAY_COLUMNS) | set(CAPTAIN_COLUMNS)
+    player_cols = [i for i, h in enumerate(header) if h and h not in skip]
+
+    lineups = {}
+    for row in rows[1:]:
+        row = _pad(row, len(header))
+        owner, day = _text(row[owner_col]), _day_number(row[day_col])
+        if not owner or day is None:
+            continue
+        # Numeric cells are points or counters, not picks
+        names = [_text(row[i]) for i in player_cols
+                 if _text(row[i]) and not isinstance(row[i], (int, float))]
+        captain = _text(row[captain_col]) if captain_col is not None else ""
+        lineups[(owner, day)] = (names, captain or None)
+    return lineups
+
+
+def split_day_sheet(rows, positions=None):
+    """
+    Day N rows (header first) -> list of (game_id or None, [row dicts]) per match.
+
+    positions maps game id -> (start_row, row_count) in sheet coordinates, as kept
+    in match_fingerprints.json; without it the sheet is split wherever the Team
+    column goes from "away" back to "home".
+    """
+    header = [_text(h) for h in rows[0]]
+    records = [dict(zip(header, _pad(row, len(header)))) for row in rows[1:]]
+
+    if positions:
+        blocks = []
+        for game_id, (start_row, row_count) in sorted(positions.items(), key=lambda item: item[1][0]):
+            block = records[start_row - 2:start_row - 2 + row_count]
+            blocks.append((game_id, [r for r in block if _text(r.get("Player"))]))
+        return blocks
+
+    blocks, current, previous_team = [], [], None
+    for record in records:
+        if not _text(record.get("Player")):
+            continue
+        team = _text(record.get("Team"))
+        if current and previous_team == "away" and team == "home":
+            blocks.append((None, current))
+            current = []
+        current.append(record)
+        previous_team = team
+    if current:
+        blocks.append((None, current))
+    return blocks
+
+
+# ── Reading ───────────────────────────────────────────────────
+
+
+def read_main_spreadsheet(spreadsheet, lineups_sheet):
+    """Return (Sestavy rows, {day: Day N rows}) from one metadata and one values request."""
+    titles = [ws.title for ws in spreadsheet.worksheets()]
+    day_titles = [t for t in titles if _DAY_SHEET_RE.match(t)]
+    ranges = ([lineups_sheet] if lineups_sheet in titles else []) + day_titles
+    if not ranges:
+        return [], {}
+    response = spreadsheet.values_batch_get(
+        [f"'{t}'" for t in ranges], params={"valueRenderOption": "UNFORMATTED_VALUE"}
+    )
+    values = [vr.get("values", []) for vr in response.get("valueRanges", [])]
+    by_title = dict(zip(ranges, values))
+    day_sheets = {
+        int(_DAY_SHEET_RE.match(t).group(1)): by_title[t] for t in day_titles if by_title[t]
+    }
+    return by_title.get(lineups_sheet, []), day_sheets
+
+
+def read_owner_lineups():
+    """Sestavy-shaped rows built from every owner's sheet (fetched concurrently)."""
+    from download_sheets_data import download_sheet_data_with_errors
+
+    df, errors = download_sheet_data_with_errors()
+    if errors:
+        print(f"Skipped {len(errors)} owner spreadsheet(s): {', '.join(errors)}")
+    if df.empty:
+        return []
+    return [df.columns.tolist()] + df.fillna("").values.tolist()
+
+
+def fingerprint_positions(path):
+    """{day: {game_id: (start_row, row_count)}} from a match_fingerprints.json, if present."""
+    from match_fingerprints import FingerprintStore
+
+    if not Path(path).exists():
+        return {}
+    positions = {}
+    for game_id, entry in FingerprintStore(str(path)).entries.items():
+        match = _DAY_SHEET_RE.match(entry.get("worksheet") or "")
+        if match and entry.get("start_row") and entry.get("row_count"):
+            positions.setdefault(int(match.group(1)), {})[game_id] = (entry["start_row"], entry["row_count"])
+    return positions
+
+
+# ── Import ────────────────────────────────────────────────────
+
+
+def import_legacy(db, lineup_rows, day_sheets, positions=None, year: int | None = None) -> dict:
+    """
+    Write parsed legacy sheets into the database in one transaction.
+
+    lineup_rows are Sestavy rows (header first), day_sheets maps day -> Day N rows,
+    positions is fingerprint_positions() output. Users and players missing from
+    the database are created; lineups of the imported (owner, day) pairs and stats
+    of the imported matches replace what was there. Returns counts per table.
+    """
+    year = year or datetime.now().year
+    positions = positions or {}
+    summary = {"users": 0, "players": 0, "lineups": 0, "stats": 0, "matches": 0,
+               "unresolved_names": set(), "unmatched_blocks": 0, "days_split_by_order": []}
+
+    # One query each for the lookup tables
+    lookup = NameLookup(
+        db.query(Player.id, Player.name).filter(Player.championship_year == year).all()
+    )
+    users = dict(db.query(User.username, User.id).all())
+    matches_by_day = {}
+    for match in db.query(Match).order_by(Match.day, Match.match_time).all():
+        matches_by_day.setdefault(match.day, []).append(match)
+
+    # ── Stats: assign Day-sheet blocks to matches ──
+    assigned = []  # (match, team_side -> abbr, rows)
+    for day, rows in sorted(day_sheets.items()):
+        day_matches = matches_by_day.get(day, [])
+        by_game_id = {game_id_from_url(m.url_statistics): m for m in day_matches}
+        day_positions = positions.get(day)
+        if day_positions and not set(day_positions) <= set(by_game_id):
+            # Positions of other games (another season's file): split by team order instead
+            summary["days_split_by_order"].append(day)
+            day_positions = None
+        blocks = split_day_sheet(rows, day_positions)
+        for index, (game_id, block) in enumerate(blocks):
+            if game_id is not None:
+                match = by_game_id.get(game_id)
+            else:
+                match = day_matches[index] if index < len(day_matches) else None
+            if match is None:
+                summary["unmatched_blocks"] += 1
+                continue
+            assigned.append((match, {"home": match.home_team, "away": match.away_team}, block))
+
+    # Players that appear in stats but not in the roster import
+    new_players = {}
+    for match, teams, block in assigned:
+        for record in block:
+            name = _text(record["Player"])
+            if lookup.get(name) is None and normalize_name(name) not in new_players:
+                new_players[normalize_name(name)] = {
+                    "name": name,
+                    "position": POSITIONS.get(_text(record.get("Position")), "Forward"),
+                    "team_abbr": teams.get(_text(record.get("Team")), ""),
+                    "championship_year": year,
+                }
+    if new_players:
+        db.execute(insert(Player), list(new_players.values()))
+        names = [p["name"] for p in new_players.values()]
+        for player_id, name in db.query(Player.id, Player.name).filter(
+            Player.championship_year == year, Player.name.in_(names)
+        ):
+            lookup.add(player_id, name)
+        bump_version(db)
+        summary["players"] = len(new_players)
+
+    stats = {}
+    for match, _, block in assigned:
+        for record in block:
+            player_id = lookup.get(record["Player"])
+            if player_id is None:
+                continue
+            stats[(player_id, match.id)] = {
+                "player_id": player_id, "match_id": match.id, **scraper_bridge.stat_values(record),
+            }
+    match_ids = sorted({match.id for match, _, _ in assigned})
+    if match_ids:
+        db.execute(delete(PlayerStat).where(PlayerStat.match_id.in_(match_ids)))
+        db.execute(insert(PlayerStat), list(stats.values()))
+        db.execute(update(Match).where(Match.id.in_(match_ids)).values(status="completed"))
+    summary["stats"], summary["matches"] = len(stats), len(match_ids)
+
+    # ── Lineups ──
+    lineups = parse_lineups(lineup_rows) if lineup_rows else {}
+    new_users = [
+        {"id": str(uuid.uuid4()), "username": owner,
+         "email": f"{normalize_name(owner).replace(' ', '.')}@legacy.local", "password_hash": "!"}
+        for owner in sorted({owner for owner, _ in lineups} - set(users))
+    ]
+    if new_users:
+        db.execute(insert(User), new_users)
+        users.update({u["username"]: u["id"] for u in new_users})
+        summary["users"] = len(new_users)
+
+    lineup_rows_out = {}
+    for (owner, day), (names, captain) in lineups.items():
+        captain_id = lookup.get(captain) if captain else None
+        for name in names:
+            player_id = lookup.get(name)
+            if player_id is None:
+                summary["unresolved_names"].add(name)
+                continue
+            lineup_rows_out[(users[owner], day, player_id)] = {
+                "user_id": users[owner], "day": day, "player_id": player_id,
+                "is_captain": player_id == captain_id, "locked": True,
+            }
+    if lineups:
+        pairs = [(users[owner], day) for owner, day in lineups]
+        db.execute(delete(DailyLineup).where(tuple_(DailyLineup.user_id, DailyLineup.day).in_(pairs)))
+        if lineup_rows_out:
+            db.execute(insert(DailyLineup), list(lineup_rows_out.values()))
+    summary["lineups"] = len(lineup_rows_out)
+
+    db.commit()
+    return summary
+
+
+def main():
+    from config import SESTAVY_SHEET, MATCH_FINGERPRINTS_JSON
+    from sheets_client import main_spreadsheet
+
+    parser = argparse.ArgumentParser(description="Import a past season from Google Sheets into the database.")
+    parser.add_argument("--year", type=int, help="Championship year of the imported players (default: this year)")
+    parser.add_argument("--schedule", help="match_urls.csv of that season; synced into matches first")
+    parser.add_argument("--owners", action="store_true",
+                        help="Read lineups from every owner's sheet instead of the merged Sestavy sheet")
+    parser.add_argument("--fingerprints",
+                        help="match_fingerprints.json recording where each game was written "
+                             "(default: the current one, only when importing the current season)")
+    parser.add_argument("--score", action="store_true", help="Recalculate fantasy scores for the imported days")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    if args.schedule:
+        scraper_bridge.import_matches_to_db(Path(args.schedule))
+
+    lineup_rows, day_sheets = read_main_spreadsheet(main_spreadsheet(), SESTAVY_SHEET)
+    if args.owners:
+        lineup_rows = read_owner_lineups()
+    read_done = time.perf_counter()
+    print(f"Read {max(len(lineup_rows) - 1, 0)} lineup rows and {len(day_sheets)} Day sheets "
+          f"in {read_done - started:.1f}s")
+
+    fingerprints = args.fingerprints
+    if fingerprints is None and args.year in (None, datetime.now().year):
+        fingerprints = str(scraper_bridge.ROOT / MATCH_FINGERPRINTS_JSON)
+    positions = fingerprint_positions(fingerprints) if fingerprints else {}
+
+    db = SessionLocal()
+    try:
+        summary = import_legacy(db, lineup_rows, day_sheets, positions, args.year)
+        if args.score:
+            from app.routers.scores import _calculate_day_scores
+
+            for day in sorted(day_sheets):
+                _calculate_day_scores(day, db)
+    finally:
+        db.close()
+
+    print(
+        f"Imported {summary['users']} new users, {summary['players']} new players, "
+        f"{summary['lineups']} lineup picks, {summary['stats']} player stats "
+        f"for {summary['matches']} matches in {time.perf_counter() - read_done:.1f}s"
+    )
+    if summary["days_split_by_order"]:
+        print(f"  Recorded positions name games outside the schedule; split by team order for days "
+              f"{', '.join(map(str, summary['days_split_by_order']))}")
+    if summary["unmatched_blocks"]:
+        print(f"  {summary['unmatched_blocks']} Day-sheet blocks had no matching match (sync --schedule first)")
+    if summary["unresolved_names"]:
+        print(f"  {len(summary['unresolved_names'])} lineup names not found among players: "
+              f"{', '.join(sorted(summary['unresolved_names'])[:20])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Load test for the hot read/write endpoints of a running backend.
+
+Keeps --concurrency requests in flight for --duration seconds, cycling through
+/scores/standings, /players, /matches and (with --username) GET and POST
+/lineup/me, then prints throughput and latency percentiles per endpoint. Run it
+once against the default server and once with DB_ASYNC=1 to compare how many
+concurrent requests one worker sustains:
+
+Usage (CLI):
+    uvicorn app.main:app --port 8000                 # or: DB_ASYNC=1 uvicorn app.main:app --port 8000
+    python loadtest.py --url http://localhost:8000 --concurrency 200 --duration 30
+    python loadtest.py --username alice --password secret --day 1 --json sync.json
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import httpx
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def _login(client: httpx.AsyncClient, username: str, password: str) -> dict:
+    response = await client.post("/auth/login", data={"username": username, "password": password})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def _lineup_body(client: httpx.AsyncClient, headers: dict, day: int) -> dict | None:
+    """Re-save the user's current lineup, so POST /lineup/me is exercised without changing it."""
+    current = (await client.get("/lineup/me", params={"day": day}, headers=headers)).json()
+    if not current.get("lineup"):
+        return None
+    return {
+        "day": day,
+        "players": [{"player_id": e["player_id"], "is_captain": e["is_captain"]} for e in current["lineup"]],
+    }
+
+
+def _requests(day: int, headers: dict | None, lineup_body: dict | None) -> list[tuple[str, str, dict]]:
+    """(label, method, httpx kwargs) cycled by every worker."""
+    plan = [
+        ("GET /scores/standings", "GET", {"url": "/scores/standings"}),
+        ("GET /players", "GET", {"url": "/players", "params": {"day": day}}),
+        ("GET /matches", "GET", {"url": "/matches", "params": {"day": day}}),
+    ]
+    if headers:
+        plan.append(("GET /lineup/me", "GET", {"url": "/lineup/me", "params": {"day": day}, "headers": headers}))
+    if headers and lineup_body:
+        plan.append(("POST /lineup/me", "POST", {"url": "/lineup/me", "json": lineup_body, "headers": headers}))
+    return plan
+
+
+async def run(url: str, concurrency: int, duration: float, day: int,
+              username: str | None = None, password: str | None = None) -> dict:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+        headers = await _login(client, username, password) if username else None
+        lineup_body = await _lineup_body(client, headers, day) if headers else None
+        plan = _requests(day, headers, lineup_body)
+
+        latencies: dict[str, list[float]] = {label: [] for label, _, _ in plan}
+        errors: dict[str, int] = {label: 0 for label, _, _ in plan}
+        deadline = time.perf_counter() + duration
+
+        async def worker(offset: int):
+            i = offset
+            while time.perf_counter() < deadline:
+                label, method, kwargs = plan[i % len(plan)]
+                i += 1
+                started = time.perf_counter()
+                try:
+                    response = await client.request(method, **kwargs)
+                    ok = response.status_code < 400
+                except httpx.HTTPError:
+                    ok = False
+                if ok:
+                    latencies[label].append(time.perf_counter() - started)
+                else:
+                    errors[label] += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(n) for n in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    endpoints = {
+        label: {
+            "requests": len(values),
+            "errors": errors[label],
+            "rps": len(values) / elapsed,
+            "p50_ms": _percentile(values, 50) * 1000,
+            "p95_ms": _percentile(values, 95) * 1000,
+            "p99_ms": _percentile(values, 99) * 1000,
+            "mean_ms": statistics.fmean(values) * 1000 if values else 0.0,
+        }
+        for label, values in latencies.items()
+    }
+    total = sum(e["requests"] for e in endpoints.values())
+    return {
+        "url": url,
+        "concurrency": concurrency,
+        "seconds": elapsed,
+        "requests": total,
+        "errors": sum(errors.values()),
+        "rps": total / elapsed,
+        "endpoints": endpoints,
+    }
+
+
+def print_report(report: dict):
+    print(f"{report['url']}: {report['concurrency']} concurrent, {report['seconds']:.1f}s, "
+          f"{report['requests']} requests, {report['errors']} errors, {report['rps']:.1f} req/s\n")
+    print(f"{'endpoint':<24}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}")
+    for label, e in report["endpoints"].items():
+        print(f"{label:<24}{e['rps']:>9.1f}{e['p50_ms']:>9.1f}{e['p95_ms']:>9.1f}{e['p99_ms']:>9.1f}{e['errors']:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the backend's hot endpoints.")
+    parser.add_argument("--url", default="http://localhost:8000", help="Base URL of the running backend")
+    parser.add_argument("--concurrency", type=int, default=100, help="Requests kept in flight")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds to run")
+    parser.add_argument("--day", type=int, default=1, help="Championship day for players, matches and lineups")
+    parser.add_argument("--username", help="Log in as this user to include GET/POST /lineup/me")
+    parser.add_argument("--password", help="Password for --username")
+    parser.add_argument("--json", help="Write the report to this JSON file")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args.url, args.concurrency, args.duration, args.day, args.username, args.password))
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
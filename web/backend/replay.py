@@ -0,0 +1,262 @@
+"""
+Replay a whole championship through the real pipeline from archived or fixture pages.
+
+Stages: schedule → rosters → per-match stats → scoring → standings. Everything runs
+against a throwaway SQLite database with no network access; the tournament clock
+is advanced one championship day at a time without waiting. Each stage reports
+its wall time, DB query count and Python memory high-water mark, so the replay
+doubles as the benchmark for scraper_bridge, routers/scores.py and the parsers.
+
+Usage (CLI):
+    python replay.py --event 2025/wm --lineups lineups.json
+    python replay.py --event 2025/wm --lineups lineups.json --expect standings_2025.json
+    python replay.py --fixtures path/to/fixture_pages --lineups lineups.json --write-expected out.json
+
+The lineups file maps usernames to per-day picks:
+    {"alice": {"1": {"players": ["McDavid Connor", ...], "captain": "McDavid Connor"}}}
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+import pandas as pd
+import scraper_bridge  # puts the repo root on sys.path
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.database import Base
+from app.models import User, Player, Match, DailyLineup
+from app.routers.scores import _calculate_day_scores, standings_rows
+from url_scraper import parse_schedule
+from lineups_scraper import parse_teams_page, parse_team_page
+from match_stats_scraper import build_match_stats
+from match_fingerprints import game_id_from_url
+from page_archive import PageArchive, SCHEDULE, TEAMS, ROSTER, STATISTICS, PLAYBYPLAY
+
+
+class FixturePages:
+    """
+    Read-only page source laid out as plain files:
+        schedule.html, teams.html, roster/<ABBR>.html,
+        statistics/<game_id>.html, playbyplay/<game_id>.html
+    Offers the same latest(key, page_type) lookup as page_archive.PageArchive.
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+
+    def latest(self, key, page_type):
+        if page_type in (SCHEDULE, TEAMS):
+            path = self.directory / f"{page_type}.html"
+        else:
+            path = self.directory / page_type / f"{str(key).split(':')[-1]}.html"
+        return path.read_bytes() if path.exists() else None
+
+    def close(self):
+        pass
+
+
+class StageRecorder:
+    """Collects wall time, query count and memory peak per pipeline stage."""
+
+    def __init__(self, engine):
+        self.queries = 0
+        self.stages = []
+        event.listen(engine, "before_cursor_execute", self._count)
+
+    def _count(self, *args):
+        self.queries += 1
+
+    @contextmanager
+    def stage(self, name):
+        queries_before = self.queries
+        tracemalloc.reset_peak()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages.append({
+                "stage": name,
+                "seconds": round(time.perf_counter() - started, 4),
+                "queries": self.queries - queries_before,
+                "peak_mb": round(tracemalloc.get_traced_memory()[1] / 1e6, 2),
+            })
+
+    def print_summary(self):
+        print(f"\n{'stage':<12}{'seconds':>10}{'queries':>10}{'peak MB':>10}")
+        for s in self.stages:
+            print(f"{s['stage']:<12}{s['seconds']:>10.3f}{s['queries']:>10}{s['peak_mb']:>10.2f}")
+        total = sum(s["seconds"] for s in self.stages)
+        print(f"{'total':<12}{total:>10.3f}{sum(s['queries'] for s in self.stages):>10}")
+
+
+def _load_schedule(pages, event_key, Session):
+    html = pages.latest(event_key, SCHEDULE)
+    if html is None:
+        raise SystemExit(f"No schedule page archived for {event_key}")
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / "match_urls.csv"
+        parse_schedule(html).to_csv(csv_path, index=False)
+        scraper_bridge.import_matches_to_db(csv_path, session_factory=Session)
+
+
+def _load_rosters(pages, event_key, Session):
+    teams_df = parse_teams_page(pages.latest(event_key, TEAMS))
+    players = []
+    for team in teams_df.to_dict("records"):
+        html = pages.latest(f"{event_key}:{team['team_abbr']}", ROSTER)
+        if html is None:
+            print(f"  No roster archived for {team['team_abbr']}")
+            continue
+        players.extend(parse_team_page(html, team["country"], team["team_abbr"]))
+    db = Session()
+    try:
+        scraper_bridge.write_players(db, pd.DataFrame(players))
+    finally:
+        db.close()
+
+
+def _load_lineups(lineups, Session):
+    db = Session()
+    try:
+        players = {p.name: p.id for p in db.query(Player).all()}
+        for username, days in lineups.items():
+            user = User(username=username, email=f"{username}@replay.local", password_hash="!")
+            db.add(user)
+            db.flush()
+            for day, pick in days.items():
+                for name in pick["players"]:
+                    if name not in players:
+                        print(f"  {username} day {day}: unknown player {name!r}")
+                        continue
+                    db.add(DailyLineup(
+                        user_id=user.id,
+                        day=int(day),
+                        player_id=players[name],
+                        is_captain=(name == pick.get("captain")),
+                        locked=True,
+                    ))
+        db.commit()
+    finally:
+        db.close()
+
+
+def _ingest_day(pages, day, Session):
+    db = Session()
+    try:
+        for match in db.query(Match).filter(Match.day == day).order_by(Match.match_time).all():
+            game_id = game_id_from_url(match.url_statistics)
+            statistics_html = pages.latest(game_id, STATISTICS)
+            playbyplay_html = pages.latest(game_id, PLAYBYPLAY)
+            if statistics_html is None or playbyplay_html is None:
+                print(f"  Day {day}: game {game_id} not archived, skipped")
+                continue
+            scraper_bridge._write_match_stats(db, match, build_match_stats(statistics_html, playbyplay_html))
+    finally:
+        db.close()
+
+
+def replay(pages, event_key, lineups):
+    """Run the full pipeline; returns (standings as plain dicts, StageRecorder)."""
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    recorder = StageRecorder(engine)
+
+    tracemalloc.start()
+    try:
+        with recorder.stage("schedule"):
+            _load_schedule(pages, event_key, Session)
+        with recorder.stage("rosters"):
+            _load_rosters(pages, event_key, Session)
+        with recorder.stage("lineups"):
+            _load_lineups(lineups, Session)
+
+        db = Session()
+        days = [d for (d,) in db.query(Match.day).distinct().order_by(Match.day).all()]
+        db.close()
+
+        # Accelerated clock: every day's games are ingested first, then the days are scored in order
+        with recorder.stage("stats"):
+            for day in days:
+                _ingest_day(pages, day, Session)
+        with recorder.stage("scoring"):
+            db = Session()
+            try:
+                for day in days:
+                    _calculate_day_scores(day, db)
+            finally:
+                db.close()
+        with recorder.stage("standings"):
+            db = Session()
+            try:
+                standings = [
+                    {
+                        "rank": e["rank"],
+                        "username": e["username"],
+                        "total_points": round(e["total_points"], 2),
+                        "scores_by_day": {str(k): round(v, 2) for k, v in sorted(e["scores_by_day"].items())},
+                    }
+                    for e in standings_rows(db)
+                ]
+            finally:
+                db.close()
+    finally:
+        tracemalloc.stop()
+        engine.dispose()
+    return standings, recorder
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a championship from archived pages.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--event", help='Archived championship to replay, e.g. "2025/wm"')
+    source.add_argument("--fixtures", help="Directory of fixture pages (see FixturePages)")
+    parser.add_argument("--archive", help="Page archive directory (default: config.PAGE_ARCHIVE_DIR)")
+    parser.add_argument("--lineups", required=True, help="JSON file with user lineups per day")
+    parser.add_argument("--expect", help="Fail unless the final standings equal this JSON file")
+    parser.add_argument("--write-expected", help="Write the final standings to this JSON file")
+    parser.add_argument("--json", help="Write per-stage metrics to this JSON file")
+    args = parser.parse_args()
+
+    if args.fixtures:
+        pages, event_key = FixturePages(args.fixtures), "fixtures"
+    else:
+        pages, event_key = PageArchive(args.archive), args.event
+
+    with open(args.lineups, encoding="utf-8") as f:
+        lineups = json.load(f)
+
+    try:
+        standings, recorder = replay(pages, event_key, lineups)
+    finally:
+        pages.close()
+
+    for entry in standings:
+        print(f"{entry['rank']:>3}. {entry['username']:<20}{entry['total_points']:>8.1f}")
+    recorder.print_summary()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(recorder.stages, f, indent=2)
+    if args.write_expected:
+        with open(args.write_expected, "w", encoding="utf-8") as f:
+            json.dump(standings, f, indent=2, ensure_ascii=False)
+    if args.expect:
+        with open(args.expect, encoding="utf-8") as f:
+            expected = json.load(f)
+        if standings != expected:
+            print(f"\nStandings differ from {args.expect}")
+            sys.exit(1)
+        print(f"\nStandings match {args.expect}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,13 @@ Usage (CLI):
     python scraper_bridge.py players      # import players into DB
     python scraper_bridge.py matches      # import match schedule into DB
     python scraper_bridge.py stats <match_id>  # import stats for a match
+    python scraper_bridge.py ingest       # enqueue started matches and drain the ingest queue
+    python scraper_bridge.py jobs         # show ingest queue status
+    python scraper_bridge.py retry        # re-queue jobs that ran out of attempts
+    python scraper_bridge.py reparse      # rebuild all player stats from the page archive (offline)
+    python scraper_bridge.py score [day]  # recalculate fantasy scores (default: every day with a completed match)
 """
+import math
 import sys
 import os
 from pathlib import Path
@@ -17,6 +23,8 @@ sys.path.append(str(ROOT))  # append so web/backend/app/ takes priority over roo
 
 from app.database import SessionLocal
 from app.models import Player, Match, PlayerStat
+from app.catalogue import bump_version
+from app.live import SCORES
 
 
 def import_players_to_db():
@@ -38,104 +46,253 @@ def import_players_to_db():
 
     db = SessionLocal()
     try:
-        year = datetime.now().year
-        for _, row in df.iterrows():
-            existing = (
-                db.query(Player)
-                .filter(
-                    Player.name == row["name"],
-                    Player.team_abbr == row["team_abbr"],
-                    Player.championship_year == year,
-                )
-                .first()
-            )
-            if not existing:
-                # Map IIHF position strings to our canonical values
-                pos_map = {
-                    "Forward": "Forward",
-                    "Defender": "Defender",
-                    "Goalkeeper": "Goalkeeper",
-                    "Goalie": "Goalkeeper",
-                    "Defence": "Defender",
-                    "Defenceman": "Defender",
-                }
-                position = pos_map.get(row.get("position", "Forward"), "Forward")
-                db.add(Player(
-                    name=row["name"],
-                    position=position,
-                    team_abbr=row["team_abbr"],
-                    championship_year=year,
-                ))
-        db.commit()
+        write_players(db, df)
         print(f"Imported {len(df)} players into database")
     finally:
         db.close()
 
 
-def import_matches_to_db():
-    """Scrape the championship schedule and write to the matches table."""
+def write_players(db, df, year: int | None = None):
+    """Insert roster rows (name, position, team_abbr) that are not in the players table yet."""
+    year = year or datetime.now().year
+    added = 0
+    for _, row in df.iterrows():
+        existing = (
+            db.query(Player)
+            .filter(
+                Player.name == row["name"],
+                Player.team_abbr == row["team_abbr"],
+                Player.championship_year == year,
+            )
+            .first()
+        )
+        if not existing:
+            # Map IIHF position strings to our canonical values
+            pos_map = {
+                "Forward": "Forward",
+                "Defender": "Defender",
+                "Goalkeeper": "Goalkeeper",
+                "Goalie": "Goalkeeper",
+                "Defence": "Defender",
+                "Defenceman": "Defender",
+            }
+            position = pos_map.get(row.get("position", "Forward"), "Forward")
+            db.add(Player(
+                name=row["name"],
+                position=position,
+                team_abbr=row["team_abbr"],
+                championship_year=year,
+            ))
+            added += 1
+    if added:
+        bump_version(db)  # invalidates the cached /players catalogue
+    db.commit()
+
+
+# Shift all match dates forward so the tournament maps onto the current calendar.
+# 72 days: Dec 26, 2025 → Mar 8, 2026 (treat today as tournament Day 1).
+DATE_SHIFT_DAYS = 72
+
+# Match columns kept in sync with the schedule CSV
+_SCHEDULE_FIELDS = (
+    "day", "date", "match_time", "home_team", "away_team", "stage",
+    "url_playbyplay", "url_statistics",
+)
+
+
+def _schedule_key(game_id, home_team, away_team, day) -> str:
+    """Stable game id from the gamecenter URL; legacy rows without one fall back to teams+day."""
+    return game_id if isinstance(game_id, str) and game_id else f"{home_team}-{away_team}-{day}"
+
+
+def _cell(row, column):
+    """A CSV cell, with pandas' NaN for empty cells turned into None."""
+    value = row.get(column)
+    return None if isinstance(value, float) and math.isnan(value) else value
+
+
+def _match_values_from_row(row, year: int) -> dict:
+    """
+    Map one match_urls.csv row onto Match column values.
+
+    Raises ValueError when the row's Day, date or time can't be parsed.
+    """
+    # Parse date and time.
+    # For cross-year tournaments: months Oct–Dec belong to year-1.
+    date_str, time_str = _cell(row, "date"), _cell(row, "time")
+    if not isinstance(date_str, str) or not isinstance(time_str, str):
+        raise ValueError(f"missing date or time ({date_str!r} {time_str!r})")
+    month_num = datetime.strptime(date_str.split()[-1], "%b").month
+    row_year = year - 1 if month_num >= 10 else year
+    match_dt = datetime.strptime(f"{date_str} {time_str} {row_year}", "%d %b %H:%M %Y")
+    match_dt += timedelta(days=DATE_SHIFT_DAYS)
+    # Map IIHF phase to stage: PreliminaryRound → group, else playoff
+    phase = _cell(row, "phase") or "PreliminaryRound"
+    return {
+        "day": int(row["Day"]),
+        "date": match_dt.date(),
+        "match_time": match_dt,
+        "home_team": row["home_team"],
+        "away_team": row["away_team"],
+        "stage": "group" if phase == "PreliminaryRound" else "playoff",
+        "url_playbyplay": _cell(row, "url_playbyplay"),
+        "url_statistics": _cell(row, "url_statistics"),
+    }
+
+
+def diff_matches(existing: dict[str, dict], scheduled: dict[str, dict]):
+    """
+    Diff DB matches against the schedule, both keyed by _schedule_key.
+
+    `existing` values must carry the Match id under "id". Returns
+    (to_insert, to_update, to_delete_ids); to_update rows include "id" so they
+    can be applied with a single bulk UPDATE by primary key.
+    """
+    to_insert = [values for key, values in scheduled.items() if key not in existing]
+    to_update = [
+        {"id": existing[key]["id"], **values}
+        for key, values in scheduled.items()
+        if key in existing
+        and any(existing[key][f] != values[f] for f in _SCHEDULE_FIELDS)
+    ]
+    to_delete_ids = [row["id"] for key, row in existing.items() if key not in scheduled]
+    return to_insert, to_update, to_delete_ids
+
+
+def import_matches_to_db(csv_path: Path = ROOT / "match_urls.csv", session_factory=None):
+    """
+    Sync the matches table with match_urls.csv (written by url_scraper.py).
+
+    Only games that were added, changed or removed since the last sync are written,
+    each kind in one bulk statement. Removed games are only deleted while they are
+    still upcoming and have no stats or ingest job. session_factory selects another
+    database (replay.py); default is the app's SessionLocal.
+    """
     import pandas as pd
-    import subprocess
-    import importlib.util
-    import os
-
-    # Run url_scraper to generate match_urls.csv
-    spec = importlib.util.spec_from_file_location("url_scraper", ROOT / "url_scraper.py")
-    # Just import the CSV that url_scraper generates
-    csv_path = ROOT / "match_urls.csv"
-    if not csv_path.exists():
-        print("match_urls.csv not found — run url_scraper.py first")
+    from sqlalchemy import insert, update, delete
+    from app.models import IngestJob
+    from match_fingerprints import game_id_from_url
+
+    if not Path(csv_path).exists():
+        print(f"{Path(csv_path).name} not found — run url_scraper.py first")
         return
 
-    df = pd.read_csv(csv_path)
-    db = SessionLocal()
-    # Shift all match dates forward so the tournament maps onto the current calendar.
-    # 72 days: Dec 26, 2025 → Mar 8, 2026 (treat today as tournament Day 1).
-    DATE_SHIFT_DAYS = 72
+    df = pd.read_csv(csv_path, dtype={"game_id": str})
+    if "game_id" not in df.columns:
+        df["game_id"] = df["url_playbyplay"].apply(game_id_from_url)
+
+    year = datetime.now().year
+    scheduled, skipped = {}, set()
+    for row in df.to_dict("records"):
+        key = _schedule_key(_cell(row, "game_id"), row["home_team"], row["away_team"], row["Day"])
+        try:
+            scheduled[key] = _match_values_from_row(row, year)
+        except (ValueError, IndexError) as e:
+            # Leave the game as it is rather than store it with a made-up kickoff time
+            print(f"Skipping schedule row {key}: {e}")
+            skipped.add(key)
+
+    db = (session_factory or SessionLocal)()
     try:
-        year = datetime.now().year
-        for _, row in df.iterrows():
-            existing = db.query(Match).filter(
-                Match.home_team == row["home_team"],
-                Match.away_team == row["away_team"],
-                Match.day == row["Day"],
-            ).first()
-            if not existing:
-                # Parse date and time.
-                # For cross-year tournaments: months Oct–Dec belong to year-1.
-                try:
-                    month_num = datetime.strptime(row["date"].split()[-1], "%b").month
-                    row_year = year - 1 if month_num >= 10 else year
-                    match_dt = datetime.strptime(
-                        f"{row['date']} {row['time']} {row_year}", "%d %b %H:%M %Y"
-                    )
-                    match_dt += timedelta(days=DATE_SHIFT_DAYS)
-                except Exception:
-                    match_dt = datetime.now()
-                # Map IIHF phase to stage: PreliminaryRound → group, else playoff
-                phase = row.get("phase", "PreliminaryRound")
-                stage = "group" if phase == "PreliminaryRound" else "playoff"
-                db.add(Match(
-                    day=int(row["Day"]),
-                    date=match_dt.date(),
-                    match_time=match_dt,
-                    home_team=row["home_team"],
-                    away_team=row["away_team"],
-                    status="upcoming",
-                    stage=stage,
-                    url_playbyplay=row.get("url_playbyplay"),
-                    url_statistics=row.get("url_statistics"),
-                ))
+        existing = {}
+        for row in db.query(Match.id, *(getattr(Match, f) for f in _SCHEDULE_FIELDS)).all():
+            values = row._asdict()
+            key = _schedule_key(
+                game_id_from_url(values["url_playbyplay"]) if values["url_playbyplay"] else None,
+                values["home_team"], values["away_team"], values["day"],
+            )
+            if key not in skipped:  # a row we couldn't parse is not a removed game
+                existing[key] = values
+
+        to_insert, to_update, to_delete_ids = diff_matches(existing, scheduled)
+
+        if to_insert:
+            db.execute(insert(Match), [{**values, "status": "upcoming"} for values in to_insert])
+        if to_update:
+            db.execute(update(Match), to_update)
+        deleted = 0
+        if to_delete_ids:
+            has_stats = db.query(PlayerStat.match_id).filter(PlayerStat.match_id == Match.id).exists()
+            has_job = db.query(IngestJob.match_id).filter(IngestJob.match_id == Match.id).exists()
+            deleted = db.execute(
+                delete(Match)
+                .where(Match.id.in_(to_delete_ids), Match.status == "upcoming", ~has_stats, ~has_job)
+                .execution_options(synchronize_session=False)
+            ).rowcount
         db.commit()
-        print(f"Imported {len(df)} matches into database")
+        print(
+            f"Synced {len(scheduled)} scheduled matches: {len(to_insert)} added, "
+            f"{len(to_update)} changed, {deleted} removed"
+        )
+        return len(to_insert), len(to_update), deleted
     finally:
         db.close()
 
 
-def import_match_stats_to_db(match_id: int):
-    """Scrape stats for a completed match and write to player_stats table."""
+def _scrape_match_stats(match: Match):
     from match_stats_scraper import extract_all_stats
 
+    return extract_all_stats(match.url_playbyplay, match.url_statistics)
+
+
+# PlayerStat column -> stats DataFrame column (as produced by build_match_stats)
+STAT_COLUMNS = {
+    "goals": "Goals",
+    "assists": "Assists",
+    "ppg": "Power Play Goal",
+    "shg": "Shorthanded Goal",
+    "gwg": "Game Winning Goal",
+    "pim": "Penalty Minutes",
+    "plus_minus": "Plus Minus",
+    "saves": "Saves",
+    "goals_against": "Goals Against",
+}
+
+
+def stat_values(row) -> dict:
+    """PlayerStat column values from one stats row (dict or Series); blanks count as 0."""
+    values = {
+        field: int(float(row.get(column, 0) or 0)) for field, column in STAT_COLUMNS.items()
+    }
+    values["win"] = bool(int(float(row.get("Win", 0) or 0)))
+    return values
+
+
+def _write_match_stats(db, match: Match, df):
+    """Upsert PlayerStat rows for `match` from a parsed stats DataFrame."""
+    year = datetime.now().year
+
+    for _, row in df.iterrows():
+        player = (
+            db.query(Player)
+            .filter(
+                Player.name == row["Player"],
+                Player.championship_year == year,
+            )
+            .first()
+        )
+        if not player:
+            continue
+
+        existing = (
+            db.query(PlayerStat)
+            .filter(PlayerStat.player_id == player.id, PlayerStat.match_id == match.id)
+            .first()
+        )
+        values = stat_values(row)
+        if existing:
+            for field, value in values.items():
+                setattr(existing, field, value)
+        else:
+            db.add(PlayerStat(player_id=player.id, match_id=match.id, **values))
+
+    match.status = "completed"
+    bump_version(db, SCORES)  # /live/scores watchers pick the change up on their next poll
+    db.commit()
+
+
+def import_match_stats_to_db(match_id: int):
+    """Scrape stats for a completed match and write to player_stats table."""
     db = SessionLocal()
     try:
         match = db.query(Match).filter(Match.id == match_id).first()
@@ -146,64 +303,156 @@ def import_match_stats_to_db(match_id: int):
             print(f"Match {match_id} has no statistics URL")
             return
 
-        df = extract_all_stats(match.url_playbyplay, match.url_statistics)
-        year = datetime.now().year
-
-        for _, row in df.iterrows():
-            player = (
-                db.query(Player)
-                .filter(
-                    Player.name == row["Player"],
-                    Player.championship_year == year,
-                )
-                .first()
-            )
-            if not player:
-                continue
+        from match_fingerprints import fingerprint_stats
+        from app.models import IngestJob
 
-            existing = (
-                db.query(PlayerStat)
-                .filter(PlayerStat.player_id == player.id, PlayerStat.match_id == match.id)
-                .first()
-            )
-            win = bool(row.get("Win", 0))
-            if existing:
-                existing.goals = int(row.get("Goals", 0))
-                existing.assists = int(row.get("Assists", 0))
-                existing.ppg = int(row.get("Power Play Goal", 0))
-                existing.shg = int(row.get("Shorthanded Goal", 0))
-                existing.gwg = int(row.get("Game Winning Goal", 0))
-                existing.pim = int(row.get("Penalty Minutes", 0))
-                existing.plus_minus = int(row.get("Plus Minus", 0))
-                existing.saves = int(row.get("Saves", 0))
-                existing.goals_against = int(row.get("Goals Against", 0))
-                existing.win = win
-            else:
-                db.add(PlayerStat(
-                    player_id=player.id,
-                    match_id=match.id,
-                    goals=int(row.get("Goals", 0)),
-                    assists=int(row.get("Assists", 0)),
-                    ppg=int(row.get("Power Play Goal", 0)),
-                    shg=int(row.get("Shorthanded Goal", 0)),
-                    gwg=int(row.get("Game Winning Goal", 0)),
-                    pim=int(row.get("Penalty Minutes", 0)),
-                    plus_minus=int(row.get("Plus Minus", 0)),
-                    saves=int(row.get("Saves", 0)),
-                    goals_against=int(row.get("Goals Against", 0)),
-                    win=win,
-                ))
-
-        match.status = "completed"
-        db.commit()
+        df = _scrape_match_stats(match)
+        content_hash = fingerprint_stats(df)
+        job = db.query(IngestJob).filter(IngestJob.match_id == match.id).first()
+        if job and job.content_hash == content_hash:
+            print(f"Stats for match {match_id} unchanged, skipping")
+            return
+        _write_match_stats(db, match, df)
+        if job:
+            job.content_hash = content_hash
+            db.commit()
         print(f"Imported stats for match {match_id}")
     finally:
         db.close()
 
 
+def reparse_all_from_archive():
+    """
+    Rebuild PlayerStat rows for every match from the raw page archive.
+
+    Uses the latest archived statistics and play-by-play pages of each game, so a
+    parser fix can be applied to the whole tournament without touching iihf.com.
+    """
+    import time
+    from match_stats_scraper import build_match_stats
+    from match_fingerprints import game_id_from_url
+    from page_archive import PageArchive, STATISTICS, PLAYBYPLAY
+
+    archive = PageArchive()
+    db = SessionLocal()
+    rebuilt = missing = failed = 0
+    started = time.perf_counter()
+    try:
+        matches = db.query(Match).filter(Match.url_statistics.isnot(None)).order_by(Match.day).all()
+        for match in matches:
+            game_id = game_id_from_url(match.url_statistics)
+            statistics_html = archive.latest(game_id, STATISTICS)
+            playbyplay_html = archive.latest(game_id, PLAYBYPLAY)
+            if statistics_html is None or playbyplay_html is None:
+                missing += 1
+                continue
+            try:
+                _write_match_stats(db, match, build_match_stats(statistics_html, playbyplay_html))
+                rebuilt += 1
+            except Exception as e:
+                db.rollback()
+                failed += 1
+                print(f"Match {match.id} ({game_id}): reparse failed: {e}")
+        elapsed = time.perf_counter() - started
+        print(
+            f"Reparsed {rebuilt} matches from archive in {elapsed:.1f}s "
+            f"({missing} not archived, {failed} failed)"
+        )
+    finally:
+        db.close()
+        archive.close()
+
+
+def run_ingest_worker(max_jobs: int | None = None):
+    """
+    Drain the ingest_jobs queue.
+
+    Every started match gets a job; each job is claimed atomically, scraped and
+    written only if its content hash changed. Failures are retried with backoff,
+    so a match missed during an outage is caught up on the next run.
+    """
+    import time
+    from match_fingerprints import fingerprint_stats
+    from app.ingest import (
+        enqueue_started_matches, claim_next_job, complete_job, fail_job,
+        queue_stats, default_worker_id,
+    )
+
+    worker_id = default_worker_id()
+    db = SessionLocal()
+    processed = written = failed = 0
+    started = time.perf_counter()
+    try:
+        created = enqueue_started_matches(db)
+        print(f"Enqueued {created} new ingest jobs")
+        while max_jobs is None or processed < max_jobs:
+            job = claim_next_job(db, worker_id)
+            if job is None:
+                break
+            processed += 1
+            match = job.match
+            try:
+                df = _scrape_match_stats(match)
+                content_hash = fingerprint_stats(df)
+                if content_hash != job.content_hash:
+                    _write_match_stats(db, match, df)
+                    written += 1
+                    print(f"Match {match.id}: stats written")
+                else:
+                    print(f"Match {match.id}: unchanged, skipped")
+                complete_job(db, job, content_hash, has_stats=not df.empty)
+            except Exception as e:
+                db.rollback()
+                fail_job(db, job, f"{type(e).__name__}: {e}")
+                failed += 1
+                print(f"Match {match.id}: failed (attempt {job.attempts}): {e}")
+
+        elapsed = time.perf_counter() - started
+        rate = processed / elapsed * 60 if elapsed > 0 else 0.0
+        print(
+            f"Processed {processed} jobs in {elapsed:.1f}s ({rate:.1f} jobs/min): "
+            f"{written} written, {processed - written - failed} unchanged, {failed} failed"
+        )
+        print(f"Queue: {queue_stats(db)}")
+    finally:
+        db.close()
+
+
+def recalculate_scores(day: int | None = None):
+    """Recalculate user day scores for one day, or for every day with a completed match."""
+    from app.routers.scores import _calculate_day_scores
+
+    db = SessionLocal()
+    try:
+        if day is None:
+            days = sorted(d for (d,) in db.query(Match.day).filter(Match.status == "completed").distinct())
+        else:
+            days = [day]
+        for d in days:
+            _calculate_day_scores(d, db)
+            print(f"Scores calculated for day {d}")
+    finally:
+        db.close()
+    return days
+
+
+def print_ingest_status():
+    from app.ingest import queue_stats
+
+    db = SessionLocal()
+    try:
+        stats = queue_stats(db)
+    finally:
+        db.close()
+    for state, count in stats["by_state"].items():
+        print(f"{state:>10}: {count}")
+    print(f"{'lag':>10}: {stats['lag_seconds']:.0f}s")
+    print(f"{'done (1h)':>10}: {stats['done_last_hour']}")
+
+
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        print("Usage: python scraper_bridge.py [players|matches|stats <match_id>]")
+        print("Usage: python scraper_bridge.py [players|matches|stats <match_id>|ingest|jobs|retry|reparse|score [day]]")
         sys.exit(1)
 
     command = sys.argv[1]
@@ -213,6 +462,21 @@ if __name__ == "__main__":
         import_matches_to_db()
     elif command == "stats" and len(sys.argv) >= 3:
         import_match_stats_to_db(int(sys.argv[2]))
+    elif command == "ingest":
+        run_ingest_worker()
+    elif command == "jobs":
+        print_ingest_status()
+    elif command == "reparse":
+        reparse_all_from_archive()
+    elif command == "score":
+        recalculate_scores(int(sys.argv[2]) if len(sys.argv) >= 3 else None)
+    elif command == "retry":
+        from app.ingest import retry_failed_jobs
+        db = SessionLocal()
+        try:
+            print(f"Re-queued {retry_failed_jobs(db)} failed jobs")
+        finally:
+            db.close()
     else:
         print("Unknown command")
         sys.exit(1)
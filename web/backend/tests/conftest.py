@@ -10,6 +10,7 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 from app.database import Base, get_db
 from app.main import app
+from app.catalogue import clear_cache
 
 SQLALCHEMY_TEST_DATABASE_URL = "sqlite:///:memory:"
 
@@ -44,6 +45,7 @@ def client(db):
 
     app.dependency_overrides[get_db] = override_get_db
     with TestClient(app) as test_client:
+        clear_cache()  # startup built it from the app database; versions restart with every test DB
         yield test_client
     app.dependency_overrides.clear()
 
@@ -0,0 +1,126 @@
+"""
+Tests for the async twins of the hot endpoints (DB_ASYNC=1).
+
+The app here mounts only the async routers plus /auth, on a file SQLite database
+reached through aiosqlite, so every hot request really goes through AsyncSession.
+"""
+
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+from app.database import Base, get_db, get_async_db, _async_url, _async_connect_args
+from app.models import Player, Match
+from app.catalogue import clear_cache
+from app.routers import auth, players, matches, lineup, scores, dashboard
+
+
+@pytest.fixture()
+def async_app(tmp_path):
+    url = f"sqlite:///{tmp_path / 'async.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    # NullPool: no aiosqlite connection outlives the TestClient event loop
+    async_engine = create_async_engine(_async_url(url), poolclass=NullPool)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    def override_get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_get_async_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    api = FastAPI()
+    for module in (players, matches, lineup, scores, dashboard):
+        api.include_router(module.async_router)
+    api.include_router(auth.router)
+    api.dependency_overrides[get_db] = override_get_db
+    api.dependency_overrides[get_async_db] = override_get_async_db
+
+    seed = SessionLocal()
+    started = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(hours=1)
+    seed.add(Match(day=1, date=date.today(), match_time=started, home_team="CAN", away_team="USA"))
+    for i, position in enumerate(["Forward"] * 3 + ["Defender"] * 2 + ["Goalkeeper"] * 2):
+        seed.add(Player(name=f"P{i}", position=position, team_abbr="FIN", championship_year=2026))
+    seed.add(Player(name="Locked", position="Forward", team_abbr="CAN", championship_year=2026))
+    seed.commit()
+    seed.close()
+    clear_cache()
+
+    with TestClient(api) as client:
+        client.post("/auth/signup", json={"username": "u", "email": "u@test.com", "password": "pw"})
+        token = client.post("/auth/login", data={"username": "u", "password": "pw"}).json()["access_token"]
+        client.headers["Authorization"] = f"Bearer {token}"
+        yield client
+    engine.dispose()
+
+
+def test_async_url_keeps_database_and_swaps_driver():
+    assert _async_url("sqlite:///./fantasy_hockey.db") == "sqlite+aiosqlite:///./fantasy_hockey.db"
+    assert _async_url("postgresql://u:p@host/db") == "postgresql+asyncpg://u:p@host/db"
+    assert _async_url("postgresql+psycopg2://u:p@host/db") == "postgresql+asyncpg://u:p@host/db"
+
+
+def test_async_url_moves_libpq_ssl_params_to_connect_args():
+    url = "postgresql://u:p@host/db?sslmode=require&prepared_statement_cache_size=0&application_name=iihf"
+    assert _async_url(url) == "postgresql+asyncpg://u:p@host/db?prepared_statement_cache_size=0"
+    assert _async_connect_args(url) == {"ssl": "require", "server_settings": {"application_name": "iihf"}}
+    assert _async_url("postgresql://u:p@host/db?sslmode=require") == "postgresql+asyncpg://u:p@host/db"
+
+    assert _async_connect_args("postgresql://u:p@host/db?sslmode=require") == {"ssl": "require"}
+    assert _async_connect_args("postgresql://u:p@host/db?sslmode=disable") == {"ssl": False}
+    assert _async_connect_args("postgresql://u:p@host/db") == {}
+    assert _async_connect_args("sqlite:///./fantasy_hockey.db") == {}
+
+
+def test_async_players_and_matches(async_app):
+    players_out = async_app.get("/players", params={"day": 1}).json()
+    assert len(players_out) == 8
+    assert {p["name"] for p in players_out if p["is_locked"]} == {"Locked"}
+    assert [p["name"] for p in async_app.get("/players", params={"position": "Goalkeeper"}).json()] == ["P5", "P6"]
+
+    assert [m["home_team"] for m in async_app.get("/matches", params={"day": 1}).json()] == ["CAN"]
+    assert len(async_app.get("/matches/today").json()) == 1
+
+
+def test_async_lineup_round_trip_and_standings(async_app):
+    ids = [p["id"] for p in async_app.get("/players").json() if p["name"] != "Locked"][:6]
+    body = {"day": 1, "players": [{"player_id": pid, "is_captain": i == 0} for i, pid in enumerate(ids)]}
+
+    saved = async_app.post("/lineup/me", json=body)
+    assert saved.status_code == 200, saved.text
+    lineup_out = async_app.get("/lineup/me", params={"day": 1}).json()
+    assert sorted(e["player_id"] for e in lineup_out["lineup"]) == sorted(ids)
+    assert [e["player_id"] for e in lineup_out["lineup"] if e["is_captain"]] == [ids[0]]
+
+    standings = async_app.get("/scores/standings").json()
+    assert [(s["rank"], s["username"], s["total_points"]) for s in standings] == [(1, "u", 0.0)]
+
+    dashboard_out = async_app.get("/dashboard").json()
+    assert dashboard_out["day"] == 1 and dashboard_out["locked_teams"] == ["CAN", "USA"]
+    assert sorted(e["player_id"] for e in dashboard_out["lineup"]) == sorted(ids)
+
+
+def test_async_lineup_validation_errors(async_app):
+    by_name = {p["name"]: p["id"] for p in async_app.get("/players").json()}
+
+    two_goalies = {"day": 1, "players": [{"player_id": by_name["P5"]}, {"player_id": by_name["P6"]}]}
+    response = async_app.post("/lineup/me", json=two_goalies)
+    assert response.status_code == 422
+    assert "Goalkeeper" in response.json()["detail"]
+
+    locked = {"day": 1, "players": [{"player_id": by_name["Locked"]}]}
+    assert async_app.post("/lineup/me", json=locked).status_code == 422
+
+    assert async_app.get("/lineup/me", params={"day": 1}, headers={"Authorization": "Bearer bad"}).status_code == 401
@@ -87,3 +87,90 @@ class TestGetMe:
         """GET /auth/me without any JWT returns 401."""
         response = client.get("/auth/me")
         assert response.status_code == 401
+
+
+class TestAuthCaches:
+    @pytest.fixture(autouse=True)
+    def _fresh_caches(self):
+        from app.auth import clear_auth_caches
+        clear_auth_caches()
+        yield
+        clear_auth_caches()
+
+    def test_repeat_requests_skip_user_query(self, client, db, auth_headers):
+        """Only the first authenticated request loads the user from the DB."""
+        from sqlalchemy import event
+
+        user_queries = []
+
+        def count(conn, cursor, statement, *args):
+            if "FROM users" in statement:
+                user_queries.append(statement)
+
+        event.listen(db.get_bind(), "before_cursor_execute", count)
+        try:
+            for _ in range(3):
+                assert client.get("/auth/me", headers=auth_headers).status_code == 200
+        finally:
+            event.remove(db.get_bind(), "before_cursor_execute", count)
+        assert len(user_queries) == 1
+
+    def test_user_update_invalidates_cache(self, client, db, auth_headers):
+        """Changing the user through the ORM is visible on the next request."""
+        from app.models import User
+
+        assert client.get("/auth/me", headers=auth_headers).json()["email"] == "test@test.com"
+        user = db.query(User).filter(User.username == "testuser").one()
+        user.email = "changed@test.com"
+        db.commit()
+        assert client.get("/auth/me", headers=auth_headers).json()["email"] == "changed@test.com"
+
+    def test_deleted_user_is_rejected(self, client, db, auth_headers):
+        from app.models import User
+
+        assert client.get("/auth/me", headers=auth_headers).status_code == 200
+        db.delete(db.query(User).filter(User.username == "testuser").one())
+        db.commit()
+        assert client.get("/auth/me", headers=auth_headers).status_code == 401
+
+    def test_cached_token_still_expires(self, client, auth_headers, monkeypatch):
+        """A decoded token stays cached only until its exp claim."""
+        import time as time_module
+
+        assert client.get("/auth/me", headers=auth_headers).status_code == 200
+        later = time_module.time() + 31 * 24 * 3600
+        monkeypatch.setattr("app.auth.time.time", lambda: later)
+        assert client.get("/auth/me", headers=auth_headers).status_code == 401
+
+
+class TestPasswordHashing:
+    def test_login_rehashes_when_rounds_change(self, client, db, test_user, monkeypatch):
+        from passlib.context import CryptContext
+        from app import auth
+        from app.models import User
+
+        old_hash = db.query(User).filter(User.username == "testuser").one().password_hash
+        monkeypatch.setattr(auth, "pwd_context", CryptContext(schemes=["bcrypt"], bcrypt__rounds=4))
+
+        response = client.post("/auth/login", data={"username": "testuser", "password": "password123"})
+        assert response.status_code == 200
+        db.expire_all()
+        new_hash = db.query(User).filter(User.username == "testuser").one().password_hash
+        assert new_hash != old_hash and new_hash.startswith("$2b$04$")
+
+        # The new hash is current, so the next login leaves it alone
+        client.post("/auth/login", data={"username": "testuser", "password": "password123"})
+        db.expire_all()
+        assert db.query(User).filter(User.username == "testuser").one().password_hash == new_hash
+
+    def test_full_hash_queue_returns_503(self, client, test_user, monkeypatch):
+        from app import auth
+
+        monkeypatch.setattr(auth, "HASH_QUEUE_LIMIT", 0)
+        monkeypatch.setattr(auth, "_hash_pending", auth.HASH_WORKERS)
+        rejected = auth.HASH_REJECTED.get()
+
+        response = client.post("/auth/login", data={"username": "testuser", "password": "password123"})
+        assert response.status_code == 503
+        assert response.headers["retry-after"]
+        assert auth.HASH_REJECTED.get() == rejected + 1
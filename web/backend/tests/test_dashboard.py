@@ -0,0 +1,89 @@
+"""
+Tests for GET /dashboard: today's matches, lineup lock flags, remaining usages
+and countdown data in one response.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from app.models import DailyLineup, Match, Player, User
+
+
+def _now():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _seed(db):
+    user_id = db.query(User.id).filter(User.username == "testuser").scalar()
+    now = _now()
+    players = {
+        name: Player(name=name, position=position, team_abbr=team, championship_year=2026)
+        for name, position, team in [
+            ("Ann", "Forward", "CAN"), ("Bob", "Defender", "FIN"), ("Cid", "Goalkeeper", "SWE"),
+        ]
+    }
+    db.add_all(players.values())
+    today, yesterday = now.date(), now.date() - timedelta(days=1)
+    db.add_all([
+        Match(day=1, date=yesterday, match_time=now - timedelta(days=1), home_team="CAN", away_team="FIN"),
+        Match(day=2, date=today, match_time=now - timedelta(minutes=30), home_team="CAN", away_team="USA"),
+        Match(day=2, date=today, match_time=now + timedelta(hours=2), home_team="FIN", away_team="SWE"),
+        Match(day=2, date=today, match_time=now + timedelta(hours=5), home_team="CZE", away_team="SVK"),
+    ])
+    db.flush()
+    db.add_all([
+        DailyLineup(user_id=user_id, day=1, player_id=players["Ann"].id, is_captain=False),
+        DailyLineup(user_id=user_id, day=1, player_id=players["Bob"].id, is_captain=True),
+        DailyLineup(user_id=user_id, day=2, player_id=players["Ann"].id, is_captain=True),
+        DailyLineup(user_id=user_id, day=2, player_id=players["Cid"].id, is_captain=False),
+    ])
+    db.commit()
+    return {name: p.id for name, p in players.items()}
+
+
+def test_dashboard_requires_auth(client):
+    assert client.get("/dashboard").status_code == 401
+
+
+def test_dashboard_bundles_matches_lineup_and_countdown(client, db, auth_headers):
+    ids = _seed(db)
+    data = client.get("/dashboard", headers=auth_headers).json()
+
+    assert data["day"] == 2
+    assert [(m["home_team"], m["away_team"]) for m in data["matches"]] == [
+        ("CAN", "USA"), ("FIN", "SWE"), ("CZE", "SVK"),
+    ]
+    assert data["locked_teams"] == ["CAN", "USA"]
+    assert data["next_lock_at"] > data["server_time"]
+
+    lineup = {e["player"]["name"]: e for e in data["lineup"]}
+    assert set(lineup) == {"Ann", "Cid"}
+    assert lineup["Ann"]["locked"] is True and lineup["Ann"]["player"]["is_locked"] is True
+    assert lineup["Ann"]["is_captain"] is True
+    assert lineup["Cid"]["locked"] is False
+    assert lineup["Cid"]["player_id"] == ids["Cid"]
+
+
+def test_dashboard_usages_count_prior_days_only(client, db, auth_headers):
+    ids = _seed(db)
+    usages = {u["player_id"]: u for u in client.get("/dashboard", headers=auth_headers).json()["usages"]}
+
+    assert usages[ids["Ann"]] == {"player_id": ids["Ann"], "stage": "group", "used": 1, "limit": 3, "remaining": 2}
+    assert usages[ids["Bob"]]["used"] == 1
+    assert usages[ids["Cid"]]["used"] == 0
+
+
+def test_dashboard_explicit_day(client, db, auth_headers):
+    _seed(db)
+    data = client.get("/dashboard", params={"day": 1}, headers=auth_headers).json()
+
+    assert data["day"] == 1
+    assert len(data["matches"]) == 3  # still today's matches
+    assert data["locked_teams"] == ["CAN", "FIN"]
+    assert data["next_lock_at"] is None
+    assert {e["player"]["name"]: e["locked"] for e in data["lineup"]} == {"Ann": True, "Bob": True}
+
+
+def test_dashboard_without_matches_today_defaults_to_day_one(client, auth_headers):
+    data = client.get("/dashboard", headers=auth_headers).json()
+    assert data["day"] == 1
+    assert data["matches"] == [] and data["lineup"] == [] and data["usages"] == []
@@ -0,0 +1,30 @@
+"""
+Tests for the SQLite connection profile in app.database.
+"""
+
+from sqlalchemy import create_engine, text
+from app.database import apply_sqlite_profile, SQLITE_BUSY_TIMEOUT_MS
+from app.models import Player, DailyLineup
+
+
+def test_sqlite_profile_pragmas_on_every_connection(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'profile.db'}")
+    apply_sqlite_profile(engine)
+    for _ in range(2):
+        with engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == SQLITE_BUSY_TIMEOUT_MS
+        engine.dispose()
+
+
+def test_sqlite_profile_leaves_foreign_key_enforcement_alone(tmp_path):
+    # Databases created without enforcement may hold orphaned rows; the profile must not
+    # turn writes that used to work into IntegrityErrors
+    engine = create_engine(f"sqlite:///{tmp_path / 'fk.db'}")
+    apply_sqlite_profile(engine)
+    Player.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        assert conn.execute(text("PRAGMA foreign_keys")).scalar() == 0
+        conn.execute(DailyLineup.__table__.insert().values(user_id="nobody", day=1, player_id=1))
+    engine.dispose()
@@ -0,0 +1,181 @@
+"""
+Tests for the Day worksheet write-behind buffer (day_sheet_writer.py) against
+fake_sheets.FakeSheets: worksheet creation, in-place rewrites, stale-block
+clears, appends, retries and the API requests each flush costs.
+"""
+
+import threading
+
+import pandas as pd
+import pytest
+import scraper_bridge  # noqa: F401  (puts the repo root on sys.path)
+
+pytest.importorskip("gspread")
+pytest.importorskip("oauth2client")
+import sheets_client  # noqa: E402
+from config import MAIN_SPREADSHEET  # noqa: E402
+from day_sheet_writer import DaySheetWriter  # noqa: E402
+from fake_sheets import FakeSheets  # noqa: E402
+from match_fingerprints import FingerprintStore  # noqa: E402
+
+HEADER = ["Player", "Team", "G", "A"]
+
+
+def _stats(*rows):
+    return pd.DataFrame(list(rows), columns=HEADER)
+
+
+@pytest.fixture()
+def fake():
+    fake = FakeSheets()
+    fake.key = fake.create_spreadsheet(MAIN_SPREADSHEET)
+    sheets_client.use_client(fake.client())
+    yield fake
+    sheets_client.use_client(None)
+
+
+@pytest.fixture()
+def writer(tmp_path):
+    writer = DaySheetWriter(store=FingerprintStore(str(tmp_path / "fingerprints.json")))
+    yield writer
+    writer._closed = True
+    writer._wakeup.set()
+
+
+def test_first_flush_creates_the_worksheet_in_one_write(fake, writer):
+    writer.add("Day 1", "1001", _stats(["Ann", "CAN", 1, 0], ["Bo", "CAN", 0, 1]), "h1")
+    writer.add("Day 1", "1002", _stats(["Cid", "FIN", 2, 0]), "h2")
+
+    assert writer.flush() == 1
+    assert fake.sheet_values(fake.key, "Day 1") == [
+        HEADER, ["Ann", "CAN", "1", "0"], ["Bo", "CAN", "0", "1"], ["Cid", "FIN", "2", "0"],
+    ]
+    assert dict(fake.calls) == {"open": 1, "worksheet": 1, "add_worksheet": 1, "values_batch_update": 1}
+    assert writer.store.get("1002") | {"updated_at": None} == {
+        "hash": "h2", "unchanged_runs": 0, "updated_at": None, "worksheet": "Day 1", "start_row": 4, "row_count": 1,
+    }
+    assert writer.flush() == 0  # nothing pending
+
+
+def test_same_row_count_is_rewritten_in_place(fake, writer):
+    writer.add("Day 1", "1001", _stats(["Ann", "CAN", 1, 0], ["Bo", "CAN", 0, 1]), "h1")
+    writer.add("Day 1", "1002", _stats(["Cid", "FIN", 2, 0]), "h2")
+    writer.flush()
+    fake.reset_counters()
+
+    writer.add("Day 1", "1001", _stats(["Ann", "CAN", 2, 0], ["Bo", "CAN", 0, 2]), "h1b")
+    assert writer.flush() == 1
+    assert fake.sheet_values(fake.key, "Day 1") == [
+        HEADER, ["Ann", "CAN", "2", "0"], ["Bo", "CAN", "0", "2"], ["Cid", "FIN", "2", "0"],
+    ]
+    assert dict(fake.calls) == {"values_batch_update": 1}
+    assert writer.store.get("1001")["start_row"] == 2
+
+
+def test_changed_row_count_clears_the_old_block_and_appends(fake, writer):
+    writer.add("Day 1", "1001", _stats(["Ann", "CAN", 1, 0]), "h1")
+    writer.add("Day 1", "1002", _stats(["Cid", "FIN", 2, 0]), "h2")
+    writer.flush()
+    fake.reset_counters()
+
+    writer.add("Day 1", "1001", _stats(["Ann", "CAN", 1, 0], ["Eve", "CAN", 0, 1]), "h1b")
+    assert writer.flush() == 2
+    assert fake.sheet_values(fake.key, "Day 1") == [
+        HEADER, [], ["Cid", "FIN", "2", "0"], ["Ann", "CAN", "1", "0"], ["Eve", "CAN", "0", "1"],
+    ]
+    assert dict(fake.calls) == {"values_batch_update": 1, "append_rows": 1}
+    assert (writer.store.get("1001")["start_row"], writer.store.get("1001")["row_count"]) == (4, 2)
+
+
+def test_resized_match_above_others_is_written_below_the_last_known_row(fake, writer):
+    writer.add("Day 1", "1001", _stats(["Ann", "CAN", 1, 0]), "h1")
+    writer.add("Day 1", "1002", _stats(["Bo", "CAN", 0, 1]), "h2")
+    writer.add("Day 1", "1003", _stats(["Cid", "FIN", 2, 0]), "h3")
+    writer.flush()
+    fake.reset_counters()
+
+    # The cleared block ends the table the append API would detect from A1
+    writer.add("Day 1", "1001", _stats(["Ann", "CAN", 1, 0], ["Eve", "CAN", 0, 1]), "h1b")
+    assert writer.flush() == 2
+    assert fake.sheet_values(fake.key, "Day 1") == [
+        HEADER, [], ["Bo", "CAN", "0", "1"], ["Cid", "FIN", "2", "0"],
+        ["Ann", "CAN", "1", "0"], ["Eve", "CAN", "0", "1"],
+    ]
+    assert dict(fake.calls) == {"values_batch_update": 1, "append_rows": 1}
+    assert [writer.store.get(g)["start_row"] for g in ("1001", "1002", "1003")] == [5, 3, 4]
+
+    # A later in-place rewrite of a match below the gap hits the right rows
+    writer.add("Day 1", "1003", _stats(["Cid", "FIN", 3, 0]), "h3b")
+    writer.flush()
+    assert fake.sheet_values(fake.key, "Day 1")[3] == ["Cid", "FIN", "3", "0"]
+
+
+def test_existing_worksheet_gets_one_append_per_sheet(tmp_path):
+    fake = FakeSheets()
+    old_rows = [HEADER, ["Old", "SWE", 0, 0]]
+    key = fake.create_spreadsheet(MAIN_SPREADSHEET, sheets={"Day 1": old_rows, "Day 2": old_rows})
+    sheets_client.use_client(fake.client())
+    writer = DaySheetWriter(store=FingerprintStore(str(tmp_path / "fingerprints.json")))
+
+    writer.add("Day 1", "1001", _stats(["Ann", "CAN", 1, 0]), "h1")
+    writer.add("Day 1", "1002", _stats(["Cid", "FIN", 2, 0]), "h2")
+    writer.add("Day 2", "1003", _stats(["Dan", "USA", 0, 0]), "h3")
+    assert writer.flush() == 2
+
+    assert fake.sheet_values(key, "Day 1")[2:] == [["Ann", "CAN", "1", "0"], ["Cid", "FIN", "2", "0"]]
+    assert fake.sheet_values(key, "Day 2")[2:] == [["Dan", "USA", "0", "0"]]
+    assert dict(fake.calls) == {"open": 1, "worksheet": 2, "append_rows": 2}
+    assert [writer.store.get(g)["start_row"] for g in ("1001", "1002", "1003")] == [3, 4, 3]
+    writer.close()
+    sheets_client.use_client(None)
+
+
+def test_failed_flush_keeps_rows_and_newer_stats_win(fake, writer, monkeypatch):
+    writer.add("Day 1", "1001", _stats(["Ann", "CAN", 1, 0]), "h1")
+    spreadsheet = sheets_client.main_spreadsheet()
+
+    def unavailable(body):
+        # Newer stats for the same game arrive while the request is in flight
+        writer.add("Day 1", "1001", _stats(["Ann", "CAN", 3, 0]), "h1c")
+        raise RuntimeError("503")
+
+    monkeypatch.setattr(type(spreadsheet), "values_batch_update", lambda self, body: unavailable(body))
+    with pytest.raises(RuntimeError):
+        writer.flush()
+    assert writer.store.get("1001") is None
+    monkeypatch.undo()
+
+    writer.flush()
+    assert fake.sheet_values(fake.key, "Day 1") == [HEADER, ["Ann", "CAN", "3", "0"]]
+    assert writer.store.get("1001")["hash"] == "h1c"
+
+
+def test_buffer_is_not_locked_during_api_calls(fake, writer, monkeypatch):
+    writer.add("Day 1", "1001", _stats(["Ann", "CAN", 1, 0]), "h1")
+    in_flight, release = threading.Event(), threading.Event()
+    original = fake.request
+
+    def slow_request(method, kind):
+        if method == "values_batch_update":
+            in_flight.set()
+            assert release.wait(5)
+        original(method, kind)
+
+    monkeypatch.setattr(fake, "request", slow_request)
+    flusher = threading.Thread(target=writer.flush)
+    flusher.start()
+    assert in_flight.wait(5)
+
+    # A scraper thread can buffer and look up fingerprints while the flush waits on the API
+    adder = threading.Thread(target=lambda: (writer.add("Day 1", "1002", _stats(["Cid", "FIN", 2, 0]), "h2"),
+                                             writer.previous("1001")))
+    adder.start()
+    adder.join(1)
+    released_late = adder.is_alive()
+    release.set()
+    flusher.join(5)
+    adder.join(5)
+
+    assert not released_late
+    writer.flush()
+    assert fake.sheet_values(fake.key, "Day 1")[1:] == [["Ann", "CAN", "1", "0"], ["Cid", "FIN", "2", "0"]]
@@ -0,0 +1,66 @@
+"""
+Tests for match_fingerprints.FingerprintStore: final-game detection and saves
+from several stores sharing one file.
+"""
+
+import json
+import threading
+
+import scraper_bridge  # noqa: F401  (puts the repo root on sys.path)
+from match_fingerprints import FINAL_AFTER_UNCHANGED, FingerprintStore
+
+
+def test_record_counts_unchanged_runs_until_final(tmp_path):
+    store = FingerprintStore(str(tmp_path / "fingerprints.json"))
+    assert store.record("1001", "h1") is True
+    for _ in range(FINAL_AFTER_UNCHANGED):
+        assert not store.is_final("1001")
+        assert store.record("1001", "h1") is False
+    assert store.is_final("1001")
+    assert store.record("1001", "h2") is True and not store.is_final("1001")
+
+
+def test_last_row_per_worksheet(tmp_path):
+    store = FingerprintStore(str(tmp_path / "fingerprints.json"))
+    store.record("1001", "a", worksheet="Day 1", start_row=22, row_count=20)
+    store.record("1002", "b", worksheet="Day 1", start_row=2, row_count=20)
+    store.record("1003", "c", worksheet="Day 2", start_row=2, row_count=5)
+    store.record("1004", "d")  # unchanged-only entry without a position
+    assert (store.last_row("Day 1"), store.last_row("Day 2"), store.last_row("Day 3")) == (41, 6, None)
+
+
+def test_save_merges_with_games_written_by_another_store(tmp_path):
+    path = str(tmp_path / "fingerprints.json")
+    cron, manual = FingerprintStore(path), FingerprintStore(path)
+
+    cron.record("1001", "a", worksheet="Day 1", start_row=2, row_count=20)
+    cron.save()
+    manual.record("1002", "b", worksheet="Day 1", start_row=22, row_count=20)
+    manual.save()  # must not drop 1001, which this store never loaded
+
+    on_disk = json.loads((tmp_path / "fingerprints.json").read_text())
+    assert set(on_disk) == {"1001", "1002"}
+    assert manual.get("1001")["start_row"] == 2  # picked up on save
+
+    # A game both recorded: the later save wins, the other games are kept
+    cron.record("1002", "b2", start_row=42)
+    cron.save()
+    on_disk = json.loads((tmp_path / "fingerprints.json").read_text())
+    assert (on_disk["1001"]["hash"], on_disk["1002"]["hash"], on_disk["1002"]["start_row"]) == ("a", "b2", 42)
+
+
+def test_concurrent_saves_keep_every_game(tmp_path):
+    path = str(tmp_path / "fingerprints.json")
+    stores = [FingerprintStore(path) for _ in range(8)]
+
+    def run(i, store):
+        for n in range(10):
+            store.record(f"{i}-{n}", "h")
+            store.save()
+
+    threads = [threading.Thread(target=run, args=(i, store)) for i, store in enumerate(stores)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(FingerprintStore(path).entries) == 80
@@ -0,0 +1,236 @@
+"""
+Tests for the durable ingest job queue in app.ingest.
+
+Lifecycle:
+  enqueue_started_matches -> pending
+  claim_next_job          -> running (atomic, one winner)
+  complete_job            -> pending again if content changed or the match may not be
+                             over yet, done if unchanged after the match
+  fail_job                -> pending with backoff, failed after MAX_ATTEMPTS
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import pytest
+import scraper_bridge
+from app.models import Match, IngestJob, Player, PlayerStat
+from app import ingest
+from match_fingerprints import fingerprint_stats
+
+NOW = datetime(2026, 5, 10, 20, 0)
+
+
+def _insert_match(db, match_time, url="https://www.iihf.com/en/events/2026/wm/gamecenter/statistics/1/"):
+    m = Match(
+        day=1,
+        date=match_time.date(),
+        match_time=match_time,
+        home_team="TST",
+        away_team="OPP",
+        url_statistics=url,
+    )
+    db.add(m)
+    db.commit()
+    return m
+
+
+class TestEnqueue:
+    def test_only_started_matches_enqueued_once(self, db):
+        _insert_match(db, NOW - timedelta(hours=1))
+        _insert_match(db, NOW + timedelta(hours=1))
+
+        assert ingest.enqueue_started_matches(db, now=NOW) == 1
+        assert ingest.enqueue_started_matches(db, now=NOW) == 0
+        assert db.query(IngestJob).count() == 1
+
+    def test_missed_match_outside_window_still_enqueued(self, db):
+        """A match from days ago that was never ingested is picked up (catch-up)."""
+        _insert_match(db, NOW - timedelta(days=3))
+        assert ingest.enqueue_started_matches(db, now=NOW) == 1
+
+
+class TestClaim:
+    def test_claim_is_exclusive(self, db):
+        _insert_match(db, NOW - timedelta(hours=1))
+        ingest.enqueue_started_matches(db, now=NOW)
+
+        job = ingest.claim_next_job(db, "w1", now=NOW)
+        assert job is not None
+        assert job.state == "running"
+        assert job.locked_by == "w1"
+        assert ingest.claim_next_job(db, "w2", now=NOW) is None
+
+    def test_expired_lease_is_reclaimed(self, db):
+        _insert_match(db, NOW - timedelta(hours=1))
+        ingest.enqueue_started_matches(db, now=NOW)
+        ingest.claim_next_job(db, "w1", now=NOW)
+
+        later = NOW + ingest.LEASE_TIMEOUT + timedelta(seconds=1)
+        job = ingest.claim_next_job(db, "w2", now=later)
+        assert job is not None
+        assert job.locked_by == "w2"
+
+
+class TestCompleteAndFail:
+    def _claimed_job(self, db):
+        _insert_match(db, NOW - timedelta(hours=1))
+        ingest.enqueue_started_matches(db, now=NOW)
+        return ingest.claim_next_job(db, "w1", now=NOW)
+
+    def test_changed_content_is_rechecked_then_done(self, db):
+        job = self._claimed_job(db)
+        assert ingest.complete_job(db, job, "abc", now=NOW) is True
+        assert job.state == "pending"
+        assert job.next_run_at == NOW + ingest.RECHECK_INTERVAL
+
+        # Unchanged for 30 minutes mid-game (an intermission, a delay): still re-checked
+        later = NOW + ingest.RECHECK_INTERVAL
+        job = ingest.claim_next_job(db, "w1", now=later)
+        assert ingest.complete_job(db, job, "abc", now=later) is False
+        assert job.state == "pending"
+        assert job.next_run_at == later + ingest.RECHECK_INTERVAL
+
+        after_game = job.match.match_time + ingest.MIN_GAME_LENGTH
+        job = ingest.claim_next_job(db, "w1", now=after_game)
+        assert ingest.complete_job(db, job, "abc", now=after_game) is False
+        assert job.state == "done"
+        assert job.finished_at == after_game
+
+    def test_empty_page_is_not_final_until_the_deadline(self, db):
+        job = self._claimed_job(db)
+        started = job.match.match_time
+        after_game = started + ingest.MIN_GAME_LENGTH
+        ingest.complete_job(db, job, "empty", now=NOW, has_stats=False)
+        assert ingest.complete_job(db, job, "empty", now=after_game, has_stats=False) is False
+        assert job.state == "pending"
+
+        deadline = started + ingest.STATS_DEADLINE
+        assert ingest.complete_job(db, job, "empty", now=deadline, has_stats=False) is False
+        assert job.state == "done"
+
+    def test_failure_backs_off(self, db):
+        job = self._claimed_job(db)
+        ingest.fail_job(db, job, "boom", now=NOW)
+        assert job.state == "pending"
+        assert job.attempts == 1
+        assert job.last_error == "boom"
+        assert job.next_run_at == NOW + ingest.BACKOFF_BASE
+        assert ingest.claim_next_job(db, "w1", now=NOW) is None
+
+    def test_failed_after_max_attempts_and_retry(self, db):
+        job = self._claimed_job(db)
+        now = NOW
+        for _ in range(ingest.MAX_ATTEMPTS):
+            ingest.fail_job(db, job, "boom", now=now)
+            now = job.next_run_at
+            if job.state == "pending":
+                job = ingest.claim_next_job(db, "w1", now=now)
+        assert job.state == "failed"
+        assert ingest.queue_stats(db, now=now)["by_state"]["failed"] == 1
+
+        assert ingest.retry_failed_jobs(db, now=now) == 1
+        assert ingest.claim_next_job(db, "w1", now=now) is not None
+
+    def test_backoff_is_capped(self):
+        assert ingest.backoff_delay(50) == ingest.BACKOFF_CAP
+
+
+class TestIngestWorker:
+    """scraper_bridge.run_ingest_worker with the scraper replaced by canned DataFrames."""
+
+    @pytest.fixture()
+    def worker_db(self, db, monkeypatch):
+        # The worker closes its session when done; a closed test session is still usable
+        monkeypatch.setattr(scraper_bridge, "SessionLocal", lambda: db)
+        db.add(Player(name="Ann", position="Forward", team_abbr="TST", championship_year=datetime.now().year))
+        db.commit()
+        return db
+
+    def _match(self, db, game_id, stats, started=timedelta(hours=1)):
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        match = _insert_match(
+            db, now - started,
+            url=f"https://www.iihf.com/en/events/2026/wm/gamecenter/statistics/{game_id}/",
+        )
+        self.stats[match.id] = stats
+        return match.id
+
+    def _run(self, monkeypatch):
+        def fake_scrape(match):
+            stats = self.stats[match.id]
+            if isinstance(stats, Exception):
+                raise stats
+            return stats
+        monkeypatch.setattr(scraper_bridge, "_scrape_match_stats", fake_scrape)
+        scraper_bridge.run_ingest_worker()
+
+    def test_written_unchanged_and_failed_paths(self, worker_db, monkeypatch):
+        db = worker_db
+        self.stats = {}
+        written = self._match(db, 1, pd.DataFrame([{"Player": "Ann", "Goals": 2}]))
+        unchanged_df = pd.DataFrame([{"Player": "Ann", "Goals": 1}])
+        unchanged = self._match(db, 2, unchanged_df, started=ingest.MIN_GAME_LENGTH + timedelta(hours=1))
+        failed = self._match(db, 3, RuntimeError("gamecenter down"))
+
+        # The unchanged match was ingested before with the same content
+        started = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(minutes=1)
+        db.add(IngestJob(match_id=unchanged, state="pending", attempts=0, next_run_at=started,
+                         content_hash=fingerprint_stats(unchanged_df)))
+        db.commit()
+
+        self._run(monkeypatch)
+
+        jobs = {job.match_id: job for job in db.query(IngestJob).populate_existing()}
+        assert jobs[written].state == "pending"  # changed content is re-checked later
+        assert jobs[written].content_hash == fingerprint_stats(self.stats[written])
+        assert db.query(PlayerStat).filter(PlayerStat.match_id == written).one().goals == 2
+
+        assert jobs[unchanged].state == "done"
+        assert db.query(PlayerStat).filter(PlayerStat.match_id == unchanged).count() == 0
+
+        job = jobs[failed]
+        assert job.state == "pending"
+        assert job.attempts == 1
+        assert job.last_error == "RuntimeError: gamecenter down"
+        assert job.locked_by is None
+        assert job.next_run_at > datetime.now(timezone.utc).replace(tzinfo=None) + ingest.BACKOFF_BASE / 2
+
+    def test_failed_write_is_rolled_back_before_fail_job(self, worker_db, monkeypatch):
+        db = worker_db
+        self.stats = {}
+        # The first row is staged, the second fails to parse before the commit
+        broken = self._match(db, 4, pd.DataFrame([
+            {"Player": "Ann", "Goals": 1},
+            {"Player": "Ann", "Goals": "n/a"},
+        ]))
+
+        self._run(monkeypatch)
+
+        job = db.query(IngestJob).filter(IngestJob.match_id == broken).populate_existing().one()
+        assert job.state == "pending" and job.attempts == 1
+        assert job.last_error.startswith("ValueError")
+        assert db.query(PlayerStat).filter(PlayerStat.match_id == broken).count() == 0
+        assert db.get(Match, broken, populate_existing=True).status != "completed"
+
+    def test_empty_page_twice_then_real_stats(self, worker_db, monkeypatch):
+        db = worker_db
+        self.stats = {}
+        empty = pd.DataFrame(columns=["Player", "Goals"])
+        match_id = self._match(db, 5, empty)
+
+        def run_when_due():
+            job = db.query(IngestJob).filter(IngestJob.match_id == match_id).populate_existing().one()
+            job.next_run_at = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=1)
+            db.commit()
+            self._run(monkeypatch)
+            return db.query(IngestJob).filter(IngestJob.match_id == match_id).populate_existing().one()
+
+        self._run(monkeypatch)
+        assert run_when_due().state == "pending"  # same empty page twice: not published yet
+
+        self.stats[match_id] = pd.DataFrame([{"Player": "Ann", "Goals": 3}])
+        job = run_when_due()
+        assert job.state == "pending"
+        assert job.content_hash == fingerprint_stats(self.stats[match_id])
+        assert db.query(PlayerStat).filter(PlayerStat.match_id == match_id).one().goals == 3
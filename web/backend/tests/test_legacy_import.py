@@ -0,0 +1,130 @@
+"""
+Tests for legacy_import: parsing the Sestavy and Day N sheets and the bulk import.
+"""
+
+from datetime import date, datetime
+
+import pytest
+from legacy_import import parse_lineups, split_day_sheet, import_legacy, NameLookup
+from app.models import User, Player, Match, PlayerStat, DailyLineup
+
+BASE = "https://www.iihf.com/en/events/2025/wm/gamecenter"
+STATS_HEADER = ["Player", "Team", "Position", "Goals", "Assists", "Points", "Penalty Minutes",
+                "Plus Minus", "Goals Against", "Saves", "Shorthanded Goal", "Power Play Goal",
+                "Game Winning Goal", "Win"]
+
+
+def _stat(player, team, position="F", goals=0, assists=0, win=0):
+    return [player, team, position, goals, assists, goals + assists, 0, 0, 0, 0, 0, 0, 0, win]
+
+
+@pytest.fixture()
+def season(db):
+    """Two day-1 matches and a small roster."""
+    for game_id, hour, home, away in ((1, 16, "CAN", "USA"), (2, 20, "FIN", "SWE")):
+        db.add(Match(
+            day=1, date=date(2025, 5, 9), match_time=datetime(2025, 5, 9, hour),
+            home_team=home, away_team=away,
+            url_playbyplay=f"{BASE}/playbyplay/{game_id}/", url_statistics=f"{BASE}/statistics/{game_id}/",
+        ))
+    for name, team, position in (("McDavid Connor", "CAN", "Forward"), ("Hughes Quinn", "USA", "Defender"),
+                                 ("Barkov Aleksander", "FIN", "Forward")):
+        db.add(Player(name=name, position=position, team_abbr=team, championship_year=2025))
+    db.commit()
+    return db
+
+
+def _day_sheet():
+    return [
+        STATS_HEADER,
+        _stat("McDavid Connor", "home", goals=2, win=1),
+        _stat("Hughes Quinn", "away", "D", assists=1),
+        _stat("Barkov Aleksander", "home", goals=1, win=1),
+        _stat("Nylander William", "away"),
+    ]
+
+
+def test_name_lookup_ignores_case_accents_and_order():
+    lookup = NameLookup([(7, "Pastrňák David")])
+    assert lookup.get("PASTRNAK David") == 7
+    assert lookup.get("David Pastrnak (CZE)") == 7
+    assert lookup.get("Pastrnak Jan") is None
+
+
+def test_parse_lineups_last_row_per_owner_and_day_wins():
+    rows = [
+        ["Owner", "Sestava", "Owner-Sestava", "Day", "Player 1", "Player 2", "Captain", "Body"],
+        ["Ondra", "S1", "Ondra-S1", 1, "McDavid Connor", "Hughes Quinn", "McDavid Connor", 12],
+        ["Ondra", "S2", "Ondra-S2", 1, "Barkov Aleksander", "", "Barkov Aleksander", 3],
+        ["Petr", "S1", "Petr-S1", "Den 2", "Hughes Quinn"],
+    ]
+    assert parse_lineups(rows) == {
+        ("Ondra", 1): (["Barkov Aleksander"], "Barkov Aleksander"),
+        ("Petr", 2): (["Hughes Quinn"], None),
+    }
+
+
+def test_split_day_sheet_by_team_order():
+    blocks = split_day_sheet(_day_sheet())
+    assert [[r["Player"] for r in block] for _, block in blocks] == [
+        ["McDavid Connor", "Hughes Quinn"], ["Barkov Aleksander", "Nylander William"],
+    ]
+
+
+def test_split_day_sheet_by_recorded_positions():
+    blocks = split_day_sheet(_day_sheet(), {"2": (4, 2), "1": (2, 2)})
+    assert [game_id for game_id, _ in blocks] == ["1", "2"]
+    assert blocks[1][1][0]["Player"] == "Barkov Aleksander"
+
+
+def test_import_legacy(season):
+    lineups = [
+        ["Owner", "Sestava", "Player 1", "Player 2", "Captain"],
+        ["Ondra", "Den 1", "McDavid Connor", "Nobody Known", "McDavid Connor"],
+    ]
+    summary = import_legacy(season, lineups, {1: _day_sheet()}, year=2025)
+
+    assert summary["users"] == 1
+    assert summary["players"] == 1  # Nylander only appears in the stats
+    assert summary["stats"] == 4 and summary["matches"] == 2
+    assert summary["unresolved_names"] == {"Nobody Known"}
+
+    nylander = season.query(Player).filter(Player.name == "Nylander William").one()
+    assert nylander.team_abbr == "SWE"  # away team of the second match
+    mcdavid_stat = season.query(PlayerStat).join(Player).filter(Player.name == "McDavid Connor").one()
+    assert mcdavid_stat.goals == 2 and mcdavid_stat.win is True
+    assert mcdavid_stat.match.home_team == "CAN"
+    assert {m.status for m in season.query(Match)} == {"completed"}
+
+    user = season.query(User).filter(User.username == "Ondra").one()
+    lineup = season.query(DailyLineup).filter(DailyLineup.user_id == user.id).all()
+    assert [(l.day, l.player.name, l.is_captain, l.locked) for l in lineup] == [
+        (1, "McDavid Connor", True, True)
+    ]
+
+
+def test_import_legacy_uses_positions_only_for_scheduled_games(season):
+    # Positions of this season's games: the blocks follow them, not the team order
+    sheet = _day_sheet()
+    sheet[1:] = sheet[3:] + sheet[1:3]
+    summary = import_legacy(season, [], {1: sheet}, {1: {"2": (2, 2), "1": (4, 2)}}, year=2025)
+    assert summary["days_split_by_order"] == []
+    barkov = season.query(PlayerStat).join(Player).filter(Player.name == "Barkov Aleksander").one()
+    assert barkov.match.home_team == "FIN"
+
+    # Another season's fingerprints name unknown games: fall back to the team order
+    summary = import_legacy(season, [], {1: _day_sheet()}, {1: {"42153": (2, 2), "42154": (4, 2)}}, year=2025)
+    assert summary["days_split_by_order"] == [1]
+    assert summary["unmatched_blocks"] == 0 and summary["matches"] == 2
+    mcdavid = season.query(PlayerStat).join(Player).filter(Player.name == "McDavid Connor").one()
+    assert mcdavid.match.home_team == "CAN"
+
+
+def test_import_legacy_is_idempotent(season):
+    lineups = [["Owner", "Day", "Player 1"], ["Ondra", 1, "Hughes Quinn"]]
+    import_legacy(season, lineups, {1: _day_sheet()}, year=2025)
+    summary = import_legacy(season, lineups, {1: _day_sheet()}, year=2025)
+
+    assert summary["users"] == 0 and summary["players"] == 0
+    assert season.query(PlayerStat).count() == 4
+    assert season.query(DailyLineup).count() == 1
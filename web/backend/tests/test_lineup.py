@@ -212,3 +212,18 @@ class TestGetLineup:
         captains = [entry for entry in data["lineup"] if entry["is_captain"]]
         assert len(captains) == 1
         assert captains[0]["player_id"] == player_ids[0]
+
+    def test_get_all_lineups(self, client, auth_headers, player_ids):
+        """GET /lineup/all?day=N lists every user's lineup with nested players."""
+        client.post("/lineup/me", json=_standard_lineup(player_ids, captain_index=1), headers=auth_headers)
+
+        data = client.get("/lineup/all?day=1").json()
+        assert len(data) == 1 and data[0]["day"] == 1
+        lineup = data[0]["lineup"]
+        assert [e["player_id"] for e in lineup] == player_ids
+        assert [e["player_id"] for e in lineup if e["is_captain"]] == [player_ids[1]]
+        assert lineup[0]["player"] == {
+            "id": player_ids[0], "name": "Player0", "position": "Forward",
+            "team_abbr": "TST", "championship_year": 2026, "is_locked": False,
+        }
+        assert client.get("/lineup/all?day=2").json() == [{"day": 2, "lineup": []}]
@@ -0,0 +1,139 @@
+"""
+Tests for the live score push (app/live.py): snapshot deltas, the broker's
+fan-out and the SSE stream of one client.
+"""
+
+import asyncio
+import json
+import logging
+from datetime import date, datetime
+
+from app.catalogue import current_version
+from app.live import SCORES, QUEUE_SIZE, ScoreBroker, ScoreSnapshot, sse_frame
+from app.models import DailyLineup, Match, Player, PlayerStat, User
+
+
+def _parse(frame: bytes) -> tuple[str, dict]:
+    fields = dict(line.split(": ", 1) for line in frame.decode().strip().split("\n") if ": " in line)
+    return fields["event"], json.loads(fields["data"])
+
+
+def _seed(db):
+    db.add_all([
+        User(id="u1", username="alice", email="a@test.com", password_hash="x"),
+        User(id="u2", username="bob", email="b@test.com", password_hash="x"),
+        Player(id=1, name="Ann", position="Forward", team_abbr="CAN", championship_year=2026),
+        Player(id=2, name="Bo", position="Defender", team_abbr="FIN", championship_year=2026),
+        Match(id=1, day=1, date=date(2026, 5, 1), match_time=datetime(2026, 5, 1, 12), home_team="CAN", away_team="FIN"),
+    ])
+    db.add_all([
+        DailyLineup(user_id="u1", day=1, player_id=1, is_captain=False),
+        DailyLineup(user_id="u2", day=1, player_id=2, is_captain=False),
+    ])
+    db.commit()
+
+
+def test_delta_reports_changed_totals_ranks_and_player_points():
+    before = ScoreSnapshot(
+        [{"user_id": "u1", "username": "alice", "rank": 1, "total_points": 4.0},
+         {"user_id": "u2", "username": "bob", "rank": 2, "total_points": 2.0}],
+        {(1, 1): (1, 4.0), (1, 2): (1, 2.0)},
+    )
+    after = ScoreSnapshot(
+        [{"user_id": "u2", "username": "bob", "rank": 1, "total_points": 6.0},
+         {"user_id": "u1", "username": "alice", "rank": 2, "total_points": 4.0}],
+        {(1, 1): (1, 4.0), (1, 2): (1, 6.0)},
+    )
+    delta = after.delta(before)
+    assert [(u["username"], u["rank"], u["previous_rank"]) for u in delta["users"]] == [("bob", 1, 2), ("alice", 2, 1)]
+    assert delta["players"] == [{"player_id": 2, "match_id": 1, "day": 1, "fantasy_points": 6.0}]
+    assert after.delta(after) is None
+
+
+def test_refresh_publishes_delta_after_recalculation(db):
+    from app.routers.scores import _calculate_day_scores
+
+    _seed(db)
+    broker = ScoreBroker()
+    assert broker.refresh(db) is None  # first load is the baseline snapshot
+    event, data = _parse(broker.snapshot_frame)
+    assert event == "snapshot" and [s["username"] for s in data["standings"]] == ["alice", "bob"]
+
+    assert broker.refresh(db) is None  # same version: nothing reloaded
+
+    db.add(PlayerStat(player_id=2, match_id=1, goals=2))
+    db.commit()
+    _calculate_day_scores(1, db)
+    assert current_version(db, SCORES) == 1
+
+    event, data = _parse(broker.refresh(db))
+    assert event == "scores"
+    assert data["users"][0]["username"] == "bob" and data["users"][0]["previous_rank"] == 2
+    assert data["users"][0]["total_points"] > 0
+    assert [p["player_id"] for p in data["players"]] == [2]
+
+
+def test_publish_fans_out_and_drops_slow_clients():
+    async def scenario():
+        broker = ScoreBroker()
+        broker.snapshot = ScoreSnapshot([], {})
+        fast, _ = await broker.subscribe()
+        slow, _ = await broker.subscribe()
+        frame = sse_frame("scores", {"users": [], "players": []}, 1)
+
+        broker.publish(frame)
+        assert fast.get_nowait() is frame and slow.get_nowait() is frame
+
+        for _ in range(QUEUE_SIZE):
+            broker.publish(frame)
+            fast.get_nowait()
+        broker.publish(frame)  # slow's queue is full now
+        assert broker.subscribers == {fast}
+        frames = [slow.get_nowait() for _ in range(slow.qsize())]
+        assert frames[-1] is None
+
+    asyncio.run(scenario())
+
+
+def test_stream_sends_snapshot_then_deltas_and_unsubscribes():
+    async def scenario():
+        broker = ScoreBroker()
+        broker.snapshot = ScoreSnapshot([], {})
+        broker.snapshot_frame = sse_frame("snapshot", {"standings": []})
+        queue, first = await broker.subscribe()
+        disconnected = False
+
+        async def is_disconnected():
+            return disconnected
+
+        stream = broker.stream(queue, first, is_disconnected)
+        assert (await anext(stream)).endswith(first)
+        broker.publish(sse_frame("scores", {"users": [], "players": []}, 1))
+        assert _parse(await anext(stream))[0] == "scores"
+
+        disconnected = True
+        broker.publish(b": ping\n\n")
+        assert await anext(stream, None) is None
+        assert not broker.subscribers
+
+    asyncio.run(scenario())
+
+
+def test_watcher_logs_refresh_failures_and_keeps_running(caplog):
+    def broken_session():
+        raise RuntimeError("database unavailable")
+
+    async def scenario():
+        broker = ScoreBroker(session_factory=broken_session, poll_seconds=0.01)
+        broker.snapshot = ScoreSnapshot([], {})
+        queue, _ = await broker.subscribe()
+        broker.start()
+        await asyncio.sleep(0.1)
+        assert not broker._task.done()
+        await broker.stop()
+        broker.unsubscribe(queue)
+
+    with caplog.at_level(logging.ERROR, logger="app.live"):
+        asyncio.run(scenario())
+    failures = [r for r in caplog.records if r.name == "app.live"]
+    assert failures and failures[0].exc_info[1].args == ("database unavailable",)
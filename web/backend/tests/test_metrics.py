@@ -0,0 +1,65 @@
+"""
+Tests for app.metrics and the connection pool instrumentation behind GET /metrics.
+"""
+
+import pytest
+from sqlalchemy import create_engine, exc
+from app import metrics
+from app.database import TimedQueuePool, POOL_TIMEOUTS, POOL_WAIT
+
+
+def test_histogram_buckets_are_cumulative_and_rendered():
+    hist = metrics.Histogram("test_latency_seconds", "Test latency", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        hist.observe(value, route="x")
+
+    snap = hist.snapshot(route="x")
+    assert snap["count"] == 4 and snap["sum"] == pytest.approx(4.05)
+    assert list(snap["buckets"].values()) == [1, 3, 4]
+
+    text = metrics.render()
+    assert '# TYPE test_latency_seconds histogram' in text
+    assert 'test_latency_seconds_bucket{route="x",le="1"} 3' in text
+    assert 'test_latency_seconds_bucket{route="x",le="+Inf"} 4' in text
+    assert 'test_latency_seconds_count{route="x"} 4' in text
+
+
+def test_counter_and_collector_gauge():
+    counter = metrics.Counter("test_events_total", "Test events")
+    gauge = metrics.Gauge("test_depth", "Test depth")
+    counter.inc(engine="a")
+    counter.inc(2, engine="a")
+    metrics.register_collector(lambda: gauge.set(7))
+
+    text = metrics.render()
+    assert counter.get(engine="a") == 3
+    assert 'test_events_total{engine="a"} 3' in text
+    assert "test_depth 7" in text
+
+
+def test_pool_records_waits_and_timeouts(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}", poolclass=TimedQueuePool,
+        pool_size=1, max_overflow=0, pool_timeout=0.05,
+    )
+    waits_before = POOL_WAIT.snapshot(engine="sync")["count"]
+    timeouts_before = POOL_TIMEOUTS.get(engine="sync")
+
+    held = engine.connect()
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+    held.close()
+    engine.dispose()
+
+    assert POOL_WAIT.snapshot(engine="sync")["count"] == waits_before + 2
+    assert POOL_TIMEOUTS.get(engine="sync") == timeouts_before + 1
+
+
+def test_metrics_endpoint_reports_pool(client):
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "# TYPE db_pool_wait_seconds histogram" in response.text
+
+    pool = client.get("/metrics/pool").json()
+    assert set(pool["sync"]) >= {"size", "checked_out", "overflow", "waits", "timeouts"}
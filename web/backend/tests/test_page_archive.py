@@ -0,0 +1,145 @@
+"""
+Tests for the raw page archive (page_archive.py) and re-parsing the whole
+tournament from it (scraper_bridge.reparse_all_from_archive).
+"""
+
+import sys
+import types
+from datetime import date, datetime
+from io import StringIO
+
+import pandas as pd
+import pytest
+import scraper_bridge
+import page_archive
+from page_archive import PageArchive, PLAYBYPLAY, STATISTICS
+from app.models import Match, Player, PlayerStat
+
+
+@pytest.fixture()
+def archive(tmp_path):
+    archive = PageArchive(str(tmp_path / "archive"))
+    yield archive
+    archive.close()
+
+
+def test_put_and_latest(archive):
+    archive.put("42153", STATISTICS, "<html>first</html>", url="https://x/statistics/42153/", fetched_at=100.0)
+    archive.put(42153, STATISTICS, b"<html>second</html>", fetched_at=200.0)
+    archive.put("42153", PLAYBYPLAY, "<html>pbp</html>", fetched_at=150.0)
+
+    assert archive.latest("42153", STATISTICS) == b"<html>second</html>"
+    assert archive.latest(42153, PLAYBYPLAY) == b"<html>pbp</html>"
+    assert archive.latest("42153", "roster") is None
+    assert archive.latest("99999", STATISTICS) is None
+
+    assert archive.game_ids(STATISTICS) == ["42153"]
+    stats = archive.stats()
+    assert stats[STATISTICS]["pages"] == 2
+    assert stats[STATISTICS]["raw_bytes"] == len("<html>first</html>") + len("<html>second</html>")
+
+
+def test_latest_is_by_fetch_time_not_insert_order(archive):
+    archive.put("1", STATISTICS, "newer", fetched_at=200.0)
+    archive.put("1", STATISTICS, "older", fetched_at=100.0)
+    assert archive.latest("1", STATISTICS) == b"newer"
+
+
+def test_mmap_grows_for_records_appended_after_a_read(archive):
+    archive.put("1", STATISTICS, "a" * 5000)
+    assert archive.latest("1", STATISTICS) == b"a" * 5000
+    mapped = archive._mapped_size
+
+    # Appended after the file was mapped: the view is remapped to cover it
+    archive.put("2", STATISTICS, "b" * 5000)
+    assert archive.latest("2", STATISTICS) == b"b" * 5000
+    assert archive._mapped_size > mapped
+    assert archive.latest("1", STATISTICS) == b"a" * 5000
+
+
+def test_reopened_archive_reads_existing_records(tmp_path):
+    first = PageArchive(str(tmp_path / "archive"))
+    first.put("1", PLAYBYPLAY, "kept across processes")
+    first.close()
+
+    second = PageArchive(str(tmp_path / "archive"))
+    second.put("2", PLAYBYPLAY, "appended later")
+    assert second.latest("1", PLAYBYPLAY) == b"kept across processes"
+    assert second.latest("2", PLAYBYPLAY) == b"appended later"
+    second.close()
+
+
+def test_zlib_records_without_zstandard(archive, monkeypatch):
+    monkeypatch.setattr(page_archive, "zstandard", None)
+    archive.put("1", STATISTICS, "<html>" + "row " * 1000 + "</html>")
+    codec, length, raw_length = archive._db.execute("SELECT codec, length, raw_length FROM pages").fetchone()
+    assert codec == "zlib" and length < raw_length
+    assert archive.latest("1", STATISTICS).startswith(b"<html>row ")
+
+
+def test_zstd_records_need_zstandard_to_read(archive, monkeypatch):
+    pytest.importorskip("zstandard")
+    archive.put("1", STATISTICS, "<html>zstd</html>")
+    monkeypatch.setattr(page_archive, "zstandard", None)
+    with pytest.raises(RuntimeError, match="zstandard"):
+        archive.latest("1", STATISTICS)
+
+
+def test_zstd_dictionary_training(archive):
+    pytest.importorskip("zstandard")
+    for i in range(50):
+        archive.put(str(i), STATISTICS, f"<table><tr><td>Player {i}</td><td>{i % 3}</td></tr></table>" * 20)
+    dict_id = archive.train_dictionary()
+    assert dict_id
+    archive.put("new", STATISTICS, "<table><tr><td>Player new</td></tr></table>")
+    assert archive._db.execute("SELECT dict_id FROM pages WHERE game_id = 'new'").fetchone() == (dict_id,)
+    assert archive.latest("new", STATISTICS) == b"<table><tr><td>Player new</td></tr></table>"
+    assert archive.latest("7", STATISTICS).startswith(b"<table><tr><td>Player 7</td>")
+
+
+def _match(match_id, game_id):
+    return Match(
+        id=match_id, day=1, date=date(2026, 5, 9), match_time=datetime(2026, 5, 9, 16, 20),
+        home_team="CAN", away_team="FIN", status="upcoming",
+        url_playbyplay=f"https://www.iihf.com/en/events/2026/wm/gamecenter/playbyplay/{game_id}/",
+        url_statistics=f"https://www.iihf.com/en/events/2026/wm/gamecenter/statistics/{game_id}/",
+    )
+
+
+def test_reparse_all_from_archive(db, tmp_path, monkeypatch, capsys):
+    year = datetime.now().year
+    db.add_all([
+        Player(id=1, name="Ann", position="Forward", team_abbr="CAN", championship_year=year),
+        Player(id=2, name="Bo", position="Defender", team_abbr="FIN", championship_year=year),
+        _match(1, "100"), _match(2, "200"), _match(3, "300"),
+    ])
+    db.add(PlayerStat(player_id=1, match_id=1, goals=5))  # written by an older parser
+    db.commit()
+
+    archive = PageArchive(str(tmp_path / "archive"))
+    archive.put("100", STATISTICS, "Player,Goals,Assists\nAnn,1,0\nBo,0,2\n", fetched_at=100.0)
+    archive.put("100", PLAYBYPLAY, "pbp 100")
+    archive.put("200", STATISTICS, "broken")
+    archive.put("200", PLAYBYPLAY, "pbp 200")
+    archive.put("300", STATISTICS, "Player,Goals\nAnn,1\n")  # no play-by-play archived
+    archive.close()
+
+    def build_match_stats(statistics_html, playbyplay_html):
+        assert playbyplay_html.startswith(b"pbp ")
+        if statistics_html == b"broken":
+            raise ValueError("no stats table")
+        return pd.read_csv(StringIO(statistics_html.decode()))
+
+    # match_stats_scraper pulls in selenium; the parser is swapped for one reading the CSV pages above
+    monkeypatch.setitem(sys.modules, "match_stats_scraper", types.SimpleNamespace(build_match_stats=build_match_stats))
+    monkeypatch.setattr(page_archive, "PAGE_ARCHIVE_DIR", str(tmp_path / "archive"))
+    monkeypatch.setattr(scraper_bridge, "SessionLocal", lambda: db)
+
+    scraper_bridge.reparse_all_from_archive()
+
+    assert "Reparsed 1 matches from archive" in capsys.readouterr().out
+    stats = {(s.match_id, s.player_id): s for s in db.query(PlayerStat).populate_existing()}
+    assert set(stats) == {(1, 1), (1, 2)}
+    assert (stats[(1, 1)].goals, stats[(1, 2)].assists) == (1, 2)
+    statuses = {m.id: m.status for m in db.query(Match).populate_existing()}
+    assert statuses == {1: "completed", 2: "upcoming", 3: "upcoming"}
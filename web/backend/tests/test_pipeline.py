@@ -0,0 +1,131 @@
+"""
+Tests for pipeline.py: argument parsing, championship resolution, the per-step
+timing summary and the browser bound on ingest.
+"""
+
+import json
+import sys
+import threading
+import time
+import types
+
+import pandas as pd
+import pytest
+import scraper_bridge  # noqa: F401  (puts the repo root on sys.path)
+import pipeline
+import url_scraper
+from config import CHAMPIONSHIPS, CHAMPIONSHIP_URL, INGEST_MAX_WORKERS, MAIN_SPREADSHEET, MATCH_URLS_CSV
+
+
+@pytest.fixture()
+def recorded(monkeypatch):
+    """Replace the schedule step with one that records the championships it ran for."""
+    calls = []
+
+    def fake_schedule(championship, args):
+        calls.append((championship.key, args))
+        if championship.key == "wm":
+            raise RuntimeError("schedule page could not be fetched")
+        return "1 added, 0 changed, 0 removed"
+
+    monkeypatch.setitem(pipeline.COMMANDS, "schedule", (fake_schedule, True))
+    return calls
+
+
+def test_resolve_championship_by_key_and_url():
+    wm = pipeline.resolve_championship("wm")
+    assert (wm.key, wm.url, wm.spreadsheet) == ("wm", CHAMPIONSHIPS["wm"]["url"], "IIHF WM")
+    assert wm.match_urls_csv == "match_urls_wm.csv" and wm.fingerprints_json == "match_fingerprints_wm.json"
+
+    assert pipeline.resolve_championship(CHAMPIONSHIPS["wm"]["url"] + "/").key == "wm"
+
+    # The default championship keeps the files the standalone scripts use
+    default = pipeline.default_championship()
+    assert default.url == CHAMPIONSHIP_URL and default.match_urls_csv == MATCH_URLS_CSV
+
+    other = pipeline.resolve_championship("https://www.iihf.com/en/events/2027/wm/")
+    assert (other.key, other.spreadsheet) == ("2027-wm", MAIN_SPREADSHEET)
+    assert other.lineups_csv == "lineups_2027-wm.csv"
+
+    with pytest.raises(ValueError, match="Unknown championship"):
+        pipeline.resolve_championship("olympics")
+
+
+def test_championships_repeat_and_comma_separate(recorded):
+    pipeline.main(["schedule", "--championship", "wm20,wm", "--championship", "wm20"])
+    assert sorted(key for key, _ in recorded) == ["wm", "wm20", "wm20"]
+
+    recorded.clear()
+    pipeline.main(["schedule"])
+    assert [key for key, _ in recorded] == [pipeline.default_championship().key]
+
+
+def test_argument_defaults_and_errors(recorded, capsys):
+    pipeline.main(["schedule", "--championship", "wm20"])
+    args = recorded[0][1]
+    assert args.ingest_jobs == INGEST_MAX_WORKERS < args.jobs
+    assert (args.hours, args.force, args.upload, args.day) == (5.0, False, False, None)
+
+    for argv in (["schedule", "--championship", "olympics"], ["ingest", "--ingest-jobs", "0"], ["publish"]):
+        with pytest.raises(SystemExit) as exc:
+            pipeline.main(argv)
+        assert exc.value.code == 2
+    assert "Unknown championship 'olympics'" in capsys.readouterr().err
+
+
+def test_summary_records_each_step_and_fails_the_run(recorded, tmp_path, capsys):
+    out = tmp_path / "timings.json"
+    code = pipeline.main(["schedule", "--championship", "wm20,wm", "--json", str(out)])
+    assert code == 1
+
+    printed = capsys.readouterr().out
+    assert "schedule [wm] failed: schedule page could not be fetched" in printed
+    rows = [line.split() for line in printed.splitlines() if line.startswith("schedule ") and "[" not in line]
+    assert sorted((r[1], r[2]) for r in rows) == [("wm", "failed"), ("wm20", "ok")]
+    assert printed.splitlines()[-1].startswith("total")
+
+    summary = json.loads(out.read_text())
+    assert summary["command"] == "schedule" and summary["ingest_jobs"] == INGEST_MAX_WORKERS
+    steps = {s["championship"]: s for s in summary["steps"]}
+    assert steps["wm20"]["detail"] == "1 added, 0 changed, 0 removed"
+    assert steps["wm"]["status"] == "failed" and steps["wm"]["seconds"] >= 0
+
+    assert pipeline.main(["schedule", "--championship", "wm20"]) == 0
+
+
+def test_ingest_bounds_browsers_across_championships(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    for key in ("wm", "wm20"):
+        championship = pipeline.resolve_championship(key)
+        pd.DataFrame([
+            {"Day": 1, "url_playbyplay": f"https://x/playbyplay/{key}{i}/", "url_statistics": f"https://x/statistics/{i}/"}
+            for i in range(4)
+        ]).to_csv(championship.match_urls_csv, index=False)
+
+    lock, running, peak, processed = threading.Lock(), [0], [0], []
+
+    def process_match(day, url_playbyplay, url_statistics, writer):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.02)
+        with lock:
+            running[0] -= 1
+            processed.append(url_playbyplay)
+        return True
+
+    class FakeWriter:
+        def __init__(self, store, spreadsheet_title):
+            self.store = store
+
+        def close(self):
+            pass
+
+    # The root app.py and day_sheet_writer (gspread) are swapped for fakes
+    monkeypatch.setitem(sys.modules, "app", types.SimpleNamespace(process_match=process_match))
+    monkeypatch.setitem(sys.modules, "day_sheet_writer", types.SimpleNamespace(DaySheetWriter=FakeWriter))
+    monkeypatch.setattr(url_scraper, "select_recent_matches", lambda df, hours, date: df)
+
+    assert pipeline.main(["ingest", "--championship", "wm,wm20", "--jobs", "8", "--ingest-jobs", "2"]) == 0
+    assert len(processed) == 8
+    assert peak[0] <= 2
@@ -0,0 +1,27 @@
+"""
+Tests for other_stats_scraper_selenium.parse_playbyplay_html on an archived page
+with responsive and hidden name spans. hidden_names_selenium.json is what the
+Selenium .text path read from the same page in a desktop-sized window.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+import scraper_bridge  # noqa: F401  (puts the repo root on sys.path)
+
+pytest.importorskip("selenium")  # the parser lives next to the Selenium fetcher
+pytest.importorskip("webdriver_manager")
+from other_stats_scraper_selenium import parse_playbyplay_html  # noqa: E402
+
+FIXTURES = Path(__file__).parent / "fixtures" / "playbyplay"
+
+
+def test_hidden_nodes_are_left_out_like_selenium_text():
+    html = (FIXTURES / "hidden_names.html").read_bytes()
+    expected = json.loads((FIXTURES / "hidden_names_selenium.json").read_text(encoding="utf-8"))
+
+    df, score_home, score_away = parse_playbyplay_html(html)
+
+    assert [score_home, score_away] == expected["score"]
+    assert df.to_dict("records") == expected["players"]
@@ -0,0 +1,209 @@
+"""
+Tests for GET /players served from the pre-serialized catalogue (app/catalogue.py):
+ETags and 304s, version bumps, the per-day lock overlay, filters and gzip.
+"""
+
+from datetime import date, datetime, timedelta, timezone
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from app.database import Base
+from app.catalogue import bump_version, current_version
+from app.models import Match, Player
+from scraper_bridge import write_players
+
+
+def _seed(db):
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    for name, position, team in [
+        ("Ann", "Forward", "CAN"), ("Bob", "Defender", "CAN"),
+        ("Cid", "Forward", "FIN"), ("Dan", "Goalkeeper", "FIN"),
+        ("Eve", "Forward", "USA"),
+    ]:
+        db.add(Player(name=name, position=position, team_abbr=team, championship_year=2026))
+    db.add(Match(day=1, date=date.today(), match_time=now - timedelta(hours=1), home_team="CAN", away_team="SWE"))
+    db.add(Match(day=1, date=date.today(), match_time=now + timedelta(hours=3), home_team="FIN", away_team="USA"))
+    db.commit()
+
+
+def test_players_sorted_by_team_then_name_with_playerout_shape(client, db):
+    _seed(db)
+    response = client.get("/players")
+    assert response.status_code == 200
+    players = response.json()
+    assert [(p["team_abbr"], p["name"]) for p in players] == [
+        ("CAN", "Ann"), ("CAN", "Bob"), ("FIN", "Cid"), ("FIN", "Dan"), ("USA", "Eve"),
+    ]
+    assert set(players[0]) == {"id", "name", "position", "team_abbr", "championship_year", "is_locked"}
+    assert not any(p["is_locked"] for p in players)
+
+
+def test_filters_by_position_and_team(client, db):
+    _seed(db)
+    assert [p["name"] for p in client.get("/players", params={"position": "Forward"}).json()] == ["Ann", "Cid", "Eve"]
+    assert [p["name"] for p in client.get("/players", params={"team": "FIN"}).json()] == ["Cid", "Dan"]
+    assert [p["name"] for p in client.get("/players", params={"position": "Forward", "team": "FIN"}).json()] == ["Cid"]
+    assert client.get("/players", params={"team": "XXX"}).json() == []
+
+
+def test_day_locks_only_teams_whose_match_started(client, db):
+    _seed(db)
+    players = client.get("/players", params={"day": 1}).json()
+    assert {p["name"] for p in players if p["is_locked"]} == {"Ann", "Bob"}
+    assert not any(p["is_locked"] for p in client.get("/players", params={"day": 2}).json())
+
+
+def test_etag_revalidation_returns_304(client, db):
+    _seed(db)
+    first = client.get("/players", params={"day": 1})
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "no-cache"
+
+    again = client.get("/players", params={"day": 1}, headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["etag"] == etag
+
+    # Same catalogue, different lock overlay: a different representation
+    other_day = client.get("/players", params={"day": 2}, headers={"If-None-Match": etag})
+    assert other_day.status_code == 200
+    assert other_day.headers["etag"] != etag
+
+
+def test_roster_import_bumps_version_and_etag(client, db):
+    _seed(db)
+    etag = client.get("/players").headers["etag"]
+    version = current_version(db)
+
+    write_players(db, pd.DataFrame([{"name": "Fay", "position": "Defence", "team_abbr": "SWE"}]), year=2026)
+    assert current_version(db) == version + 1
+
+    response = client.get("/players", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert "Fay" in {p["name"] for p in response.json()}
+
+    # Re-importing the same roster changes nothing and keeps the version
+    write_players(db, pd.DataFrame([{"name": "Fay", "position": "Defence", "team_abbr": "SWE"}]), year=2026)
+    assert current_version(db) == version + 1
+
+
+def test_bump_version_creates_and_increments(db):
+    assert current_version(db) == 0
+    bump_version(db)
+    bump_version(db)
+    db.commit()
+    assert current_version(db) == 2
+
+
+def test_bump_version_is_a_single_upsert(tmp_path):
+    # Two sessions that both saw no row: each bump is one INSERT ... ON CONFLICT, so neither can
+    # fail on the primary key the way a separate UPDATE-then-INSERT could
+    engine = create_engine(f"sqlite:///{tmp_path / 'versions.db'}")
+    Base.metadata.create_all(bind=engine)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda conn, cursor, sql, *args: statements.append(sql))
+    Session = sessionmaker(bind=engine)
+    first, second = Session(), Session()
+    assert current_version(first) == current_version(second) == 0
+    statements.clear()
+    for session in (first, second):
+        bump_version(session)
+        session.commit()
+
+    bumps = [sql for sql in statements if "catalogue_versions" in sql]
+    assert len(bumps) == 2 and all("ON CONFLICT" in sql for sql in bumps)
+    assert current_version(Session()) == 2
+    engine.dispose()
+
+
+def test_gzip_body_when_accepted(client, db):
+    _seed(db)
+    plain = client.get("/players", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+
+    # The test client decodes gzip transparently; check the header and the decoded body
+    zipped = client.get("/players", headers={"Accept-Encoding": "gzip"})
+    assert zipped.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in zipped.headers["vary"]
+    assert "Accept-Encoding" in plain.headers["vary"]
+    assert zipped.json() == plain.json()
+
+
+@pytest.mark.parametrize("accept_encoding, gzipped", [
+    ("gzip, deflate, br", True),
+    ("br;q=1.0, GZIP;q=0.5", True),
+    ("identity, *;q=0.1", True),
+    ("gzip;q=0", False),
+    ("gzip;q=0.000, deflate", False),
+    ("identity, *;q=0", False),
+    ("*;q=0, gzip;q=0.2", True),
+    ("x-gzip", False),
+    ("", False),
+])
+def test_gzip_negotiation_honours_q_values(client, db, accept_encoding, gzipped):
+    _seed(db)
+    response = client.get("/players", headers={"Accept-Encoding": accept_encoding})
+    assert ("content-encoding" in response.headers) is gzipped
+    assert "Accept-Encoding" in response.headers["vary"]
+
+
+def _seed_search(db):
+    for name, position, team in [
+        ("Šťastný Pavel", "Forward", "CZE"), ("Stastny Jan", "Defender", "CZE"),
+        ("Pastrňák David", "Forward", "CZE"), ("Østby Lars", "Goalkeeper", "NOR"),
+        ("Smith John", "Forward", "CAN"), ("McDavid Connor", "Forward", "CAN"),
+    ]:
+        db.add(Player(name=name, position=position, team_abbr=team, championship_year=2026))
+    db.commit()
+
+
+def test_search_folds_accents_and_matches_word_prefixes(client, db):
+    _seed_search(db)
+    assert [p["name"] for p in client.get("/players/search", params={"q": "stast"}).json()] == [
+        "Stastny Jan", "Šťastný Pavel",
+    ]
+    assert [p["name"] for p in client.get("/players/search", params={"q": "OSTBY"}).json()] == ["Østby Lars"]
+    assert [p["name"] for p in client.get("/players/search", params={"q": "pavel šť"}).json()] == ["Šťastný Pavel"]
+
+
+def test_search_ranks_prefix_matches_before_substrings(client, db):
+    _seed_search(db)
+    names = [p["name"] for p in client.get("/players/search", params={"q": "david"}).json()]
+    assert names == ["Pastrňák David", "McDavid Connor"]
+
+
+def test_search_matches_team_and_position_and_filters(client, db):
+    _seed_search(db)
+    assert len(client.get("/players/search", params={"q": "cze"}).json()) == 3
+    assert [p["name"] for p in client.get("/players/search", params={"q": "can forw"}).json()] == [
+        "McDavid Connor", "Smith John",
+    ]
+    assert [p["name"] for p in client.get("/players/search", params={"q": "st", "position": "Defender"}).json()] == [
+        "Stastny Jan",
+    ]
+    assert client.get("/players/search", params={"q": "smith", "team": "CZE"}).json() == []
+    assert client.get("/players/search", params={"q": "zzz"}).json() == []
+
+
+def test_search_limit_and_day_locks(client, db):
+    _seed_search(db)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    db.add(Match(day=1, date=date.today(), match_time=now - timedelta(hours=1), home_team="CAN", away_team="CZE"))
+    db.commit()
+
+    assert len(client.get("/players/search", params={"q": "", "limit": 2}).json()) == 2
+    assert client.get("/players/search", params={"limit": 0}).status_code == 422
+
+    found = client.get("/players/search", params={"q": "", "day": 1}).json()
+    assert len(found) == 6
+    assert [p["name"] for p in found if not p["is_locked"]] == ["Østby Lars"]
+
+
+def test_search_sees_imported_players(client, db):
+    _seed_search(db)
+    assert client.get("/players/search", params={"q": "jagr"}).json() == []
+    write_players(db, pd.DataFrame([{"name": "Jágr Jaromír", "position": "Forward", "team_abbr": "CZE"}]), year=2026)
+    assert [p["name"] for p in client.get("/players/search", params={"q": "jagr"}).json()] == ["Jágr Jaromír"]
@@ -0,0 +1,39 @@
+"""
+Tests for replay.py: a two-day championship in tests/fixtures/replay is replayed
+through the real parsers, stats writer and scoring, and the final standings are
+compared with expected_standings.json (alice: 28 + 28, bob: 10 - 1).
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+import scraper_bridge
+
+pytest.importorskip("selenium")  # replay imports the play-by-play scraper
+pytest.importorskip("webdriver_manager")
+from replay import FixturePages, replay  # noqa: E402
+
+FIXTURES = Path(__file__).parent / "fixtures" / "replay"
+
+
+def test_fixture_pages_lookup():
+    pages = FixturePages(FIXTURES)
+    assert pages.latest("fixtures", "schedule").startswith(b"<html>")
+    assert pages.latest("fixtures:CAN", "roster") is not None
+    assert pages.latest("1001", "statistics") is not None
+    assert pages.latest("9999", "statistics") is None
+
+
+def test_replay_matches_expected_standings():
+    session_local = scraper_bridge.SessionLocal
+    lineups = json.loads((FIXTURES / "lineups.json").read_text(encoding="utf-8"))
+
+    standings, recorder = replay(FixturePages(FIXTURES), "fixtures", lineups)
+
+    expected = json.loads((FIXTURES / "expected_standings.json").read_text(encoding="utf-8"))
+    assert standings == expected
+    assert [s["stage"] for s in recorder.stages] == ["schedule", "rosters", "lineups", "stats", "scoring", "standings"]
+    assert all(s["queries"] > 0 for s in recorder.stages)
+    # The throwaway database was only passed down; the app's sessions are untouched
+    assert scraper_bridge.SessionLocal is session_local
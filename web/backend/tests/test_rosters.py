@@ -0,0 +1,108 @@
+"""
+Tests for lineups_scraper.scrape_rosters with iihf.com replaced by canned pages:
+the concurrency cap on roster fetches and the sequential retry of teams answered
+with a Cloudflare challenge.
+"""
+
+import threading
+from pathlib import Path
+
+import pytest
+import scraper_bridge  # noqa: F401  (puts the repo root on sys.path)
+
+pytest.importorskip("gspread")
+pytest.importorskip("oauth2client")
+import lineups_scraper  # noqa: E402
+from config import ROSTER_CHALLENGE_RETRIES, ROSTER_MAX_WORKERS  # noqa: E402
+
+PAGES = Path(__file__).parent / "fixtures" / "replay"
+CHAMPIONSHIP = "https://www.iihf.com/en/events/2026/wm"
+CHALLENGE = b"<html><title>Just a moment...</title><script src='/cdn-cgi/challenge-platform/x.js'></script></html>"
+
+
+class FakeResponse:
+    def __init__(self, content, status_code=200, headers=None):
+        self.content = content
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    @property
+    def text(self):
+        return self.content.decode()
+
+
+class FakeIIHF:
+    """Serves the replay fixture pages; `challenges` maps team abbr -> challenge responses to send first."""
+
+    def __init__(self, challenges=None):
+        self.challenges = dict(challenges or {})
+        self.lock = threading.Lock()
+        self.running = self.peak = 0
+        self.requests = []
+
+    def get(self, url):
+        with self.lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+            self.requests.append(url)
+        threading.Event().wait(0.01)  # time.sleep is patched to record the retry backoff
+        with self.lock:
+            self.running -= 1
+            if url == CHAMPIONSHIP:
+                return FakeResponse(b"<html>home</html>")
+            if url.endswith("/teams"):
+                return FakeResponse((PAGES / "teams.html").read_bytes())
+            abbr = url.rstrip("/").split("/")[-1]
+            if self.challenges.get(abbr):
+                self.challenges[abbr] -= 1
+                return FakeResponse(CHALLENGE, 403, {"cf-mitigated": "challenge"} if abbr == "FIN" else {})
+            return FakeResponse((PAGES / "roster" / f"{abbr}.html").read_bytes())
+
+
+@pytest.fixture()
+def iihf(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(lineups_scraper, "archive_page", lambda *args, **kwargs: None)
+    monkeypatch.setattr(lineups_scraper.time, "sleep", sleeps.append)
+
+    def install(**kwargs):
+        site = FakeIIHF(**kwargs)
+        site.sleeps = sleeps
+        monkeypatch.setattr(lineups_scraper, "make_session", lambda championship_url: site)
+        return site
+    return install
+
+
+def test_is_challenge():
+    assert lineups_scraper.is_challenge(FakeResponse(b"", 403, {"cf-mitigated": "challenge"}))
+    assert lineups_scraper.is_challenge(FakeResponse(CHALLENGE, 503))
+    assert lineups_scraper.is_challenge(FakeResponse(b"slow down", 429))
+    assert not lineups_scraper.is_challenge(FakeResponse(b"<html>Forbidden</html>", 403))
+    assert not lineups_scraper.is_challenge(FakeResponse(b"<html>Just a moment...</html>", 200))
+
+
+def test_roster_fetches_are_capped(iihf):
+    site = iihf()
+    df = lineups_scraper.scrape_rosters(CHAMPIONSHIP, max_workers=8)
+    assert sorted(df["team_abbr"].unique()) == ["CAN", "FIN", "SWE"]
+    assert site.peak <= ROSTER_MAX_WORKERS
+    assert site.sleeps == []
+
+
+def test_challenged_teams_are_retried_one_at_a_time(iihf):
+    site = iihf(challenges={"FIN": 2, "SWE": 1})
+    df = lineups_scraper.scrape_rosters(CHAMPIONSHIP)
+
+    assert sorted(df["team_abbr"].unique()) == ["CAN", "FIN", "SWE"]
+    # FIN: challenged twice, SWE once; each team's retries back off further
+    assert len([url for url in site.requests if url.endswith("/FIN")]) == 3
+    assert sorted(site.sleeps) == sorted([
+        lineups_scraper.ROSTER_RETRY_DELAY * 1, lineups_scraper.ROSTER_RETRY_DELAY * 2,
+        lineups_scraper.ROSTER_RETRY_DELAY * 1,
+    ])
+
+
+def test_still_challenged_team_fails_the_scrape(iihf):
+    iihf(challenges={"CAN": ROSTER_CHALLENGE_RETRIES + 1})
+    with pytest.raises(lineups_scraper.ChallengePage, match="CAN: still challenged"):
+        lineups_scraper.scrape_rosters(CHAMPIONSHIP)
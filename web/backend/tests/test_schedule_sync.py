@@ -0,0 +1,126 @@
+"""
+Tests for the incremental schedule sync in scraper_bridge.import_matches_to_db.
+
+match_urls.csv rows are matched to DB matches by the game id in the gamecenter URL;
+only added, changed or removed games are written.
+"""
+
+import pandas as pd
+import pytest
+import scraper_bridge
+from app.models import Match, PlayerStat, Player
+
+BASE = "https://www.iihf.com/en/events/2026/wm/gamecenter"
+
+
+def _row(game_id, day, date, time, home, away, phase="PreliminaryRound"):
+    return {
+        "Day": day,
+        "game_id": str(game_id),
+        "date": date,
+        "time": time,
+        "home_team": home,
+        "away_team": away,
+        "phase": phase,
+        "url_playbyplay": f"{BASE}/playbyplay/{game_id}/",
+        "url_statistics": f"{BASE}/statistics/{game_id}/",
+    }
+
+
+@pytest.fixture()
+def sync(db, tmp_path, monkeypatch):
+    """Return a function that writes rows to a CSV and runs the sync against the test DB."""
+    monkeypatch.setattr(scraper_bridge, "SessionLocal", lambda: db)
+    csv_path = tmp_path / "match_urls.csv"
+
+    def _sync(rows):
+        pd.DataFrame(rows, columns=list(_row(0, 0, "", "", "", ""))).to_csv(csv_path, index=False)
+        return scraper_bridge.import_matches_to_db(csv_path)
+
+    return _sync
+
+
+def test_initial_import(sync, db):
+    rows = [_row(1, 1, "9 May", "16:20", "CAN", "USA"), _row(2, 1, "9 May", "20:20", "FIN", "SWE")]
+    assert sync(rows) == (2, 0, 0)
+    assert db.query(Match).count() == 2
+
+
+def test_resync_unchanged_is_noop(sync):
+    rows = [_row(1, 1, "9 May", "16:20", "CAN", "USA")]
+    sync(rows)
+    assert sync(rows) == (0, 0, 0)
+
+
+def test_changed_and_added_games(sync, db):
+    sync([_row(1, 1, "9 May", "16:20", "CAN", "USA")])
+    # Time moved and a playoff game appeared
+    result = sync([
+        _row(1, 1, "9 May", "17:20", "CAN", "USA"),
+        _row(50, 9, "21 May", "19:20", "CAN", "FIN", phase="Quarterfinals"),
+    ])
+    assert result == (1, 1, 0)
+    moved = db.query(Match).filter(Match.home_team == "CAN", Match.day == 1).one()
+    assert moved.match_time.strftime("%H:%M") == "17:20"
+    playoff = db.query(Match).filter(Match.day == 9).one()
+    assert playoff.stage == "playoff"
+
+
+def test_removed_game_with_stats_is_kept(sync, db):
+    sync([_row(1, 1, "9 May", "16:20", "CAN", "USA"), _row(2, 1, "9 May", "20:20", "FIN", "SWE")])
+    played = db.query(Match).filter(Match.home_team == "CAN").one()
+    player = Player(name="P", position="Forward", team_abbr="CAN", championship_year=2026)
+    db.add(player)
+    db.flush()
+    db.add(PlayerStat(player_id=player.id, match_id=played.id))
+    db.commit()
+
+    assert sync([]) == (0, 0, 1)
+    assert [m.home_team for m in db.query(Match).all()] == ["CAN"]
+
+
+def test_unparseable_date_is_skipped_and_game_kept(sync, db, capsys):
+    sync([_row(1, 1, "9 May", "16:20", "CAN", "USA"), _row(2, 1, "9 May", "20:20", "FIN", "SWE")])
+    before = db.query(Match).filter(Match.home_team == "CAN").one().match_time
+
+    # A garbled cell neither moves the game to "now" nor removes it
+    result = sync([_row(1, 1, "TBD", "16:20", "CAN", "USA"), _row(2, 1, "9 May", "21:20", "FIN", "SWE")])
+    assert result == (0, 1, 0)
+    assert "Skipping schedule row 1:" in capsys.readouterr().out
+    assert db.query(Match).filter(Match.home_team == "CAN").one().match_time == before
+
+    # Blank cells read back as NaN; such a game is not inserted either
+    rows = [_row(1, 1, "9 May", "16:20", "CAN", "USA"), _row(2, 1, "9 May", "21:20", "FIN", "SWE")]
+    assert sync(rows + [_row(3, 2, "", "", "CZE", "SVK")]) == (0, 0, 0)
+    assert db.query(Match).count() == 2
+
+
+def test_empty_url_cells_are_stored_as_none(sync, db):
+    row = {**_row(1, 1, "9 May", "16:20", "CAN", "USA"), "game_id": "", "url_playbyplay": "", "url_statistics": ""}
+    assert sync([row]) == (1, 0, 0)
+    match = db.query(Match).one()
+    assert match.url_playbyplay is None and match.url_statistics is None
+    # pandas reads the blanks back as NaN; they must compare equal to the stored NULLs
+    assert sync([row]) == (0, 0, 0)
+
+
+def test_diff_schedule_ignores_missing_and_repeated_game_ids(capsys):
+    from url_scraper import diff_schedule
+
+    stored = pd.DataFrame([
+        _row(1, 1, "9 May", "16:20", "CAN", "USA"),
+        _row(2, 1, "9 May", "20:20", "FIN", "SWE"),
+        {**_row(3, 1, "9 May", "12:20", "CZE", "SVK"), "game_id": None},
+    ])
+    new = pd.DataFrame([
+        _row(1, 1, "9 May", "16:20", "CAN", "USA"),
+        _row(2, 1, "9 May", "20:20", "FIN", "SWE"),
+        _row(2, 1, "9 May", "21:20", "FIN", "SWE"),  # repeated: the last row wins
+        {**_row(4, 2, "10 May", "12:20", "LAT", "NOR"), "game_id": float("nan")},
+    ])
+    added, changed, removed = diff_schedule(stored, new)
+
+    assert added.empty and removed.empty
+    assert list(changed["game_id"]) == ["2"] and list(changed["time"]) == ["21:20"]
+    out = capsys.readouterr().out
+    assert "1 stored schedule rows" in out and "2 new schedule rows" in out
@@ -0,0 +1,182 @@
+"""
+Tests for the Google Sheets sync scripts against fake_sheets.FakeSheets: the
+final sheet contents and the API requests each step costs.
+
+download_sheet_data  - one values_get per owner, failures reported per owner
+update_sestavy_sheet - first sync, no-op resync, Owner-Sestava header migration
+upload_to_spreadsheets - Lineups rewritten in place, created where missing
+
+The Day worksheet flush is covered in test_day_sheet_writer.py.
+"""
+
+import pandas as pd
+import pytest
+import scraper_bridge  # noqa: F401  (puts the repo root on sys.path)
+
+pytest.importorskip("gspread")
+pytest.importorskip("oauth2client")
+import config  # noqa: E402
+import sheets_client  # noqa: E402
+from fake_sheets import FakeSheets  # noqa: E402
+from download_sheets_data import download_sheet_data_with_errors  # noqa: E402
+from update_sestavy_sheet import update_sestavy_sheet  # noqa: E402
+from lineups_scraper import upload_to_spreadsheets  # noqa: E402
+
+LINEUP_HEADERS = ["Sestava", "Day", "G", "D1", "F1", "Captain"]
+SESTAVY_HEADERS = ["Owner", "Sestava", "Owner-Sestava", "Day", "G", "D1", "F1", "Captain"]
+
+
+def _owner_rows(owner):
+    return [
+        LINEUP_HEADERS,
+        ["S1", 1, f"{owner} G", f"{owner} D", f"{owner} F", f"{owner} F"],
+        ["S2", 1, f"{owner} G2", f"{owner} D2", f"{owner} F2", f"{owner} D2"],
+    ]
+
+
+@pytest.fixture()
+def fake():
+    """FakeSheets with the main spreadsheet and two owners, installed as the shared client."""
+    fake = FakeSheets()
+    fake.main = fake.create_spreadsheet(config.MAIN_SPREADSHEET)
+    owners = {
+        owner: fake.create_spreadsheet(owner, sheets={config.TEST_SHEET: _owner_rows(owner)})
+        for owner in ("Ondra", "Petr")
+    }
+    # The sync modules imported config.SPREADSHEETS by reference; swap its contents
+    saved = dict(config.SPREADSHEETS)
+    config.SPREADSHEETS.clear()
+    config.SPREADSHEETS.update(owners)
+    sheets_client.use_client(fake.client())
+    yield fake
+    config.SPREADSHEETS.clear()
+    config.SPREADSHEETS.update(saved)
+    sheets_client.use_client(None)
+
+
+def test_download_reports_failed_owners_and_keeps_the_rest(fake):
+    config.SPREADSHEETS["Missing"] = "no-such-key"
+    config.SPREADSHEETS["NoTestSheet"] = fake.create_spreadsheet("NoTestSheet", sheets={"Other": [["x"]]})
+    config.SPREADSHEETS["Empty"] = fake.create_spreadsheet("Empty", sheets={config.TEST_SHEET: [LINEUP_HEADERS]})
+
+    combined, errors = download_sheet_data_with_errors()
+
+    assert list(combined.columns) == ["Owner"] + LINEUP_HEADERS
+    assert list(combined["Owner"]) == ["Ondra", "Ondra", "Petr", "Petr"]
+    assert combined.loc[0, "Day"] == 1  # numbers numericised like get_all_records() did
+    assert set(errors) == {"Missing", "NoTestSheet"}
+    assert "Check if the ID is correct" in errors["Missing"]
+    assert errors["NoTestSheet"] == f"Sheet '{config.TEST_SHEET}' not found in 'NoTestSheet' spreadsheet"
+    assert dict(fake.calls) == {"open_by_key": 5, "values_get": 4}
+
+
+def test_download_reads_values_as_displayed(fake):
+    # A checkbox is read as its displayed text, not as a bool, and numbers are numericised
+    sheet = fake._spreadsheets[config.SPREADSHEETS["Ondra"]].sheets[config.TEST_SHEET]
+    sheet.resize(cols=len(LINEUP_HEADERS) + 2)
+    sheet.write(1, len(LINEUP_HEADERS) + 1, [["Confirmed", "Note"], [True, "9.5.2026"]], "RAW")
+    sheet.write(2, 2, [[2.5]], "RAW")
+
+    combined, errors = download_sheet_data_with_errors()
+
+    assert errors == {}
+    assert combined.loc[0, ["Day", "Confirmed", "Note"]].tolist() == [2.5, "TRUE", "9.5.2026"]
+    assert combined.loc[1, "Day"] == 1 and combined.loc[1, "Confirmed"] == ""
+
+
+def test_sestavy_first_sync_then_noop_resync(fake):
+    update_sestavy_sheet()
+
+    rows = fake.sheet_values(fake.main, config.SESTAVY_SHEET)
+    assert rows[0] == SESTAVY_HEADERS
+    assert rows[1:] == [
+        ["Ondra", "S1", "Ondra-S1", "1", "Ondra G", "Ondra D", "Ondra F", "Ondra F"],
+        ["Ondra", "S2", "Ondra-S2", "1", "Ondra G2", "Ondra D2", "Ondra F2", "Ondra D2"],
+        ["Petr", "S1", "Petr-S1", "1", "Petr G", "Petr D", "Petr F", "Petr F"],
+        ["Petr", "S2", "Petr-S2", "1", "Petr G2", "Petr D2", "Petr F2", "Petr D2"],
+    ]
+    assert dict(fake.calls) == {
+        "open_by_key": 2, "values_get": 2,                       # owners
+        "open": 1, "worksheet": 1, "add_worksheet": 1,           # main spreadsheet, Sestavy created
+        "get_all_values": 1, "append_row": 1, "values_batch_update": 1,
+    }
+
+    fake.reset_counters()
+    update_sestavy_sheet()
+    assert fake.sheet_values(fake.main, config.SESTAVY_SHEET) == rows
+    # Cached handles and nothing blank to fill: one read per owner plus one of Sestavy
+    assert dict(fake.calls) == {"values_get": 2, "get_all_values": 1}
+
+
+def test_sestavy_only_fills_blank_cells(fake):
+    update_sestavy_sheet()
+    main = fake._spreadsheets[fake.main].sheets[config.SESTAVY_SHEET]
+    main.write(2, 5, [["Changed by hand"]], "RAW")  # Ondra S1 goalie
+    main.write(3, 5, [[""]], "RAW")                 # Ondra S2 goalie cleared
+    fake.reset_counters()
+
+    update_sestavy_sheet()
+    rows = fake.sheet_values(fake.main, config.SESTAVY_SHEET)
+    assert (rows[1][4], rows[2][4]) == ("Changed by hand", "Ondra G2")
+    assert fake.calls["values_batch_update"] == 1
+
+
+def test_sestavy_migrates_header_without_owner_sestava(fake):
+    old_headers = ["Owner", "Sestava", "Day", "G", "D1", "F1", "Captain"]
+    fake._spreadsheets[fake.main].add(config.SESTAVY_SHEET, 1000, len(old_headers))
+    fake._spreadsheets[fake.main].sheets[config.SESTAVY_SHEET].write(1, 1, [
+        old_headers,
+        ["Ondra", "S1", 1, "Ondra G", "", "Ondra F", "Ondra F"],
+    ], "RAW")
+
+    update_sestavy_sheet()
+
+    rows = fake.sheet_values(fake.main, config.SESTAVY_SHEET)
+    assert rows[0] == SESTAVY_HEADERS
+    # Existing data moved right with its headers; the blank D1 and the new column were filled
+    assert rows[1] == ["Ondra", "S1", "Ondra-S1", "1", "Ondra G", "Ondra D", "Ondra F", "Ondra F"]
+    assert len(rows) == 5
+    # One add_cols for the wider grid, one batch for the moved block, one for the blank cells
+    assert (fake.calls["add_cols"], fake.calls["values_batch_update"], fake.calls["append_row"]) == (1, 2, 0)
+
+
+def _roster(names):
+    return pd.DataFrame({
+        "name": names,
+        "position": ["Forward", None, "Goalkeeper"][:len(names)],
+        "country": "CAN",
+        "team_abbr": "CAN",
+    })
+
+
+def test_upload_rewrites_lineups_in_place_and_creates_missing(fake):
+    ondra = config.SPREADSHEETS["Ondra"]
+    old = [["name", "position", "country", "team_abbr"]] + [[f"Old {i}", "Forward", "FIN", "FIN"] for i in range(5)]
+    fake._spreadsheets[ondra].add(config.LINEUPS_SHEET, 6, 4).write(1, 1, old, "RAW")
+    sheet_id = fake._spreadsheets[ondra].sheets[config.LINEUPS_SHEET].id
+
+    assert upload_to_spreadsheets(_roster(["Ann", "Bo", "Cid"]), max_workers=2) == {}
+
+    expected = [
+        ["name", "position", "country", "team_abbr"],
+        ["Ann", "Forward", "CAN", "CAN"], ["Bo", "", "CAN", "CAN"], ["Cid", "Goalkeeper", "CAN", "CAN"],
+    ]
+    for owner in ("Ondra", "Petr"):
+        assert fake.sheet_values(config.SPREADSHEETS[owner], config.LINEUPS_SHEET) == expected
+    # Same worksheet (formulas pointing at it stay valid), leftover rows blanked in the same write
+    assert fake._spreadsheets[ondra].sheets[config.LINEUPS_SHEET].id == sheet_id
+    assert dict(fake.calls) == {
+        "open_by_key": 2, "worksheet": 2, "add_worksheet": 1, "values_batch_update": 2,
+    }
+
+
+def test_upload_grows_a_small_sheet_and_reports_failures(fake):
+    ondra = config.SPREADSHEETS["Ondra"]
+    fake._spreadsheets[ondra].add(config.LINEUPS_SHEET, 2, 2)
+    config.SPREADSHEETS["Missing"] = "no-such-key"
+
+    errors = upload_to_spreadsheets(_roster(["Ann", "Bo", "Cid"]), max_workers=3)
+
+    assert set(errors) == {"Missing"}
+    assert len(fake.sheet_values(ondra, config.LINEUPS_SHEET)) == 4
+    assert fake.calls["resize"] == 1
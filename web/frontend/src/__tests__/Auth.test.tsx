@@ -22,6 +22,8 @@ vi.mock("../api/client", () => ({
   signup: vi.fn(),
   getMe: vi.fn(),
   getPlayers: vi.fn(),
+  getDashboard: vi.fn(),
+  searchPlayers: vi.fn(),
   getTodaysMatches: vi.fn(),
   getMyLineup: vi.fn(),
   saveLineup: vi.fn(),
@@ -1,7 +1,7 @@
 /**
  * Tests for the Dashboard page.
  *
- * Dashboard calls getTodaysMatches and getMyLineup on mount.
+ * Dashboard calls getDashboard on mount.
  * We mock ../api/client so those calls are controlled.
  *
  * Assertions:
@@ -9,6 +9,7 @@
  *   2. Clicking a "Pick Forward" slot opens the PlayerPickerModal
  *      (identified by the "Search by name" input that only appears in the modal)
  *   3. Save button is disabled when no players are selected
+ *   4. next_lock_at and usages from /dashboard are shown
  */
 
 import { describe, it, expect, vi, beforeEach } from "vitest";
@@ -21,6 +22,8 @@ vi.mock("../api/client", () => ({
   signup: vi.fn(),
   getMe: vi.fn(),
   getPlayers: vi.fn(),
+  searchPlayers: vi.fn(),
+  getDashboard: vi.fn(),
   getTodaysMatches: vi.fn(),
   getMatches: vi.fn(),
   getMyLineup: vi.fn(),
@@ -40,9 +43,11 @@ describe("Dashboard", () => {
   beforeEach(() => {
     vi.clearAllMocks();
 
-    vi.mocked(apiClient.getTodaysMatches).mockResolvedValue({ data: [] } as any);
-    vi.mocked(apiClient.getMyLineup).mockResolvedValue({
-      data: { day: 1, lineup: [] },
+    vi.mocked(apiClient.getDashboard).mockResolvedValue({
+      data: {
+        day: 1, server_time: "2026-05-01T10:00:00", next_lock_at: null,
+        matches: [], locked_teams: [], lineup: [], usages: [],
+      },
     } as any);
     // Modal calls getPlayers when opened
     vi.mocked(apiClient.getPlayers).mockResolvedValue({ data: [] } as any);
@@ -105,4 +110,32 @@ describe("Dashboard", () => {
       expect(saveBtn).toBeDisabled();
     });
   });
+
+  it("shows the next lock and remaining usages from the dashboard payload", async () => {
+    // Naive UTC timestamps, as the API sends them; the server clock is 10 minutes ahead
+    const utc = (ms: number) => new Date(ms).toISOString().replace("Z", "");
+    const serverNow = Date.now() + 10 * 60_000;
+    vi.mocked(apiClient.getDashboard).mockResolvedValue({
+      data: {
+        day: 2, server_time: utc(serverNow), next_lock_at: utc(serverNow + 90 * 60_000 + 30_000),
+        matches: [], locked_teams: [],
+        lineup: [{
+          player_id: 7, is_captain: false, locked: false,
+          player: { id: 7, name: "McDavid Connor", position: "Forward", team_abbr: "CAN", championship_year: 2026 },
+        }],
+        usages: [{ player_id: 7, stage: "group", used: 1, limit: 2, remaining: 1 }],
+      },
+    } as any);
+
+    render(
+      <Wrapper>
+        <Dashboard />
+      </Wrapper>
+    );
+
+    await waitFor(() => {
+      expect(screen.getByTestId("next-lock")).toHaveTextContent("Next match locks in 1h 30m");
+      expect(screen.getByTestId("usage")).toHaveTextContent("1/2 group picks left");
+    });
+  });
 });
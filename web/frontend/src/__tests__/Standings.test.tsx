@@ -0,0 +1,93 @@
+/**
+ * Tests for the Standings page's live updates.
+ *
+ * EventSource is replaced by a stub whose "scores" listener the test calls
+ * directly with a delta, as /live/scores would send it.
+ *
+ * Assertions:
+ *   1. A delta for users already listed updates their totals and order in place
+ *   2. A delta naming a user missing from the table refetches the standings
+ */
+
+import { describe, it, expect, vi, beforeEach, afterEach } from "vitest";
+import { act, render, screen, waitFor } from "@testing-library/react";
+
+vi.mock("../api/client", () => ({
+  getStandings: vi.fn(),
+  liveScoresUrl: () => "/live/scores",
+}));
+
+vi.mock("../context/AuthContext", () => ({
+  useAuth: () => ({ user: null }),
+}));
+
+import * as apiClient from "../api/client";
+import Standings from "../pages/Standings";
+
+type Listener = (e: MessageEvent) => void;
+
+class FakeEventSource {
+  static last: FakeEventSource | null = null;
+  listeners: Record<string, Listener> = {};
+  constructor(public url: string) {
+    FakeEventSource.last = this;
+  }
+  addEventListener(type: string, listener: Listener) {
+    this.listeners[type] = listener;
+  }
+  close() {}
+  emit(delta: unknown) {
+    act(() => this.listeners.scores({ data: JSON.stringify(delta) } as MessageEvent));
+  }
+}
+
+const entry = (user_id: string, username: string, total_points: number, rank: number) => ({
+  user_id, username, total_points, rank, scores_by_day: {},
+});
+
+const delta = (users: { user_id: string; username: string; total_points: number; rank: number }[]) => ({
+  version: 2, players: [], users: users.map((u) => ({ ...u, previous_rank: null })),
+});
+
+describe("Standings live updates", () => {
+  beforeEach(() => {
+    vi.clearAllMocks();
+    vi.stubGlobal("EventSource", FakeEventSource);
+    vi.mocked(apiClient.getStandings).mockResolvedValue({
+      data: [entry("u1", "alice", 20, 1), entry("u2", "bob", 10, 2)],
+    } as any);
+  });
+
+  afterEach(() => {
+    vi.unstubAllGlobals();
+  });
+
+  it("applies a delta for listed users without refetching", async () => {
+    render(<Standings />);
+    await waitFor(() => expect(screen.getByText("bob")).toBeInTheDocument());
+
+    FakeEventSource.last!.emit(delta([
+      { user_id: "u2", username: "bob", total_points: 30, rank: 1 },
+      { user_id: "u1", username: "alice", total_points: 20, rank: 2 },
+    ]));
+
+    await waitFor(() => {
+      const names = screen.getAllByText(/^(alice|bob)$/).map((el) => el.textContent);
+      expect(names).toEqual(["bob", "alice"]);
+    });
+    expect(apiClient.getStandings).toHaveBeenCalledTimes(1);
+  });
+
+  it("refetches when a delta names a user missing from the table", async () => {
+    render(<Standings />);
+    await waitFor(() => expect(screen.getByText("bob")).toBeInTheDocument());
+
+    vi.mocked(apiClient.getStandings).mockResolvedValue({
+      data: [entry("u3", "carol", 25, 1), entry("u1", "alice", 20, 2), entry("u2", "bob", 10, 3)],
+    } as any);
+    FakeEventSource.last!.emit(delta([{ user_id: "u3", username: "carol", total_points: 25, rank: 1 }]));
+
+    await waitFor(() => expect(screen.getByText("carol")).toBeInTheDocument());
+    expect(apiClient.getStandings).toHaveBeenCalledTimes(2);
+  });
+});
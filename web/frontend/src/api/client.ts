@@ -1,6 +1,6 @@
 import axios from "axios";
 import type {
-  User, Player, Match, LineupResponse, StandingEntry, UserDayScore
+  User, Player, Match, LineupResponse, StandingEntry, UserDayScore, DashboardResponse
 } from "../types";
 
 const api = axios.create({
@@ -45,6 +45,13 @@ export const getMe = () => api.get<User>("/auth/me");
 export const getPlayers = (position?: string, team?: string, day?: number) =>
   api.get<Player[]>("/players", { params: { position, team, day } });
 
+export const searchPlayers = (q: string, position?: string, team?: string, day?: number, limit?: number) =>
+  api.get<Player[]>("/players/search", { params: { q, position, team, day, limit } });
+
+// Today's matches, the lineup with lock flags and remaining usages in one round trip
+export const getDashboard = (day?: number) =>
+  api.get<DashboardResponse>("/dashboard", { params: { day } });
+
 export const getTodaysMatches = () => api.get<Match[]>("/matches/today");
 
 export const getMatches = (day?: number) =>
@@ -60,4 +67,7 @@ export const saveLineup = (
 
 export const getStandings = () => api.get<StandingEntry[]>("/scores/standings");
 
+// Server-sent events: "snapshot" on connect, then "scores" deltas (see LiveScoresDelta)
+export const liveScoresUrl = () => `${api.defaults.baseURL}/live/scores`;
+
 export const getMyScores = () => api.get<UserDayScore[]>("/scores/me");
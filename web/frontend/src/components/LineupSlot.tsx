@@ -1,4 +1,4 @@
-import type { Player, Position } from "../types";
+import type { Player, PlayerUsage, Position } from "../types";
 import PlayerCard from "./PlayerCard";
 
 interface Props {
@@ -7,12 +7,13 @@ interface Props {
   player: Player | null;
   isCaptain: boolean;
   isLocked: boolean;
+  usage?: PlayerUsage;
   onPick: () => void;
   onRemove: () => void;
   onToggleCaptain: () => void;
 }
 
-export default function LineupSlot({ position, label, player, isCaptain, isLocked, onPick, onRemove, onToggleCaptain }: Props) {
+export default function LineupSlot({ position, label, player, isCaptain, isLocked, usage, onPick, onRemove, onToggleCaptain }: Props) {
   const posColor: Record<Position, string> = {
     Forward: "text-blue-400",
     Defender: "text-green-400",
@@ -29,13 +30,23 @@ export default function LineupSlot({ position, label, player, isCaptain, isLocke
       </div>
 
       {player ? (
-        <PlayerCard
-          player={player}
-          isCaptain={isCaptain}
-          isLocked={isLocked}
-          onRemove={isLocked ? undefined : onRemove}
-          onToggleCaptain={onToggleCaptain}
-        />
+        <>
+          <PlayerCard
+            player={player}
+            isCaptain={isCaptain}
+            isLocked={isLocked}
+            onRemove={isLocked ? undefined : onRemove}
+            onToggleCaptain={onToggleCaptain}
+          />
+          {usage && (
+            <p
+              data-testid="usage"
+              className={`text-xs mt-1 ${usage.remaining > 0 ? "text-gray-400" : "text-red-400"}`}
+            >
+              {usage.remaining}/{usage.limit} {usage.stage} picks left
+            </p>
+          )}
+        </>
       ) : (
         <button
           onClick={onPick}
@@ -1,5 +1,5 @@
 import { useEffect, useState } from "react";
-import { getPlayers } from "../api/client";
+import { getPlayers, searchPlayers } from "../api/client";
 import type { Player, Position } from "../types";
 
 interface Props {
@@ -14,18 +14,34 @@ export default function PlayerPickerModal({ position, alreadySelectedIds, day, o
   const [players, setPlayers] = useState<Player[]>([]);
   const [search, setSearch] = useState("");
   const [teamFilter, setTeamFilter] = useState("");
+  const [results, setResults] = useState<Player[] | null>(null);
 
   useEffect(() => {
     getPlayers(position, undefined, day).then((res) => setPlayers(res.data));
   }, [position, day]);
 
+  // Typed queries go to the server-side index (accent-insensitive) instead of filtering the full list
+  useEffect(() => {
+    const q = search.trim();
+    if (!q) {
+      setResults(null);
+      return;
+    }
+    let cancelled = false;
+    const timer = setTimeout(() => {
+      searchPlayers(q, position, teamFilter || undefined, day, 30).then((res) => {
+        if (!cancelled) setResults(res.data);
+      });
+    }, 150);
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [search, position, teamFilter, day]);
+
   const teams = [...new Set(players.map((p) => p.team_abbr))].sort();
 
-  const filtered = players.filter((p) => {
-    const matchesSearch = p.name.toLowerCase().includes(search.toLowerCase());
-    const matchesTeam = !teamFilter || p.team_abbr === teamFilter;
-    return matchesSearch && matchesTeam;
-  });
+  const filtered = results ?? players.filter((p) => !teamFilter || p.team_abbr === teamFilter);
 
   return (
     <div className="fixed inset-0 bg-black/70 flex items-center justify-center z-50 p-4">
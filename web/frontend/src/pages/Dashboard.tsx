@@ -1,9 +1,9 @@
-import { useEffect, useState, useCallback } from "react";
-import { getTodaysMatches, getMyLineup, saveLineup } from "../api/client";
-import type { Match, Player, LineupEntry, Position } from "../types";
+import { useEffect, useState, useCallback, useRef } from "react";
+import { getDashboard, saveLineup } from "../api/client";
+import type { Match, Player, LineupEntry, PlayerUsage, Position } from "../types";
 import LineupSlot from "../components/LineupSlot";
 import PlayerPickerModal from "../components/PlayerPickerModal";
-import MatchCountdown from "../components/MatchCountdown";
+import MatchCountdown, { formatCountdown } from "../components/MatchCountdown";
 
 interface SlotDef {
   key: string;
@@ -23,6 +23,9 @@ const SLOTS: SlotDef[] = [
 type SlotMap = Record<string, Player | null>;
 type CaptainKey = string | null;
 
+// The API sends naive UTC timestamps
+const parseUtc = (iso: string) => new Date(/(Z|[+-]\d\d:\d\d)$/.test(iso) ? iso : `${iso}Z`).getTime();
+
 export default function Dashboard() {
   const [matches, setMatches] = useState<Match[]>([]);
   const [day, setDay] = useState<number>(1);
@@ -31,6 +34,10 @@ export default function Dashboard() {
   );
   const [captainKey, setCaptainKey] = useState<CaptainKey>(null);
   const [lockedIds, setLockedIds] = useState<Set<number>>(new Set());
+  const [usages, setUsages] = useState<Map<number, PlayerUsage>>(new Map());
+  // Next lock on the local clock, corrected by the server's clock at load time
+  const [nextLockAt, setNextLockAt] = useState<number | null>(null);
+  const [now, setNow] = useState(() => Date.now());
   const [pickerSlot, setPickerSlot] = useState<SlotDef | null>(null);
   const [saving, setSaving] = useState(false);
   const [toast, setToast] = useState<{ msg: string; ok: boolean } | null>(null);
@@ -40,65 +47,73 @@ export default function Dashboard() {
     setTimeout(() => setToast(null), 3000);
   };
 
-  const loadMatches = useCallback(async () => {
-    try {
-      const res = await getTodaysMatches();
-      setMatches(res.data);
-      if (res.data.length > 0) setDay(res.data[0].day);
-    } catch {
-      // no matches today or offline
+  const applyLineup = useCallback((lineup: LineupEntry[]) => {
+    const newSlots: SlotMap = Object.fromEntries(SLOTS.map((s) => [s.key, null]));
+    let newCaptain: CaptainKey = null;
+
+    // Map saved entries back into slots by position order
+    const byPosition: Record<Position, LineupEntry[]> = { Forward: [], Defender: [], Goalkeeper: [] };
+    for (const entry of lineup) {
+      byPosition[entry.player.position as Position]?.push(entry);
     }
-  }, []);
 
-  const loadLineup = useCallback(async (d: number) => {
-    try {
-      const res = await getMyLineup(d);
-      const newSlots: SlotMap = Object.fromEntries(SLOTS.map((s) => [s.key, null]));
-      let newCaptain: CaptainKey = null;
-
-      // Map saved entries back into slots by position order
-      const byPosition: Record<Position, LineupEntry[]> = { Forward: [], Defender: [], Goalkeeper: [] };
-      for (const entry of res.data.lineup) {
-        byPosition[entry.player.position as Position]?.push(entry);
-      }
+    const posSlots: Record<Position, string[]> = {
+      Forward: ["f1", "f2", "f3"],
+      Defender: ["d1", "d2"],
+      Goalkeeper: ["gk"],
+    };
 
-      const posSlots: Record<Position, string[]> = {
-        Forward: ["f1", "f2", "f3"],
-        Defender: ["d1", "d2"],
-        Goalkeeper: ["gk"],
-      };
-
-      for (const pos of ["Forward", "Defender", "Goalkeeper"] as Position[]) {
-        byPosition[pos].forEach((entry, i) => {
-          const key = posSlots[pos][i];
-          if (key) {
-            newSlots[key] = entry.player;
-            if (entry.is_captain) newCaptain = key;
-          }
-        });
-      }
+    for (const pos of ["Forward", "Defender", "Goalkeeper"] as Position[]) {
+      byPosition[pos].forEach((entry, i) => {
+        const key = posSlots[pos][i];
+        if (key) {
+          newSlots[key] = entry.player;
+          if (entry.is_captain) newCaptain = key;
+        }
+      });
+    }
+
+    const newLocked = new Set<number>();
+    for (const entry of lineup) {
+      if (entry.locked) newLocked.add(entry.player_id);
+    }
+    setLockedIds(newLocked);
+    setSlots(newSlots);
+    setCaptainKey(newCaptain);
+  }, []);
 
-      const newLocked = new Set<number>();
-      for (const entry of res.data.lineup) {
-        if (entry.locked) newLocked.add(entry.player_id);
+  // Matches, lineup, locks, usages and the next lock in one request. The lineup is
+  // applied only when the day changes, so the periodic refresh doesn't overwrite
+  // unsaved picks.
+  const lineupDay = useRef<number | null>(null);
+  const loadDashboard = useCallback(async () => {
+    try {
+      const res = await getDashboard();
+      const clockOffset = Date.now() - parseUtc(res.data.server_time);
+      setMatches(res.data.matches);
+      setDay(res.data.day);
+      setUsages(new Map(res.data.usages.map((u): [number, PlayerUsage] => [u.player_id, u])));
+      setNextLockAt(res.data.next_lock_at ? parseUtc(res.data.next_lock_at) + clockOffset : null);
+      setNow(Date.now());
+      if (lineupDay.current !== res.data.day) {
+        lineupDay.current = res.data.day;
+        applyLineup(res.data.lineup);
       }
-      setLockedIds(newLocked);
-      setSlots(newSlots);
-      setCaptainKey(newCaptain);
     } catch {
-      // no lineup yet
+      // offline
     }
-  }, []);
+  }, [applyLineup]);
 
   useEffect(() => {
-    loadMatches();
-    const interval = setInterval(loadMatches, 60_000);
+    loadDashboard();
+    const interval = setInterval(loadDashboard, 60_000);
     return () => clearInterval(interval);
-  }, [loadMatches]);
+  }, [loadDashboard]);
 
   useEffect(() => {
-    loadLineup(day);
-  }, [day, loadLineup]);
+    const tick = setInterval(() => setNow(Date.now()), 30_000);
+    return () => clearInterval(tick);
+  }, []);
 
   const selectedIds = new Set(
     Object.values(slots).filter(Boolean).map((p) => p!.id)
@@ -152,6 +167,11 @@ export default function Dashboard() {
       <p className="text-gray-400 text-sm mb-4">
         Pick up to 6 players from matches that haven't started yet. One as captain (2× points).
       </p>
+      {nextLockAt !== null && (
+        <p data-testid="next-lock" className="text-gold text-sm mb-4">
+          Next match {formatCountdown(nextLockAt - now).toLowerCase()}
+        </p>
+      )}
 
       {/* Today's matches */}
       {matches.length > 0 && (
@@ -180,6 +200,7 @@ export default function Dashboard() {
             player={slots[slot.key]}
             isCaptain={captainKey === slot.key}
             isLocked={slots[slot.key] ? lockedIds.has(slots[slot.key]!.id) : false}
+            usage={slots[slot.key] ? usages.get(slots[slot.key]!.id) : undefined}
             onPick={() => setPickerSlot(slot)}
             onRemove={() => handleRemove(slot.key)}
             onToggleCaptain={() => handleToggleCaptain(slot.key)}
@@ -195,6 +216,7 @@ export default function Dashboard() {
             player={slots[slot.key]}
             isCaptain={captainKey === slot.key}
             isLocked={slots[slot.key] ? lockedIds.has(slots[slot.key]!.id) : false}
+            usage={slots[slot.key] ? usages.get(slots[slot.key]!.id) : undefined}
             onPick={() => setPickerSlot(slot)}
             onRemove={() => handleRemove(slot.key)}
             onToggleCaptain={() => handleToggleCaptain(slot.key)}
@@ -209,6 +231,7 @@ export default function Dashboard() {
           player={slots["gk"]}
           isCaptain={captainKey === "gk"}
           isLocked={slots["gk"] ? lockedIds.has(slots["gk"]!.id) : false}
+          usage={slots["gk"] ? usages.get(slots["gk"]!.id) : undefined}
           onPick={() => setPickerSlot(SLOTS[5])}
           onRemove={() => handleRemove("gk")}
           onToggleCaptain={() => handleToggleCaptain("gk")}
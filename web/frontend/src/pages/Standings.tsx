@@ -1,19 +1,53 @@
-import { useEffect, useState } from "react";
-import { getStandings } from "../api/client";
+import { useCallback, useEffect, useRef, useState } from "react";
+import { getStandings, liveScoresUrl } from "../api/client";
 import { useAuth } from "../context/AuthContext";
-import type { StandingEntry } from "../types";
+import type { LiveScoresDelta, StandingEntry } from "../types";
 import ScoreTable from "../components/ScoreTable";
 
 export default function Standings() {
   const { user } = useAuth();
   const [standings, setStandings] = useState<StandingEntry[]>([]);
   const [loading, setLoading] = useState(true);
+  const knownIds = useRef<Set<string>>(new Set());
 
+  const loadStandings = useCallback(
+    () =>
+      getStandings()
+        .then((res) => setStandings(res.data))
+        .finally(() => setLoading(false)),
+    []
+  );
+
+  useEffect(() => {
+    loadStandings();
+  }, [loadStandings]);
+
+  useEffect(() => {
+    knownIds.current = new Set(standings.map((s) => s.user_id));
+  }, [standings]);
+
+  // Live updates: apply changed totals and ranks instead of polling
   useEffect(() => {
-    getStandings()
-      .then((res) => setStandings(res.data))
-      .finally(() => setLoading(false));
-  }, []);
+    if (typeof EventSource === "undefined") return;
+    const source = new EventSource(liveScoresUrl());
+    source.addEventListener("scores", (e) => {
+      const delta: LiveScoresDelta = JSON.parse((e as MessageEvent).data);
+      // A user not in the table yet (new signup, first score): a delta can't place them
+      if (delta.users.some((u) => !knownIds.current.has(u.user_id))) {
+        loadStandings();
+        return;
+      }
+      const changed = new Map(delta.users.map((u) => [u.user_id, u]));
+      setStandings((prev) => {
+        const next = prev.map((s) => {
+          const u = changed.get(s.user_id);
+          return u ? { ...s, total_points: u.total_points, rank: u.rank } : s;
+        });
+        return next.sort((a, b) => a.rank - b.rank);
+      });
+    });
+    return () => source.close();
+  }, [loadStandings]);
 
   return (
     <div>
@@ -36,6 +36,24 @@ export interface LineupResponse {
   lineup: LineupEntry[];
 }
 
+export interface PlayerUsage {
+  player_id: number;
+  stage: string;
+  used: number;
+  limit: number;
+  remaining: number;
+}
+
+export interface DashboardResponse {
+  day: number;
+  server_time: string; // ISO8601 UTC
+  next_lock_at: string | null;
+  matches: Match[];
+  locked_teams: string[];
+  lineup: LineupEntry[];
+  usages: PlayerUsage[];
+}
+
 export interface PlayerScoreDetail {
   player_id: number;
   name: string;
@@ -59,6 +77,12 @@ export interface StandingEntry {
   scores_by_day: Record<number, number>;
 }
 
+export interface LiveScoresDelta {
+  version: number;
+  users: { user_id: string; username: string; total_points: number; rank: number; previous_rank: number | null }[];
+  players: { player_id: number; match_id: number; day: number; fantasy_points: number }[];
+}
+
 export type Position = "Forward" | "Defender" | "Goalkeeper";
 
 export interface LineupSlotDef {